@@ -0,0 +1 @@
+# Benchmarks of the app's features against local stand-ins for every external service.
@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import contextlib
+import socket
+import threading
+import time
+
+from aiohttp import web
+
+from core.fake_gemini import make_app as make_gemini_app
+
+
+def _listen():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+    return sock
+
+
+# The thumbnail sizes the YouTube Data API returns for every video
+def _thumbnails(video_id):
+    return {name: {"url": f"https://i.ytimg.com/vi/{video_id}/{file}.jpg", "width": width, "height": height}
+            for name, file, width, height in (("default", "default", 120, 90),
+                                              ("medium", "mqdefault", 320, 180),
+                                              ("high", "hqdefault", 480, 360))}
+
+
+# YouTube Data API search and Serper search, answering after latency_s with
+# as many results as were asked for
+def make_search_app(latency_s=0.2):
+    stats = {"youtube": 0, "serper": 0}
+
+    async def youtube(request):
+        stats["youtube"] += 1
+        await asyncio.sleep(latency_s)
+        query = request.query.get("q", "")
+        return web.json_response({"items": [{
+            "id": {"kind": "youtube#video", "videoId": f"video{i}"},
+            "snippet": {"title": f"{query} explained, part {i + 1}",
+                        "description": f"A lesson about {query}.",
+                        "channelTitle": "Bench Channel",
+                        "thumbnails": _thumbnails(f"video{i}")},
+        } for i in range(int(request.query.get("maxResults", 5)))]})
+
+    async def serper(request):
+        stats["serper"] += 1
+        await asyncio.sleep(latency_s)
+        query = request.query.get("q", "")
+        return web.json_response({"organic": [{
+            "title": f"{query} - article {i + 1}",
+            "link": f"https://example.com/{i}",
+            "snippet": f"Everything students need to know about {query}.",
+        } for i in range(int(request.query.get("num", 5)))]})
+
+    app = web.Application()
+    app["stats"] = stats
+    app.add_routes([
+        web.get("/youtube/v3/search", youtube),
+        web.get("/search", serper),
+    ])
+    return app
+
+
+# Just enough SMTP (no TLS, any AUTH accepted) for smtplib to deliver mail.
+# Messages are counted, not kept; delivered maps each subject to the
+# time.perf_counter() at which its message was accepted.
+class FakeSmtp:
+    def __init__(self, latency_s=0.0):
+        self.latency_s = latency_s
+        self.messages = 0
+        self.connections = 0
+        self.delivered = {}
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+
+        async def reply(line):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 localhost fake SMTP")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip().upper()
+                if command.startswith("EHLO"):
+                    await reply("250-localhost\r\n250-AUTH PLAIN\r\n250 8BITMIME")
+                elif command.startswith("AUTH"):
+                    await reply("235 2.7.0 Authentication successful")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    subject = None
+                    while (data := await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        if subject is None and data[:8].lower() == b"subject:":
+                            subject = data[8:].decode(errors="replace").strip()
+                    if self.latency_s:
+                        await asyncio.sleep(self.latency_s)
+                    self.messages += 1
+                    self.delivered[subject] = time.perf_counter()
+                    await reply("250 2.0.0 Ok: queued")
+                elif command == "QUIT":
+                    await reply("221 2.0.0 Bye")
+                    break
+                else:  # HELO, MAIL, RCPT, RSET, NOOP
+                    await reply("250 2.0.0 Ok")
+        finally:
+            writer.close()
+
+
+# A FakeSmtp on its own event loop thread, for a workload that reads its
+# delivery times (they are only comparable within one process):
+#   with serve_smtp() as (smtp, port): ...
+@contextlib.contextmanager
+def serve_smtp(latency_s=0.0):
+    smtp = FakeSmtp(latency_s)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="fake-smtp", daemon=True)
+    thread.start()
+    sock = _listen()
+    server = asyncio.run_coroutine_threadsafe(asyncio.start_server(smtp.handle, sock=sock), loop).result()
+    try:
+        yield smtp, sock.getsockname()[1]
+    finally:
+        asyncio.run_coroutine_threadsafe(_shut_down(server), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+# Stop accepting and end the sessions of clients that are still connected
+async def _shut_down(server):
+    server.close()
+    sessions = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in sessions:
+        task.cancel()
+    await asyncio.gather(*sessions, return_exceptions=True)
+
+
+# Every fake service on one event loop in a background thread, each on a free
+# local port. env() gives the settings that point the app at them.
+class FakeServices:
+    def __init__(self, gemini_latency_s=0.3, gemini_error_rate=0.0, search_latency_s=0.2, smtp_latency_s=0.0):
+        self.gemini_app = make_gemini_app(latency_s=gemini_latency_s, error_rate=gemini_error_rate)
+        self.search_app = make_search_app(search_latency_s)
+        self.smtp = FakeSmtp(smtp_latency_s)
+        self.ports = {}
+        self._loop = asyncio.new_event_loop()
+        self._runners = []
+        self._smtp_server = None
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fake-services", daemon=True)
+
+    async def _start(self):
+        for name, app in (("gemini", self.gemini_app), ("search", self.search_app)):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            sock = _listen()
+            await web.SockSite(runner, sock).start()
+            self._runners.append(runner)
+            self.ports[name] = sock.getsockname()[1]
+        sock = _listen()
+        self._smtp_server = await asyncio.start_server(self.smtp.handle, sock=sock)
+        self.ports["smtp"] = sock.getsockname()[1]
+
+    async def _stop(self):
+        self._smtp_server.close()
+        for runner in self._runners:
+            await runner.cleanup()
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def env(self):
+        search = f"http://127.0.0.1:{self.ports['search']}"
+        return {
+            "GEMINI_STUB": "",
+            "GEMINI_API_ENDPOINT": f"http://127.0.0.1:{self.ports['gemini']}",
+            "GOOGLE_API_KEY": "bench",
+            "YOUTUBE_API_KEY": "bench",
+            "SERPER_API_KEY": "bench",
+            "YOUTUBE_API_URL": f"{search}/youtube/v3",
+            "SERPER_API_URL": search,
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(self.ports["smtp"]),
+            "SMTP_SSL": "0",
+            "EMAIL_ADDRESS": "bench@example.com",
+            "EMAIL_PASSWORD": "",
+        }
+
+    def stats(self):
+        return {"gemini": dict(self.gemini_app["stats"]), "search": dict(self.search_app["stats"]),
+                "smtp": {"messages": self.smtp.messages, "connections": self.smtp.connections}}
+
+
+# Serve the fakes for manual testing, e.g. of the Streamlit app:
+# python -m bench.fakes   (prints the settings to export)
+def main():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for Gemini, YouTube, Serper and SMTP.")
+    parser.add_argument("--gemini-latency", type=float, default=0.3)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0)
+    parser.add_argument("--search-latency", type=float, default=0.2)
+    args = parser.parse_args()
+    with FakeServices(args.gemini_latency, args.gemini_error_rate, args.search_latency) as services:
+        for name, value in services.env().items():
+            print(f"{name}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import random
+
+# Tiny randomly initialized models with the same architectures as the app's
+# (downloaded once into the Hugging Face cache). With --models tiny they stand
+# in for the real weights, so a run measures the app's own work (chunking,
+# batching, caching, memory) in seconds instead of model compute.
+TINY_MODELS = {
+    "summarization": "hf-internal-testing/tiny-random-bart",
+    "translation_en_to_fr": "hf-internal-testing/tiny-random-t5",
+    "translation_en_to_hi": "hf-internal-testing/tiny-random-MarianMTModel",
+    "translation_en_to_ml": "hf-internal-testing/tiny-random-MarianMTModel",
+}
+
+TOPICS = [
+    "photosynthesis", "fractions", "the water cycle", "volcanoes", "the solar system",
+    "multiplication tables", "the human heart", "ancient Egypt", "magnetism", "food chains",
+    "decimals", "the French revolution", "states of matter", "plate tectonics", "electric circuits",
+    "the digestive system", "ratios", "weather and climate", "simple machines", "the rock cycle",
+]
+
+_subjects = ["The teacher", "Every student", "The class", "A scientist", "My friend", "The book", "Our group"]
+_verbs = ["explains", "describes", "measures", "compares", "observes", "draws", "writes about"]
+_objects = ["how plants grow", "the phases of the moon", "why ice floats", "the length of a river",
+            "the speed of sound", "a map of the city", "the life of bees", "how clouds form"]
+_endings = ["in the morning.", "before the test.", "with great care.", "using a diagram.",
+            "in simple words.", "for the whole school.", "after lunch."]
+
+PRACTICE_SENTENCES = [
+    "What is your name?",
+    "Where is the library?",
+    "I would like a glass of water, please.",
+    "The train leaves at seven in the morning.",
+    "Can you help me with my homework?",
+    "My brother and I are going to the park.",
+    "How much does this book cost?",
+    "It is raining today, so take an umbrella.",
+    "We are learning about plants in science class.",
+    "Thank you very much for your help.",
+]
+
+
+def sentence(rng):
+    return f"{rng.choice(_subjects)} {rng.choice(_verbs)} {rng.choice(_objects)} {rng.choice(_endings)}"
+
+
+# Lecture-note style text of roughly the given number of words, in paragraphs
+def lecture_text(words, seed=0):
+    rng = random.Random(seed)
+    paragraphs, count = [], 0
+    while count < words:
+        paragraph = " ".join(sentence(rng) for _ in range(rng.randint(4, 8)))
+        paragraphs.append(paragraph)
+        count += len(paragraph.split())
+    return "\n\n".join(paragraphs)
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# A text PDF of the given number of pages (about 300 words each), built by
+# hand so no PDF writer is needed
+def make_pdf(pages, seed=0, lines_per_page=40):
+    rng = random.Random(seed)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(pages))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>")
+    font = 3 + 2 * pages
+    for i in range(pages):
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+                       f"/Resources << /Font << /F1 {font} 0 R >> >> >>")
+        lines = " T* ".join(f"({_pdf_escape(sentence(rng))}) Tj" for _ in range(lines_per_page))
+        stream = f"BT /F1 10 Tf 14 TL 54 750 Td {lines} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+# A student's chat turn of about the given number of words
+def chat_message(rng, words=40):
+    text = []
+    while len(text) < words:
+        text.extend(sentence(rng).split())
+    return "Can you explain this to me? " + " ".join(text[:words])
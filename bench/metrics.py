@@ -0,0 +1,79 @@
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+
+# Latencies per operation, collected from any number of threads.
+# Throughput is completed operations over the time from the first start to
+# the last finish of that operation, so concurrent calls count in parallel.
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self.first_error = {}
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def add(self, op, seconds, started=None, finished=None):
+        finished = finished or time.perf_counter()
+        started = started or finished - seconds
+        with self._lock:
+            self.samples[op].append(seconds)
+            first, last = self._spans.get(op, (started, finished))
+            self._spans[op] = (min(first, started), max(last, finished))
+
+    def error(self, op, e):
+        with self._lock:
+            self.errors[op] += 1
+            self.first_error.setdefault(op, f"{type(e).__name__}: {e}")
+
+    # Call func, record how long it took under op, and return its result
+    # (None when it raised; the error is counted instead)
+    def time(self, op, func, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.error(op, e)
+            return None
+        finished = time.perf_counter()
+        self.add(op, finished - started, started, finished)
+        return result
+
+    def report(self):
+        ops = {}
+        for op in list(self.samples) + [op for op in self.errors if op not in self.samples]:
+            samples = np.array(self.samples.get(op, []), dtype=float) * 1000
+            first, last = self._spans.get(op, (0.0, 0.0))
+            entry = {"n": len(samples), "errors": self.errors.get(op, 0)}
+            if len(samples):
+                p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                entry.update({
+                    "p50_ms": round(p50, 2), "p95_ms": round(p95, 2), "p99_ms": round(p99, 2),
+                    "mean_ms": round(samples.mean(), 2), "max_ms": round(samples.max(), 2),
+                    "throughput_per_s": round(len(samples) / (last - first), 2) if last > first else None,
+                })
+            if op in self.first_error:
+                entry["first_error"] = self.first_error[op]
+            ops[op] = entry
+        return ops
+
+
+# Peak resident memory of this process so far, in MB (None where it can't be read)
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+    except ImportError:
+        return None
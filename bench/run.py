@@ -0,0 +1,168 @@
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Every file the app writes, so each feature starts from empty databases and caches
+_STATE_PATHS = {
+    "CHAT_DB_PATH": "chat_history.db",
+    "SEARCH_CACHE_PATH": "search_cache.db",
+    "QUIZ_CACHE_PATH": "quiz_cache.db",
+    "QUIZ_BANK_PATH": "quiz_bank.db",
+    "GRADING_DB_PATH": "grading.db",
+    "TM_PATH": "translation_memory.db",
+    "REMINDER_DB_PATH": "reminders.db",
+    "PDF_CACHE_DIR": ".pdf_cache",
+    "VECTOR_INDEX_DIR": ".vector_index",
+}
+
+_COLUMNS = ("n", "errors", "p50_ms", "p95_ms", "p99_ms", "throughput_per_s")
+
+
+def _parser():
+    from bench.workloads import FEATURES
+
+    parser = argparse.ArgumentParser(description="Benchmark the app's features against local fake services.")
+    parser.add_argument("--features", default=",".join(FEATURES),
+                        help=f"comma-separated subset of: {', '.join(FEATURES)}")
+    parser.add_argument("--users", type=int, default=8, help="simulated concurrent users")
+    parser.add_argument("--requests", type=int, default=40, help="operations per feature and phase")
+    parser.add_argument("--history", type=int, default=1000, help="messages per conversation (chat_store)")
+    parser.add_argument("--turns", type=int, default=5, help="AI-BOT turns per user (chat)")
+    parser.add_argument("--pdf-pages", type=int, default=100, help="pages per PDF (pdf)")
+    parser.add_argument("--lecture-words", type=int, default=2000, help="words per lecture (summarize)")
+    parser.add_argument("--models", choices=("tiny", "real"), default="tiny",
+                        help="tiny random-weight models, or the app's own (summarize, translate)")
+    parser.add_argument("--gemini-latency", type=float, default=0.3, help="seconds before a fake Gemini reply")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="share of Gemini calls answered 429")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="seconds before a fake search reply")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON, e.g. to compare a later run against")
+    parser.add_argument("--compare", help="JSON results of an earlier run to show the change against")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser
+
+
+# Inside the per-feature process: run one workload and print its results as JSON
+def _work(opts):
+    from bench.metrics import Recorder, peak_rss_mb
+    from bench.workloads import FEATURES
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    extra = FEATURES[opts.worker][0](recorder, opts)
+    print(json.dumps({
+        "ops": recorder.report(),
+        "wall_s": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "extra": extra,
+    }, default=str))
+
+
+def _missing(modules):
+    return [module for module in modules if importlib.util.find_spec(module) is None]
+
+
+# Run one feature in a fresh process, so its peak RSS is its own and no cache
+# or loaded model carries over from another feature
+def _run_feature(feature, argv, env):
+    workdir = tempfile.mkdtemp(prefix=f"bench-{feature}-")
+    try:
+        env = dict(env, **{name: os.path.join(workdir, path) for name, path in _STATE_PATHS.items()})
+        proc = subprocess.run([sys.executable, "-m", "bench.run", *argv, "--worker", feature],
+                              cwd=ROOT, env=env, capture_output=True, text=True)
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not lines:
+            return {"failed": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+        return json.loads(lines[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _format(value):
+    if value is None:
+        return "-"
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def _change(value, before):
+    if not value or not before:
+        return ""
+    return f" ({(value - before) / before * 100:+.0f}%)"
+
+
+def print_report(results, baseline=None):
+    # Wider columns when each value is followed by its change against the baseline
+    width = 22 if baseline else 17
+    baseline = baseline or {}
+    print(f"{'feature':<11} {'operation':<22}" + "".join(f"{column:>{width}}" for column in _COLUMNS)
+          + f"{'peak_rss_mb':>{width}}")
+    for feature, result in results.items():
+        if "skipped" in result or "failed" in result:
+            print(f"{feature:<11} {'skipped' if 'skipped' in result else 'FAILED'}: "
+                  f"{result.get('skipped') or result.get('failed')}")
+            continue
+        before = baseline.get(feature, {})
+        for i, (op, stats) in enumerate(result["ops"].items()):
+            old = before.get("ops", {}).get(op, {})
+            cells = "".join(f"{_format(stats.get(column)) + _change(stats.get(column), old.get(column)):>{width}}"
+                            if column.endswith(("_ms", "_per_s")) else f"{_format(stats.get(column)):>{width}}"
+                            for column in _COLUMNS)
+            rss = _format(result["peak_rss_mb"]) + _change(result["peak_rss_mb"], before.get("peak_rss_mb")) if i == 0 else ""
+            print(f"{feature if i == 0 else '':<11} {op:<22}{cells}{rss:>{width}}")
+            if "first_error" in stats:
+                print(f"{'':<34}first error: {stats['first_error']}")
+        for name, counters in result["extra"].items():
+            print(f"{'':<34}{name}: {json.dumps(counters)}")
+
+
+# python -m bench.run --users 16 --features quiz,search --output before.json
+# python -m bench.run --users 16 --features quiz,search --compare before.json
+def main():
+    argv = sys.argv[1:]
+    opts = _parser().parse_args(argv)
+    if opts.worker:
+        _work(opts)
+        return
+
+    from bench.fakes import FakeServices
+    from bench.workloads import FEATURES
+
+    features = [feature.strip() for feature in opts.features.split(",") if feature.strip()]
+    unknown = [feature for feature in features if feature not in FEATURES]
+    if unknown:
+        sys.exit(f"Unknown feature(s): {', '.join(unknown)}")
+    baseline = None
+    if opts.compare:
+        with open(opts.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    with FakeServices(opts.gemini_latency, opts.gemini_error_rate, opts.search_latency) as services:
+        env = dict(os.environ, **services.env())
+        for feature in features:
+            missing = _missing(FEATURES[feature][1])
+            if missing:
+                results[feature] = {"skipped": f"needs {', '.join(missing)}"}
+            else:
+                print(f"running {feature}...", file=sys.stderr)
+                results[feature] = _run_feature(feature, argv, env)
+        fakes = services.stats()
+
+    print_report(results, baseline)
+    if opts.output:
+        with open(opts.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": {key: value for key, value in vars(opts).items()
+                                    if key not in ("output", "compare", "worker")},
+                       "results": results, "fake_services": fakes}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
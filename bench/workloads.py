@@ -0,0 +1,241 @@
+import io
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.fixtures import PRACTICE_SENTENCES, TINY_MODELS, TOPICS, chat_message, lecture_text, make_pdf
+
+# Each workload runs in its own process (see bench.run) with the settings
+# pointing at the fake services and at fresh databases, so core modules are
+# imported inside the functions, after that environment is in place.
+# A workload records its operations on the Recorder and returns extra
+# counters (cache hits, retries, ...) that help read the numbers.
+
+
+# Run fn(user) for every simulated user at once and wait for all of them
+def run_users(users, fn):
+    with ThreadPoolExecutor(users) as pool:
+        list(pool.map(fn, range(users)))
+
+
+def per_user(opts):
+    return max(1, opts.requests // opts.users)
+
+
+def use_model_fixtures(opts):
+    if opts.models != "tiny":
+        return
+    from core.models import registry
+    loader = registry.loader
+    # The app keeps asking for its own model names; only the weights behind them change
+    registry.loader = lambda task, model: loader(task, TINY_MODELS.get(task, model))
+
+
+# Chat history growth: every user appends opts.history messages to their
+# conversation (each save waits for its group commit) and reloads the latest
+# page as the conversation reaches 10, 100, 1000... messages
+def bench_chat_store(rec, opts):
+    from core.chat_store import get_store
+
+    store = get_store()
+    checkpoints = {10 ** k for k in range(1, 7) if 10 ** k <= opts.history} | {opts.history}
+
+    def user(u):
+        rng = random.Random(opts.seed + u)
+        conversation_id = f"bench-{u}"
+        for i in range(1, opts.history + 1):
+            speaker = "You" if i % 2 else "AI-BOT"
+            rec.time("save", store.save_message, speaker, chat_message(rng), conversation_id=conversation_id, wait=True)
+            if i in checkpoints:
+                rec.time(f"load_history@{i}", store.load_history, conversation_id)
+
+    run_users(opts.users, user)
+    return {}
+
+
+# Search fan-out: every query goes to YouTube and Serper at once; the same
+# queries are then asked again and should come from the search cache
+def bench_search(rec, opts):
+    from core.search import search_all
+    from core.search_cache import get_search_cache
+
+    youtube_key, serper_key = os.getenv("YOUTUBE_API_KEY"), os.getenv("SERPER_API_KEY")
+    queries = [f"{TOPICS[i % len(TOPICS)]} for Grade {i % 12 + 1}" for i in range(opts.requests)]
+
+    def search(query):
+        results = dict(search_all(query, youtube_key, serper_key))
+        errors = [result for result in results.values() if isinstance(result, str)]
+        if errors:
+            raise RuntimeError(errors[0])
+        return results
+
+    for op in ("search_cold", "search_cached"):
+        run_users(opts.users, lambda u: [rec.time(op, search, query) for query in queries[u::opts.users]])
+    return {"search_cache": get_search_cache().stats()}
+
+
+# Quiz generation through the LLM gateway: distinct topics (every one a model
+# call), a whole class asking for the same new topic at the same moment, and
+# the distinct topics again (from the quiz cache)
+def bench_quiz(rec, opts):
+    from core.llm import get_gateway
+    from core.quiz_bank import get_quiz
+    from core.quiz_cache import get_quiz_cache
+
+    topics = [(f"{TOPICS[i % len(TOPICS)]} {i}", f"Grade {i % 12 + 1}") for i in range(opts.requests)]
+
+    def quiz(op, topic, grade):
+        questions = rec.time(op, get_quiz, topic, grade)
+        if questions == []:
+            rec.error(f"{op} (empty)", ValueError("no questions parsed"))
+
+    run_users(opts.users, lambda u: [quiz("quiz_cold", *entry) for entry in topics[u::opts.users]])
+    for round_ in range(3):
+        run_users(opts.users, lambda u: quiz("quiz_classroom", f"classroom topic {round_}", "Grade 5"))
+    run_users(opts.users, lambda u: [quiz("quiz_cached", *entry) for entry in topics[u::opts.users]])
+    return {"llm": get_gateway().stats(), "quiz_cache": get_quiz_cache().stats()}
+
+
+# AI-BOT conversations: every user holds a conversation of opts.turns streamed
+# turns; the session history grows until it is compacted
+def bench_chat(rec, opts):
+    from core.llm import INTERACTIVE, get_gateway, priority
+    from core.runtime import get_chat_sessions
+
+    sessions = get_chat_sessions()
+
+    def user(u):
+        rng = random.Random(opts.seed + u)
+        for _ in range(opts.turns):
+            started = time.perf_counter()
+            first = None
+            try:
+                with priority(INTERACTIVE):
+                    response = sessions.send_message(f"bench-{u}", chat_message(rng, words=120), stream=True)
+                for chunk in response:
+                    _ = chunk.text  # read every chunk, as the page does
+                    if first is None:
+                        first = time.perf_counter()
+                        rec.add("first_chunk", first - started, started, first)
+            except Exception as e:
+                rec.error("reply", e)
+                continue
+            finished = time.perf_counter()
+            rec.add("reply", finished - started, started, finished)
+
+    run_users(opts.users, user)
+    return {"llm": get_gateway().stats(), "sessions": sessions.stats()}
+
+
+# PDF extraction of long documents: every user uploads a different
+# opts.pdf_pages-page PDF at once, then the same files again (page cache)
+def bench_pdf(rec, opts):
+    from core.pdf import extract_pdf_text
+
+    pdfs = [make_pdf(opts.pdf_pages, seed=opts.seed + u) for u in range(opts.users)]
+
+    def extract(data):
+        text = extract_pdf_text(io.BytesIO(data))
+        if not text.strip():
+            raise ValueError("no text extracted")
+
+    for op in ("extract_cold", "extract_cached"):
+        run_users(opts.users, lambda u: rec.time(op, extract, pdfs[u]))
+    return {"pdf_mb": round(sum(len(pdf) for pdf in pdfs) / (1024 * 1024), 1)}
+
+
+# Map-reduce summarization of lecture notes of opts.lecture_words words,
+# several users at once; first_partial is when the page shows something
+def bench_summarize(rec, opts):
+    from core.models import get_pipeline, registry
+    from core.summarize import SUMMARY_MODEL, stream_summary
+
+    use_model_fixtures(opts)
+    rec.time("load_model", get_pipeline, "summarization", SUMMARY_MODEL)
+
+    def user(u):
+        for i in range(per_user(opts)):
+            text = lecture_text(opts.lecture_words, seed=opts.seed + u * 1000 + i)
+            started = time.perf_counter()
+            first = None
+            try:
+                for kind, _, _ in stream_summary(text):
+                    if first is None:
+                        first = time.perf_counter()
+                        rec.add("first_partial", first - started, started, first)
+            except Exception as e:
+                rec.error("summarize", e)
+                continue
+            finished = time.perf_counter()
+            rec.add("summarize", finished - started, started, finished)
+
+    run_users(opts.users, user)
+    return {"models": registry.stats()}
+
+
+# Translation of practice paragraphs into every language, then the same
+# paragraphs again (translation memory)
+def bench_translate(rec, opts):
+    from core.models import registry
+    from core.translation import TRANSLATORS, get_translation_memory, translate
+
+    use_model_fixtures(opts)
+    rng = random.Random(opts.seed)
+    languages = list(TRANSLATORS)
+    work = [(" ".join(rng.sample(PRACTICE_SENTENCES, 4)), languages[i % len(languages)])
+            for i in range(opts.requests)]
+    for language in languages:
+        rec.time("load_model", translate, "Hello.", language)
+
+    for op in ("translate_cold", "translate_repeat"):
+        run_users(opts.users, lambda u: [rec.time(op, translate, text, language)
+                                         for text, language in work[u::opts.users]])
+    return {"translation_memory": get_translation_memory().stats(), "models": registry.stats()}
+
+
+# Meeting reminders: users schedule opts.requests * 5 reminders due now;
+# deliver is the time from scheduling a reminder to the fake SMTP server
+# accepting it. The server runs in this process, so it can say when each
+# message (told apart by its subject) arrived.
+def bench_reminders(rec, opts):
+    from bench.fakes import serve_smtp
+    from core.reminders import ReminderScheduler, SmtpConnection
+
+    total = opts.requests * 5
+    scheduled = {}
+
+    with serve_smtp() as (smtp, port):
+        scheduler = ReminderScheduler(smtp=SmtpConnection(host="127.0.0.1", port=port, use_ssl=False))
+
+        def user(u):
+            for i in range(total // opts.users):
+                subject = f"Meeting Reminder {u}-{i}"
+                scheduled[subject] = time.perf_counter()
+                rec.time("schedule", scheduler.schedule, f"student{u}@example.com", subject,
+                         f"Reminder {i}: your meeting starts soon.", time.time())
+
+        run_users(opts.users, user)
+        timeout = time.monotonic() + 120
+        while scheduler.sent + scheduler.failed < len(scheduled) and time.monotonic() < timeout:
+            time.sleep(0.01)
+        for subject, started in scheduled.items():
+            finished = smtp.delivered.get(subject)
+            if finished is None:
+                rec.error("deliver", TimeoutError(f"{subject} was not delivered"))
+            else:
+                rec.add("deliver", finished - started, started, finished)
+        return {"reminders": scheduler.stats(), "smtp": {"messages": smtp.messages, "connections": smtp.connections}}
+
+
+# name -> (workload, modules it needs)
+FEATURES = {
+    "chat_store": (bench_chat_store, ()),
+    "search": (bench_search, ()),
+    "quiz": (bench_quiz, ("google.generativeai",)),
+    "chat": (bench_chat, ("google.generativeai",)),
+    "pdf": (bench_pdf, ("PyPDF2",)),
+    "summarize": (bench_summarize, ("torch", "transformers")),
+    "translate": (bench_translate, ("torch", "transformers", "sentencepiece")),
+    "reminders": (bench_reminders, ()),
+}
@@ -0,0 +1,6 @@
+# Shared runtime helpers for the Streamlit apps (Learning.py, VA.py).
+from dotenv import load_dotenv
+
+# Settings in these modules are read from the environment at import time,
+# so the .env file has to be loaded before any of them is imported
+load_dotenv()
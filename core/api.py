@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from aiohttp import web
+
+from core import batching, search
+from core import grading
+from core.grading import quiz_id
+from core.llm import LLMUnavailable, get_gateway
+from core.models import registry
+from core.pdf import PDF_MAX_BYTES, iter_pdf_pages
+from core.quiz import validate_item
+from core.quiz_bank import get_quiz, get_quiz_bank
+from core.quiz_cache import get_quiz_cache
+from core.search_cache import get_search_cache
+from core.summarize import summarize
+from core.translation import get_translation_memory, submit_translation
+from core.vector_index import get_vector_index
+
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8080"))
+# Threads for blocking work (quiz generation, summarization, PDF extraction), shared by all requests
+API_WORKERS = int(os.getenv("API_WORKERS", "8"))
+# Largest number of texts accepted in one summarize/translate request
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", "64"))
+# Largest number of student submissions graded in one request
+API_MAX_SUBMISSIONS = int(os.getenv("API_MAX_SUBMISSIONS", "1000"))
+# When set, every endpoint but /health requires "Authorization: Bearer <token>"
+API_TOKEN = os.getenv("API_TOKEN")
+
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+
+
+# Run a blocking call on the shared worker pool without holding up the event loop
+async def run_blocking(request, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app["executor"], partial(func, *args, **kwargs))
+
+
+async def _json_body(request):
+    try:
+        data = await request.json()
+    except json.JSONDecodeError:
+        raise ValueError("Request body must be JSON.")
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object.")
+    return data
+
+
+def _required(data, name):
+    value = data.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"'{name}' is required.")
+    return value
+
+
+# Endpoints that take text accept either "text" (one string) or "texts" (a list)
+# and answer with "result" or "results" to match
+def _texts(data):
+    if "texts" in data:
+        texts = data["texts"]
+        if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+            raise ValueError("'texts' must be a non-empty list of strings.")
+        if len(texts) > API_MAX_BATCH:
+            raise ValueError(f"At most {API_MAX_BATCH} texts per request.")
+        return texts, False
+    return [_required(data, "text")], True
+
+
+def _batch_response(results, single):
+    return web.json_response({"result": results[0]} if single else {"results": results})
+
+
+@web.middleware
+async def auth_middleware(request, handler):
+    if API_TOKEN and request.path != "/health" and request.headers.get("Authorization") != f"Bearer {API_TOKEN}":
+        return web.json_response({"error": "Unauthorized."}, status=401)
+    return await handler(request)
+
+
+# Bad input surfaces as ValueError from the core modules; report it as a 400
+@web.middleware
+async def error_middleware(request, handler):
+    try:
+        return await handler(request)
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except LLMUnavailable as e:
+        return web.json_response({"error": str(e)}, status=503, headers={"Retry-After": "5"})
+
+
+async def health(request):
+    return web.json_response({"status": "ok"})
+
+
+async def stats(request):
+    return web.json_response({
+        "models": registry.stats(),
+        "llm": get_gateway().stats(),
+        "batching": batching.stats(),
+        "quiz_bank": get_quiz_bank().stats(),
+        "quiz_cache": get_quiz_cache().stats(),
+        "search_cache": get_search_cache().stats(),
+        "translation_memory": get_translation_memory().stats(),
+        "vector_index": get_vector_index().stats(),
+    })
+
+
+# GET /search?q=photosynthesis&grade=Grade+5
+async def search_handler(request):
+    query = request.query.get("q", "").strip()
+    if not query:
+        raise ValueError("'q' is required.")
+    grade = request.query.get("grade")
+    search_query = f"{query} for {grade}" if grade else query
+    results = await search.search_all_async(search_query, YOUTUBE_API_KEY, SERPER_API_KEY)
+    # Providers report failures as an error string rather than raising
+    return web.json_response({
+        "query": search_query,
+        **{provider: {"error": found} if isinstance(found, str) else {"results": found}
+           for provider, found in results.items()},
+    })
+
+
+# POST /quiz {"topic": ..., "grade": ...}
+async def quiz_handler(request):
+    data = await _json_body(request)
+    topic, grade = _required(data, "topic"), _required(data, "grade")
+    questions = await run_blocking(request, get_quiz, topic, grade)
+    if not questions:
+        return web.json_response({"error": "The model did not return a usable quiz."}, status=502)
+    return web.json_response({"quiz_id": quiz_id(questions), "questions": questions})
+
+
+# POST /summarize {"text": ...} or {"texts": [...]}, optional max_length/min_length.
+# Chunks of every text in flight share model batches.
+async def summarize_handler(request):
+    data = await _json_body(request)
+    texts, single = _texts(data)
+    lengths = {key: int(data[key]) for key in ("max_length", "min_length") if key in data}
+    summaries = await asyncio.gather(*(run_blocking(request, summarize, text, **lengths) for text in texts))
+    return _batch_response(summaries, single)
+
+
+# POST /translate {"text": ..., "language": "French"} or {"texts": [...], ...}.
+# Translations are awaited as futures (translation memory or model batches), so no worker thread waits on them.
+async def translate_handler(request):
+    data = await _json_body(request)
+    texts, single = _texts(data)
+    language = _required(data, "language")
+    futures = [asyncio.wrap_future(submit_translation(text, language)) for text in texts]
+    return _batch_response(await asyncio.gather(*futures), single)
+
+
+def _questions(data):
+    questions = data.get("questions")
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("'questions' must be a non-empty list.")
+    valid = [validate_item(q) for q in questions]
+    if None in valid:
+        raise ValueError(f"Question {valid.index(None) + 1} needs a question, 4 distinct options "
+                         "and a correct_answer that is one of them.")
+    return valid
+
+
+def _submissions(data):
+    submissions = data.get("submissions")
+    if not isinstance(submissions, list) or not submissions:
+        raise ValueError("'submissions' must be a non-empty list.")
+    if len(submissions) > API_MAX_SUBMISSIONS:
+        raise ValueError(f"At most {API_MAX_SUBMISSIONS} submissions per request.")
+    for submission in submissions:
+        if (not isinstance(submission, dict) or not isinstance(submission.get("student"), str)
+                or not isinstance(submission.get("answers"), list)):
+            raise ValueError("Every submission needs a 'student' and a list of 'answers'.")
+    return submissions
+
+
+def _number(value):
+    return None if value is None or value != value else round(float(value), 4)
+
+
+# POST /grading/submissions {"topic", "grade", "questions": [...],
+#   "submissions": [{"student", "answers": [chosen option of each question]}]}
+# Grades a whole class in one request and adds it to the cohort's item analysis
+async def grading_submissions_handler(request):
+    data = await _json_body(request)
+    topic, grade = _required(data, "topic"), _required(data, "grade")
+    questions, submissions = _questions(data), _submissions(data)
+    responses = grading.encode_answers(questions, [submission["answers"] for submission in submissions])
+    students = [submission["student"] for submission in submissions]
+    cohort = await run_blocking(request, grading.get_gradebook().record_many, topic, grade, questions,
+                                list(zip(students, responses)))
+    scores = grading.scores(responses, grading.answer_key(questions))
+    return web.json_response({"cohort": cohort, "scores": [
+        {"student": student, "score": _number(score)} for student, score in zip(students, scores)]})
+
+
+# GET /grading/cohorts -> every class quiz with submissions
+async def grading_cohorts_handler(request):
+    return web.json_response({"cohorts": await run_blocking(request, grading.get_gradebook().cohorts)})
+
+
+# GET /grading/analysis?cohort=... -> item analysis of every question and each student's score
+async def grading_analysis_handler(request):
+    cohort = request.query.get("cohort", "").strip()
+    if not cohort:
+        raise ValueError("'cohort' is required.")
+    students, questions, responses = await run_blocking(request, grading.get_gradebook().cohort, cohort)
+    if not students:
+        return web.json_response({"error": f"No submissions for cohort '{cohort}'."}, status=404)
+    key = grading.answer_key(questions)
+    analysis = grading.item_analysis(responses, key)
+    scores = grading.scores(responses, key)
+    return web.json_response({
+        "cohort": cohort,
+        "questions": [{"question": q["question"], "students": int(row["Students"]),
+                       "difficulty": _number(row["Difficulty"]), "discrimination": _number(row["Discrimination"]),
+                       "upper_lower": _number(row["Upper-Lower"]), "unanswered": _number(row["Unanswered"])}
+                      for q, (_, row) in zip(questions, analysis.iterrows())],
+        "scores": [{"student": student, "score": _number(score)} for student, score in zip(students, scores)],
+    })
+
+
+# The PDF arrives as the raw request body or as the "file" field of a form upload
+async def _upload_chunks(request, chunk_size=64 * 1024):
+    if request.content_type.startswith("multipart/"):
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "file":
+                while chunk := await part.read_chunk(chunk_size):
+                    yield chunk
+                return
+        raise ValueError("Upload the PDF as the 'file' field.")
+    async for chunk in request.content.iter_chunked(chunk_size):
+        yield chunk
+
+
+# POST /pdf with a PDF body -> {"pages": [text of each page], "text": all pages joined}
+async def pdf_handler(request):
+    size = 0
+    with tempfile.TemporaryFile() as upload:
+        async for chunk in _upload_chunks(request):
+            size += len(chunk)
+            if size > PDF_MAX_BYTES:
+                return web.json_response(
+                    {"error": f"PDF is larger than the {PDF_MAX_BYTES // (1024 * 1024)} MB limit."}, status=413)
+            upload.write(chunk)
+        if not size:
+            raise ValueError("Request body is empty; send the PDF file.")
+        upload.seek(0)
+        pages = await run_blocking(request, list, iter_pdf_pages(upload))
+    return web.json_response({"pages": pages, "text": "\n".join(pages)})
+
+
+async def _executor_ctx(app):
+    app["executor"] = ThreadPoolExecutor(API_WORKERS, thread_name_prefix="api")
+    yield
+    app["executor"].shutdown(wait=False)
+
+
+# Searches run on the server's own loop, with a connection pool of its own
+async def _close_search_session(app):
+    await search.close_session()
+
+
+def create_app():
+    app = web.Application(middlewares=[auth_middleware, error_middleware])
+    app.cleanup_ctx.append(_executor_ctx)
+    app.on_cleanup.append(_close_search_session)
+    app.add_routes([
+        web.get("/health", health),
+        web.get("/stats", stats),
+        web.get("/search", search_handler),
+        web.post("/quiz", quiz_handler),
+        web.post("/summarize", summarize_handler),
+        web.post("/translate", translate_handler),
+        web.post("/pdf", pdf_handler),
+        web.post("/grading/submissions", grading_submissions_handler),
+        web.get("/grading/cohorts", grading_cohorts_handler),
+        web.get("/grading/analysis", grading_analysis_handler),
+    ])
+    return app
+
+
+# python -m core.api --port 8080
+# The service keeps no per-client state, so it scales out by running more
+# processes (--reuse-port lets several share one port) behind a load balancer.
+def main():
+    parser = argparse.ArgumentParser(description="HTTP API for the learning platform features.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--reuse-port", action="store_true", help="let several server processes bind the same port")
+    args = parser.parse_args()
+    web.run_app(create_app(), host=args.host, port=args.port, reuse_port=args.reuse_port or None)
+
+
+if __name__ == "__main__":
+    main()
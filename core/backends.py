@@ -0,0 +1,194 @@
+import argparse
+import difflib
+import os
+import sys
+import time
+
+# Which runtime serves the summarization/translation models:
+#   torch  stock PyTorch pipelines (the baseline)
+#   int8   PyTorch with Linear layers dynamically quantized to int8
+#   onnx   models exported to ONNX and run with ONNX Runtime (needs optimum[onnxruntime])
+# A comma-separated list can override the default per model, e.g.
+#   INFERENCE_BACKEND=onnx,facebook/bart-large-cnn=int8
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", ".onnx_cache")
+
+BACKENDS = ("torch", "int8", "onnx")
+
+
+def _parse_backends(spec):
+    default, overrides = "torch", {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, backend = entry.rpartition("=")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r}; choose one of {', '.join(BACKENDS)}.")
+        if model:
+            overrides[model] = backend
+        else:
+            default = backend
+    return default, overrides
+
+
+_default_backend, _overrides = _parse_backends(INFERENCE_BACKEND)
+
+
+def backend_for(model):
+    return _overrides.get(model, _default_backend)
+
+
+def _is_seq2seq(task):
+    return task == "summarization" or task.startswith("translation")
+
+
+def _load_torch(task, model):
+    from transformers import pipeline
+    return pipeline(task, model=model)
+
+
+def _load_int8(task, model):
+    import torch
+
+    pipe = _load_torch(task, model)
+    # Weights of every Linear layer are stored as int8 and activations are
+    # quantized on the fly; on CPU this roughly halves memory and latency
+    pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipe
+
+
+def _onnx_dir(model):
+    return os.path.join(ONNX_CACHE_DIR, model.replace("/", "--"))
+
+
+def _load_onnx(task, model):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    path = _onnx_dir(model)
+    if os.path.isdir(path):
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(path)
+        tokenizer = AutoTokenizer.from_pretrained(path)
+    else:
+        # Exported once, then loaded from the cache directory on later starts
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(model, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model)
+        ort_model.save_pretrained(path)
+        tokenizer.save_pretrained(path)
+    return pipeline(task, model=ort_model, tokenizer=tokenizer)
+
+
+_loaders = {"torch": _load_torch, "int8": _load_int8, "onnx": _load_onnx}
+
+
+# Sentence embeddings for the vector index come from sentence-transformers on CPU
+def _load_sentence_embedding(model):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model, device="cpu")
+
+
+# Pipeline for task/model on the given (or configured) backend. The optimized
+# backends only cover the seq2seq models; anything else runs on torch.
+def load_pipeline(task, model, backend=None):
+    if task == "sentence-embedding":
+        return _load_sentence_embedding(model)
+    backend = backend or backend_for(model)
+    if not _is_seq2seq(task):
+        backend = "torch"
+    return _loaders[backend](task, model)
+
+
+# Sample inputs for the parity check, per model
+def _parity_cases():
+    from core.summarize import SUMMARY_MODEL
+    from core.translation import TRANSLATORS
+
+    sentences = [
+        "What is your name?",
+        "I would like a glass of water, please.",
+        "The train to the city leaves at seven in the morning.",
+        "Photosynthesis is the process by which plants make food from sunlight.",
+        "My brother and I are going to the library after school.",
+        "Can you help me with my homework?",
+    ]
+    lecture = (
+        "The water cycle describes how water moves through the environment. "
+        "Heat from the sun evaporates water from oceans, lakes and rivers. "
+        "The water vapour rises, cools and condenses into clouds. "
+        "When the droplets in the clouds grow heavy enough they fall as rain, snow or hail. "
+        "Some of this precipitation soaks into the ground and becomes groundwater, "
+        "while the rest flows over the surface back into rivers and the sea, where the cycle begins again. "
+    )
+    cases = [(task, model, sentences, {"max_length": 400}) for task, model in TRANSLATORS.values()]
+    cases.append(("summarization", SUMMARY_MODEL, [lecture, lecture * 2],
+                  {"max_length": 150, "min_length": 30, "do_sample": False}))
+    return cases
+
+
+def _output_text(output):
+    output = output[0] if isinstance(output, list) else output
+    return output.get("translation_text") or output.get("summary_text") or ""
+
+
+def _run(pipe, texts, kwargs):
+    start = time.perf_counter()
+    outputs = [_output_text(pipe(text, **kwargs)) for text in texts]
+    return outputs, (time.perf_counter() - start) / len(texts)
+
+
+# Compare a backend's outputs with the torch baseline on the sample inputs.
+# Similarity is difflib's ratio between the two output strings (1.0 = identical).
+def parity(backend, min_similarity=0.9, models=None):
+    from core.models import _pipeline_size
+
+    ok = True
+    for task, model, texts, kwargs in _parity_cases():
+        if models and model not in models:
+            continue
+        baseline_pipe = load_pipeline(task, model, "torch")
+        baseline, baseline_latency = _run(baseline_pipe, texts, kwargs)
+        baseline_mb = _pipeline_size(baseline_pipe) / (1024 * 1024)
+        del baseline_pipe
+
+        candidate_pipe = load_pipeline(task, model, backend)
+        candidate, candidate_latency = _run(candidate_pipe, texts, kwargs)
+        candidate_mb = _pipeline_size(candidate_pipe) / (1024 * 1024)
+        del candidate_pipe
+
+        similarities = [difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(baseline, candidate)]
+        exact = sum(a == b for a, b in zip(baseline, candidate))
+        passed = min(similarities) >= min_similarity
+        ok = ok and passed
+        print(f"{model} [{backend}] {'PASS' if passed else 'FAIL'}")
+        print(f"  exact matches     {exact}/{len(texts)}")
+        print(f"  similarity        mean {sum(similarities) / len(similarities):.3f}, min {min(similarities):.3f}")
+        print(f"  latency per input {baseline_latency * 1000:.0f} ms -> {candidate_latency * 1000:.0f} ms")
+        if baseline_mb and candidate_mb:
+            print(f"  model size        {baseline_mb:.0f} MB -> {candidate_mb:.0f} MB")
+        for a, b, similarity in zip(baseline, candidate, similarities):
+            if similarity < min_similarity:
+                print(f"    baseline:  {a}\n    candidate: {b}")
+    return ok
+
+
+# python -m core.backends parity --backend int8
+# python -m core.backends export      (pre-build the ONNX cache before deploying)
+def main():
+    parser = argparse.ArgumentParser(description="Inference backends for the summarization and translation models.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check = commands.add_parser("parity", help="compare a backend's outputs with the torch baseline")
+    check.add_argument("--backend", choices=[b for b in BACKENDS if b != "torch"], default="int8")
+    check.add_argument("--min-similarity", type=float, default=0.9,
+                       help="fail when any output is less similar to the baseline than this")
+    check.add_argument("--model", action="append", help="only check this model (repeatable)")
+    commands.add_parser("export", help=f"export every model to ONNX under {ONNX_CACHE_DIR}")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        for task, model, _, _ in _parity_cases():
+            load_pipeline(task, model, "onnx")
+            print(f"{model} -> {_onnx_dir(model)}")
+        return
+    sys.exit(0 if parity(args.backend, args.min_similarity, args.model) else 1)
+
+
+if __name__ == "__main__":
+    main()
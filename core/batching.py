@@ -0,0 +1,103 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from core.models import get_pipeline
+
+# How long the first request in a batch waits for company, and the batch cap
+BATCH_WAIT_MS = float(os.getenv("BATCH_WAIT_MS", "10"))
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+
+
+# Collects requests for one pipeline from every session's script thread and
+# runs them through the model as a single padded batch. Each caller gets a
+# Future that resolves to the same result a direct pipeline call would return.
+class MicroBatcher:
+    def __init__(self, task, model, max_wait_ms=BATCH_WAIT_MS, max_batch_size=BATCH_MAX_SIZE):
+        self.task = task
+        self.model = model
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.requests = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{model}", daemon=True)
+        self._thread.start()
+
+    def submit(self, text, **kwargs):
+        future = Future()
+        self._queue.put((text, kwargs, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Requests can only share a forward pass when their generation settings match
+            groups = {}
+            for text, kwargs, future in batch:
+                key = tuple(sorted(kwargs.items()))
+                groups.setdefault(key, []).append((text, future))
+            for key, items in groups.items():
+                self._run_group(dict(key), items)
+
+    def _run_group(self, kwargs, items):
+        live = [(text, future) for text, future in items if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        texts = [text for text, _ in live]
+        futures = [future for _, future in live]
+        try:
+            pipe = get_pipeline(self.task, self.model)
+            outputs = pipe(texts, batch_size=len(texts), **kwargs)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.requests += len(texts)
+        for future, output in zip(futures, outputs):
+            future.set_result(output if isinstance(output, list) else [output])
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0,
+            "queued": self._queue.qsize(),
+        }
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(task, model):
+    with _batchers_lock:
+        if (task, model) not in _batchers:
+            _batchers[(task, model)] = MicroBatcher(task, model)
+        return _batchers[(task, model)]
+
+
+# Drop-in replacement for pipeline(task, model=model)(text, **kwargs)
+def infer(task, model, text, **kwargs):
+    return get_batcher(task, model).submit(text, **kwargs).result()
+
+
+def stats():
+    with _batchers_lock:
+        return {f"{task}:{model}": batcher.stats() for (task, model), batcher in _batchers.items()}
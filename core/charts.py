@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+# "png" renders on the server (cached), "client" sends a Vega-Lite spec for the browser to draw
+CHART_BACKEND = os.getenv("CHART_BACKEND", "png")
+CHART_CACHE_ENTRIES = int(os.getenv("CHART_CACHE_ENTRIES", "256"))
+
+
+# A chart is described by a small, JSON-serializable spec:
+#   {"kind": "bar", "title": ..., "x": [labels], "y": [values],
+#    "colors": [per-bar colors] (optional), "xlabel": ..., "ylabel": ...,
+#    "rotate_xticks": degrees (optional)}
+def bar_spec(x, y, title, xlabel=None, ylabel=None, colors=None, rotate_xticks=0):
+    return {
+        "kind": "bar",
+        "title": title,
+        "x": [str(label) for label in x],
+        "y": [float(value) for value in y],
+        "colors": list(colors) if colors is not None else None,
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "rotate_xticks": rotate_xticks,
+    }
+
+
+def spec_hash(spec):
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+stats = {"hits": 0, "renders": 0}
+
+
+def _render(spec):
+    # The object-oriented API keeps no global pyplot state, so figures can be
+    # drawn from any session thread and are freed as soon as they go out of scope
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    try:
+        ax = fig.subplots()
+        ax.bar(spec["x"], spec["y"], color=spec.get("colors") or "skyblue")
+        if spec.get("xlabel"):
+            ax.set_xlabel(spec["xlabel"])
+        if spec.get("ylabel"):
+            ax.set_ylabel(spec["ylabel"])
+        ax.set_title(spec.get("title") or "")
+        if spec.get("rotate_xticks"):
+            ax.tick_params(axis="x", labelrotation=spec["rotate_xticks"])
+        fig.tight_layout()
+        buffer = BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+# PNG bytes for a spec; identical specs are rendered once and served from an LRU cache
+def render_png(spec):
+    key = spec_hash(spec)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            return _cache[key]
+    png = _render(spec)
+    with _cache_lock:
+        _cache[key] = png
+        stats["renders"] += 1
+        while len(_cache) > CHART_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return png
+
+
+# The same chart as a Vega-Lite spec, drawn by the browser
+def vega_lite(spec):
+    colors = spec.get("colors") or ["skyblue"] * len(spec["x"])
+    return {
+        "title": spec.get("title") or "",
+        "data": {"values": [{"x": x, "y": y, "color": color}
+                            for x, y, color in zip(spec["x"], spec["y"], colors)]},
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "x", "type": "nominal", "sort": None, "title": spec.get("xlabel"),
+                  "axis": {"labelAngle": -spec.get("rotate_xticks", 0)}},
+            "y": {"field": "y", "type": "quantitative", "title": spec.get("ylabel")},
+            "color": {"field": "color", "type": "nominal", "scale": None},
+        },
+    }
@@ -0,0 +1,172 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+
+CHAT_DB_PATH = os.getenv("CHAT_DB_PATH", "chat_history.db")
+CHAT_DB_POOL_SIZE = int(os.getenv("CHAT_DB_POOL_SIZE", "4"))
+# Inserts arriving within this window are written in one transaction
+CHAT_DB_COMMIT_MS = float(os.getenv("CHAT_DB_COMMIT_MS", "20"))
+
+DEFAULT_CONVERSATION = "default"
+
+logger = logging.getLogger(__name__)
+
+# Statements are kept as constants so each pooled connection's statement
+# cache reuses the compiled form instead of re-preparing them per call
+INSERT_SQL = "INSERT INTO chat (conversation_id, user_id, speaker, message, created_at) VALUES (?, ?, ?, ?, ?)"
+PAGE_SQL = "SELECT id, speaker, message FROM chat WHERE conversation_id = ? AND id < ? ORDER BY id DESC LIMIT ?"
+DELETE_SQL = "DELETE FROM chat WHERE conversation_id = ?"
+
+
+# Chat history store shared by every session in the process.
+# Connections are pooled and run in WAL mode so readers never block the
+# writer, and inserts go through a single writer thread that group-commits
+# whatever has queued up, which avoids "database is locked" under load.
+class ChatStore:
+    def __init__(self, path=CHAT_DB_PATH, pool_size=CHAT_DB_POOL_SIZE, commit_ms=CHAT_DB_COMMIT_MS):
+        self.path = path
+        self.commit_interval = commit_ms / 1000
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        self._init_schema()
+        self._pending = queue.Queue()  # (rows, future) per save call
+        self._last_write = {}  # conversation_id -> future of its most recently queued rows
+        self._last_write_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="chat-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _init_schema(self):
+        with self.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS chat (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    speaker TEXT,
+                    message TEXT
+                )
+            ''')
+            # Databases created before conversations were tracked only have
+            # speaker/message; their rows become the default conversation
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(chat)")}
+            if "conversation_id" not in columns:
+                conn.execute(f"ALTER TABLE chat ADD COLUMN conversation_id TEXT NOT NULL DEFAULT '{DEFAULT_CONVERSATION}'")
+            if "user_id" not in columns:
+                conn.execute("ALTER TABLE chat ADD COLUMN user_id TEXT")
+            if "created_at" not in columns:
+                conn.execute("ALTER TABLE chat ADD COLUMN created_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_conversation ON chat (conversation_id, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_user ON chat (user_id, id)")
+            conn.commit()
+
+    def _write_loop(self):
+        while True:
+            writes = [self._pending.get()]
+            deadline = time.monotonic() + self.commit_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    writes.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                with self.connection() as conn:
+                    with conn:
+                        conn.executemany(INSERT_SQL, [row for rows, _ in writes for row in rows])
+            except sqlite3.Error as e:
+                logger.exception("Saving %d chat messages failed", sum(len(rows) for rows, _ in writes))
+                for _, future in writes:
+                    future.set_exception(e)
+            else:
+                for _, future in writes:
+                    future.set_result(None)
+
+    # Queue rows for the next group commit; the future resolves once they are on
+    # disk, or carries the error if the commit failed
+    def _queue(self, conversation_id, rows):
+        future = Future()
+        with self._last_write_lock:
+            self._last_write[conversation_id] = future
+        future.add_done_callback(lambda done: self._forget(conversation_id, done))
+        self._pending.put((rows, future))
+        return future
+
+    def _forget(self, conversation_id, future):
+        with self._last_write_lock:
+            if self._last_write.get(conversation_id) is future:
+                del self._last_write[conversation_id]
+
+    # Queue a message for the next group commit and return its future; pass
+    # wait=True to block until it is on disk (raising sqlite3.Error if saving failed)
+    def save_message(self, speaker, message, conversation_id=DEFAULT_CONVERSATION, user_id=None, wait=False):
+        future = self._queue(conversation_id, [(conversation_id, user_id, speaker, message, time.time())])
+        if wait:
+            future.result()
+        return future
+
+    def save_messages(self, messages, conversation_id=DEFAULT_CONVERSATION, user_id=None):
+        now = time.time()
+        return self._queue(conversation_id, [(conversation_id, user_id, speaker, message, now)
+                                             for speaker, message in messages])
+
+    # Block until the messages queued so far for a conversation (or for every
+    # conversation) have been written or have failed. Batches are committed in
+    # queue order, so the newest one finishing means the earlier ones have too.
+    def flush(self, conversation_id=None):
+        with self._last_write_lock:
+            if conversation_id is None:
+                futures = list(self._last_write.values())
+            else:
+                futures = [self._last_write[conversation_id]] if conversation_id in self._last_write else []
+        wait(futures)
+
+    # One page of a conversation, newest first, as (id, speaker, message).
+    # Pass the smallest id of a page as before_id to fetch the page before it.
+    def load_page(self, conversation_id=DEFAULT_CONVERSATION, limit=50, before_id=None):
+        self.flush(conversation_id)
+        with self.connection() as conn:
+            return conn.execute(PAGE_SQL, (conversation_id, before_id or 2 ** 63 - 1, limit)).fetchall()
+
+    # The most recent messages of a conversation in chronological order as (speaker, message)
+    def load_history(self, conversation_id=DEFAULT_CONVERSATION, limit=50):
+        rows = self.load_page(conversation_id, limit)
+        return [(speaker, message) for _, speaker, message in reversed(rows)]
+
+    def delete_conversation(self, conversation_id=DEFAULT_CONVERSATION):
+        self.flush(conversation_id)
+        with self.connection() as conn:
+            with conn:
+                conn.execute(DELETE_SQL, (conversation_id,))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ChatStore()
+        return _store
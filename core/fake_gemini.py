@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+from core.stub_model import stub_reply
+
+# Local stand-in for the Gemini REST API (generateContent and
+# streamGenerateContent), for load tests and running without an API key.
+# Point the app at it with GEMINI_API_ENDPOINT=http://127.0.0.1:8001; it
+# answers like GEMINI_STUB does, with configurable latency and the 429s of a
+# rate-limited account.
+
+_RATE_LIMITED = {"error": {"code": 429, "message": "Resource has been exhausted (e.g. check quota).",
+                           "status": "RESOURCE_EXHAUSTED"}}
+
+
+def _prompt(body):
+    contents = body.get("contents") or [{}]
+    return "".join(part.get("text", "") for part in contents[-1].get("parts", []))
+
+
+def _response(text, prompt, finished=True):
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    prompt_tokens, reply_tokens = len(prompt) // 4, len(text) // 4
+    return {"candidates": [candidate], "usageMetadata": {
+        "promptTokenCount": prompt_tokens, "candidatesTokenCount": reply_tokens,
+        "totalTokenCount": prompt_tokens + reply_tokens}}
+
+
+#   latency_s         time before the first (or only) part of a reply
+#   chunk_delay_s     time between streamed parts
+#   error_rate        share of requests answered with 429 at random
+#   max_concurrency   requests beyond this many in flight are answered with 429
+def make_app(latency_s=0.5, chunk_delay_s=0.05, chunk_size=80, error_rate=0.0, max_concurrency=None):
+    stats = {"requests": 0, "rate_limited": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    async def generate(request):
+        model, _, method = request.match_info["name"].partition(":")
+        if method not in ("generateContent", "streamGenerateContent"):
+            raise web.HTTPNotFound()
+        stats["requests"] += 1
+        if (max_concurrency and stats["in_flight"] >= max_concurrency) or random.random() < error_rate:
+            stats["rate_limited"] += 1
+            return web.json_response(_RATE_LIMITED, status=429)
+
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            body = await request.json()
+            prompt = _prompt(body)
+            text = stub_reply(prompt)
+            await asyncio.sleep(latency_s)
+            if method == "generateContent":
+                return web.json_response(_response(text, prompt))
+
+            # Streamed replies are one JSON array, written element by element
+            response = web.StreamResponse(headers={"Content-Type": "application/json"})
+            await response.prepare(request)
+            chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+            for i, chunk in enumerate(chunks):
+                if i:
+                    await asyncio.sleep(chunk_delay_s)
+                prefix = "[" if i == 0 else ",\n"
+                last = i == len(chunks) - 1
+                await response.write((prefix + json.dumps(_response(chunk, prompt, finished=last))).encode())
+            await response.write(b"]")
+            await response.write_eof()
+            return response
+        finally:
+            stats["in_flight"] -= 1
+
+    async def get_stats(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app["stats"] = stats
+    app.add_routes([
+        web.post("/v1beta/models/{name}", generate),
+        web.get("/stats", get_stats),
+    ])
+    return app
+
+
+# python -m core.fake_gemini --port 8001 --latency 0.5 --error-rate 0.1
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini REST server for local testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before a reply starts")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="seconds between streamed parts")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--max-concurrency", type=int, help="answer 429 beyond this many requests in flight")
+    args = parser.parse_args()
+    web.run_app(make_app(args.latency, args.chunk_delay, error_rate=args.error_rate,
+                         max_concurrency=args.max_concurrency),
+                host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
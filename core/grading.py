@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.quiz_bank import normalize_topic, topic_tokens
+
+GRADING_DB_PATH = os.getenv("GRADING_DB_PATH", "grading.db")
+
+# Share of students in the upper and lower groups for the discrimination index
+GROUP_FRACTION = 0.27
+UNANSWERED = -1
+# In a cohort matrix: the student's quiz didn't include this question
+NOT_ASKED = -2
+
+
+# Stable id for a set of questions, in order (e.g. for widget keys)
+def quiz_id(questions):
+    raw = json.dumps([[q["question"], q["options"], q["correct_answer"]] for q in questions])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# Stable id of one question, so answers to it pool across quizzes that sampled
+# it in any order or combination
+def question_id(question):
+    return quiz_id([question])
+
+
+# The class a submission counts towards: the grade and the topic, matched the
+# way the quiz bank matches topics, so every wording of it lands in one cohort
+def cohort_id(topic, grade):
+    return f"{grade}: {' '.join(sorted(topic_tokens(topic))) or normalize_topic(topic)}"
+
+
+def answer_key(questions):
+    return np.array([q["options"].index(q["correct_answer"]) for q in questions], dtype=np.int8)
+
+
+# Turn chosen option texts into a (students, questions) int8 matrix of option
+# indices, UNANSWERED where nothing (or something unknown) was picked
+def encode_answers(questions, submissions):
+    lookup = [{option: i for i, option in enumerate(q["options"])} for q in questions]
+    responses = np.full((len(submissions), len(questions)), UNANSWERED, dtype=np.int8)
+    for s, answers in enumerate(submissions):
+        for i, answer in enumerate(answers[:len(questions)]):
+            responses[s, i] = lookup[i].get(answer, UNANSWERED)
+    return responses
+
+
+# Boolean (students, questions) matrix of correct answers
+def grade(responses, key):
+    return np.asarray(responses) == np.asarray(key)[np.newaxis, :]
+
+
+# Percentage score of every student, over the questions they were asked
+def scores(responses, key):
+    asked = (np.asarray(responses) != NOT_ASKED).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return grade(responses, key).sum(axis=1) / asked * 100
+
+
+# Classical item analysis over a cohort. Students of a banked topic are each
+# asked a sample of its questions, so entries can be NOT_ASKED; every statistic
+# of a question only counts the students who were asked it. Per question:
+#   students        how many were asked it
+#   difficulty      share of them answering correctly (p-value)
+#   discrimination  correlation of the item with the share of their other
+#                   questions answered correctly (corrected point-biserial)
+#   upper_lower     difficulty in the top group minus the bottom group
+#   unanswered      share of them who left it blank
+def item_analysis(responses, key, labels=None):
+    responses = np.asarray(responses)
+    asked = (responses != NOT_ASKED).astype(np.float64)
+    correct = grade(responses, key).astype(np.float64)
+    questions = correct.shape[1]
+    asked_count = asked.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        difficulty = correct.sum(axis=0) / asked_count
+
+        # Correlate every item with the rest of each student's test in one
+        # pass, weighting out students who weren't asked it or nothing else
+        rest = (correct.sum(axis=1, keepdims=True) - correct) / (asked.sum(axis=1, keepdims=True) - asked)
+        weight = asked * np.isfinite(rest)
+        rest = np.where(weight > 0, rest, 0.0)
+        n = weight.sum(axis=0)
+        item_centered = correct - (weight * correct).sum(axis=0) / n
+        rest_centered = rest - (weight * rest).sum(axis=0) / n
+        covariance = (weight * item_centered * rest_centered).sum(axis=0)
+        spread = np.sqrt((weight * item_centered ** 2).sum(axis=0) * (weight * rest_centered ** 2).sum(axis=0))
+        discrimination = np.where(spread > 0, covariance / spread, np.nan)
+
+        total = scores(responses, key)
+        group = max(1, int(round(len(total) * GROUP_FRACTION)))
+        order = np.argsort(np.nan_to_num(total, nan=-1.0), kind="stable")
+        upper, lower = order[-group:], order[:group]
+        upper_lower = (correct[upper].sum(axis=0) / asked[upper].sum(axis=0)
+                       - correct[lower].sum(axis=0) / asked[lower].sum(axis=0))
+
+        unanswered = (responses == UNANSWERED).sum(axis=0) / asked_count
+
+    return pd.DataFrame({
+        "Question": labels if labels is not None else [f"Q{i + 1}" for i in range(questions)],
+        "Students": asked_count.astype(int),
+        "Difficulty": difficulty,
+        "Discrimination": discrimination,
+        "Upper-Lower": upper_lower,
+        "Unanswered": unanswered,
+    })
+
+
+# Answers stored one row per student and question, keyed by the question
+# itself, so a cohort's submissions pool however each quiz was sampled. A
+# cohort loads straight into a single (students, questions) matrix.
+class Gradebook:
+    def __init__(self, path=GRADING_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS cohorts (
+                cohort TEXT PRIMARY KEY,
+                topic TEXT,
+                grade TEXT
+            );
+            CREATE TABLE IF NOT EXISTS questions (
+                question_id TEXT PRIMARY KEY,
+                question TEXT,
+                options TEXT,
+                correct_answer TEXT
+            );
+            CREATE TABLE IF NOT EXISTS responses (
+                cohort TEXT,
+                student TEXT,
+                question_id TEXT,
+                choice INTEGER,
+                submitted_at REAL,
+                PRIMARY KEY (cohort, student, question_id)
+            );
+        ''')
+        self._conn.commit()
+
+    # Record the answers of any number of students to the same questions in
+    # one transaction: submissions is a list of (student, responses row)
+    def record_many(self, topic, grade, questions, submissions):
+        cohort = cohort_id(topic, grade)
+        ids = [question_id(q) for q in questions]
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO cohorts (cohort, topic, grade) VALUES (?, ?, ?)",
+                               (cohort, topic, grade))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO questions (question_id, question, options, correct_answer) VALUES (?, ?, ?, ?)",
+                [(qid, q["question"], json.dumps(q["options"]), q["correct_answer"]) for qid, q in zip(ids, questions)])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses (cohort, student, question_id, choice, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                [(cohort, student, qid, int(choice), now)
+                 for student, row in submissions for qid, choice in zip(ids, row)])
+        return cohort
+
+    def record(self, topic, grade, questions, student, responses):
+        return self.record_many(topic, grade, questions, [(student, responses)])
+
+    # Every cohort with its topic, grade and number of students
+    def cohorts(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.cohort, c.topic, c.grade, COUNT(DISTINCT r.student), COUNT(DISTINCT r.question_id) "
+                "FROM cohorts c JOIN responses r ON r.cohort = c.cohort GROUP BY c.cohort ORDER BY c.grade, c.topic"
+            ).fetchall()
+        return [{"cohort": cohort, "topic": topic, "grade": grade, "students": students, "questions": questions}
+                for cohort, topic, grade, students, questions in rows]
+
+    # (students, questions, responses) of a cohort; responses is a
+    # (students, questions) int8 matrix, NOT_ASKED where a student wasn't
+    # asked that question
+    def cohort(self, cohort):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT student, question_id, choice FROM responses WHERE cohort = ? ORDER BY submitted_at, student",
+                (cohort,)).fetchall()
+            found = self._conn.execute(
+                "SELECT DISTINCT q.question_id, q.question, q.options, q.correct_answer FROM questions q "
+                "JOIN responses r ON r.question_id = q.question_id WHERE r.cohort = ? ORDER BY q.question",
+                (cohort,)).fetchall()
+        students = list(dict.fromkeys(student for student, _, _ in rows))
+        questions = [{"question": q, "options": json.loads(options), "correct_answer": answer}
+                     for _, q, options, answer in found]
+        student_index = {student: i for i, student in enumerate(students)}
+        question_index = {qid: i for i, (qid, _, _, _) in enumerate(found)}
+        responses = np.full((len(students), len(questions)), NOT_ASKED, dtype=np.int8)
+        if rows:
+            r = np.array([student_index[student] for student, _, _ in rows])
+            c = np.array([question_index[qid] for _, qid, _ in rows])
+            responses[r, c] = [choice for _, _, choice in rows]
+        return students, questions, responses
+
+
+_gradebook = None
+_gradebook_lock = threading.Lock()
+
+
+def get_gradebook():
+    global _gradebook
+    with _gradebook_lock:
+        if _gradebook is None:
+            _gradebook = Gradebook()
+        return _gradebook
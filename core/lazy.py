@@ -0,0 +1,69 @@
+import contextvars
+import importlib
+import sys
+import threading
+import time
+import types
+
+# Which part of the app is running, so imports can be attributed to it
+_section = contextvars.ContextVar("section", default="startup")
+# Guards the tables below; held only briefly, never during an import
+_lock = threading.Lock()
+_facades = {}
+# module name -> lock held while that module is imported, so two sections
+# importing different heavy packages don't wait for each other. Re-entrant in
+# case the module's own import touches its facade.
+_module_locks = {}
+
+# section -> {"seconds": time spent importing, "modules": top-level packages pulled in}
+import_report = {}
+
+
+def set_section(name):
+    _section.set(name)
+
+
+def _load(name):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with _lock:
+        module_lock = _module_locks.setdefault(name, threading.RLock())
+    with module_lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        before = set(sys.modules)
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        elapsed = time.perf_counter() - start
+        loaded = {module_name.split(".")[0] for module_name in set(sys.modules) - before}
+    with _lock:
+        entry = import_report.setdefault(_section.get(), {"seconds": 0.0, "modules": set()})
+        entry["seconds"] += elapsed
+        entry["modules"].update(loaded)
+    return module
+
+
+# Stands in for a module until one of its attributes is used, then imports it
+class LazyModule(types.ModuleType):
+    def __getattr__(self, attr):
+        return getattr(_load(self.__name__), attr)
+
+
+# Module facade for heavy dependencies: nothing is imported until first use,
+# and once it has been, the real module is handed out directly
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    with _lock:
+        if name not in _facades:
+            _facades[name] = LazyModule(name)
+        return _facades[name]
+
+
+def report_rows():
+    return [
+        {"Section": section, "Import time (s)": round(entry["seconds"], 3),
+         "Modules": ", ".join(sorted(entry["modules"]))}
+        for section, entry in import_report.items()
+    ]
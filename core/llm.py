@@ -0,0 +1,329 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+# Requests admitted per second on average, and how many may go out back to back
+LLM_RATE_PER_S = float(os.getenv("LLM_RATE_PER_S", "5"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+# Model calls in flight at once, of which some are held back for interactive traffic
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_INTERACTIVE_RESERVE = int(os.getenv("LLM_INTERACTIVE_RESERVE", "2"))
+# Retries of rate-limited / failed calls, with full-jitter exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_RETRY_BASE_S = float(os.getenv("LLM_RETRY_BASE_S", "0.5"))
+LLM_RETRY_MAX_S = float(os.getenv("LLM_RETRY_MAX_S", "8"))
+# Consecutive failures that open the circuit, and how long it stays open
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_S = float(os.getenv("LLM_BREAKER_RESET_S", "30"))
+
+# Lower value = served first
+INTERACTIVE, NORMAL, BULK = 0, 1, 2
+
+# Time a call may take, queueing and retries included, when the caller set no deadline
+DEFAULT_DEADLINES_S = {
+    INTERACTIVE: float(os.getenv("LLM_INTERACTIVE_DEADLINE_S", "30")),
+    NORMAL: float(os.getenv("LLM_DEADLINE_S", "60")),
+    BULK: float(os.getenv("LLM_BULK_DEADLINE_S", "180")),
+}
+
+# HTTP statuses worth retrying: rate limited, or the service having a bad moment
+_RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+_priority = contextvars.ContextVar("llm_priority", default=NORMAL)
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+
+class LLMUnavailable(RuntimeError):
+    pass
+
+
+# Model calls made inside the block are queued with this priority
+@contextlib.contextmanager
+def priority(level):
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# Model calls made inside the block must finish within seconds (an outer,
+# earlier deadline still wins). Queueing, backoff and the request timeout all
+# come out of the same budget.
+@contextlib.contextmanager
+def deadline(seconds):
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(min(at, outer) if outer is not None else at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _retryable(error):
+    code = getattr(error, "code", None)
+    if callable(code):  # grpc errors expose code() rather than an HTTP status
+        code = None
+    if code is None:  # requests' HTTPError carries the status on its response
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    if code is not None:
+        return code in _RETRYABLE_CODES
+    # Resets, timeouts and DNS failures; requests.RequestException is an OSError too
+    return isinstance(error, OSError)
+
+
+# Admission for model calls: a token bucket for the request rate and a cap on
+# calls in flight, shared by one queue ordered by priority. Interactive
+# requests go ahead of every queued bulk request, and bulk requests can't take
+# the last LLM_INTERACTIVE_RESERVE slots.
+class Admission:
+    def __init__(self, rate=LLM_RATE_PER_S, burst=LLM_BURST, max_concurrency=LLM_MAX_CONCURRENCY,
+                 interactive_reserve=LLM_INTERACTIVE_RESERVE):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.interactive_reserve = min(interactive_reserve, max_concurrency - 1)
+        self.in_flight = 0
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _slot_free(self, level):
+        limit = self.max_concurrency - (0 if level == INTERACTIVE else self.interactive_reserve)
+        return self.in_flight < limit
+
+    def acquire(self, level, until):
+        with self._cond:
+            entry = (level, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = None
+                    if self._waiters[0] == entry and self._slot_free(level):
+                        if self._tokens >= 1:
+                            heapq.heappop(self._waiters)
+                            self._tokens -= 1
+                            self.in_flight += 1
+                            self._cond.notify_all()
+                            return
+                        wait = (1 - self._tokens) / self.rate
+                    remaining = until - now
+                    if remaining <= 0:
+                        raise LLMUnavailable("The AI service is busy right now, please try again in a moment.")
+                    self._cond.wait(min(wait, remaining) if wait is not None else remaining)
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def waiting(self):
+        with self._cond:
+            return len(self._waiters)
+
+
+# Stops calling a failing service for a while instead of piling up timeouts.
+# After reset_s one trial call is let through; its outcome closes the circuit
+# again or keeps it open for another reset_s.
+class CircuitBreaker:
+    def __init__(self, failures=LLM_BREAKER_FAILURES, reset_s=LLM_BREAKER_RESET_S):
+        self.failure_threshold = failures
+        self.reset_s = reset_s
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self._trial or time.monotonic() - self.opened_at >= self.reset_s else "open"
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self._trial or time.monotonic() - self.opened_at < self.reset_s:
+                raise LLMUnavailable("The AI service is temporarily unavailable, please try again shortly.")
+            self._trial = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    # A call that ended without a verdict on the service (e.g. a bad request)
+    def record_neutral(self):
+        with self._lock:
+            self._trial = False
+
+
+# Every model call goes through here: admission by priority, rate and
+# concurrency, a deadline covering the whole call, retries with jittered
+# backoff for rate limits and transient errors, and the circuit breaker.
+class LLMGateway:
+    def __init__(self, admission=None, breaker=None, max_retries=LLM_MAX_RETRIES,
+                 retry_base_s=LLM_RETRY_BASE_S, retry_max_s=LLM_RETRY_MAX_S):
+        self.admission = admission or Admission()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def call(self, func, *args, stream=False, **kwargs):
+        level = _priority.get()
+        until = _deadline.get() or time.monotonic() + DEFAULT_DEADLINES_S[level]
+        attempt = 0
+        request_options = kwargs.pop("request_options", None) or {}
+        while True:
+            self.breaker.before_call()
+            try:
+                self.admission.acquire(level, until)
+            except BaseException:
+                # No request was sent, so a half-open trial must not stay claimed
+                self.breaker.record_neutral()
+                raise
+            remaining = until - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise TimeoutError("deadline exceeded before the request was sent")
+                result = func(*args, stream=stream, request_options=dict(request_options, timeout=remaining), **kwargs)
+            except Exception as e:
+                self.admission.release()
+                if not _retryable(e):
+                    self.breaker.record_neutral()
+                    raise
+                # Being rate limited says the service is up; only outages open the circuit
+                if getattr(e, "code", None) == 429:
+                    self.breaker.record_neutral()
+                else:
+                    self.breaker.record_failure()
+                attempt += 1
+                delay = random.uniform(0, min(self.retry_max_s, self.retry_base_s * 2 ** (attempt - 1)))
+                if attempt > self.max_retries or time.monotonic() + delay >= until:
+                    self.failures += 1
+                    raise LLMUnavailable("The AI service did not answer in time, please try again.") from e
+                self.retries += 1
+                time.sleep(delay)
+                continue
+            self.calls += 1
+            if stream:
+                # The slot is held until the whole reply has been read
+                return _GuardedStream(result, self)
+            self.admission.release()
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "in_flight": self.admission.in_flight,
+            "waiting": self.admission.waiting(),
+            "circuit": self.breaker.state,
+        }
+
+
+# A streamed reply that gives its admission slot back once it has been read
+# to the end, fails, or is dropped
+class _GuardedStream:
+    def __init__(self, response, gateway):
+        self._response = response
+        self._gateway = gateway
+        self._released = False
+
+    def _release(self, ok):
+        if not self._released:
+            self._released = True
+            self._gateway.admission.release()
+            if ok:
+                self._gateway.breaker.record_success()
+            else:
+                self._gateway.breaker.record_failure()
+
+    def __iter__(self):
+        try:
+            yield from self._response
+        except Exception:
+            self._release(False)
+            raise
+        self._release(True)
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __del__(self):
+        self._release(True)
+
+
+class GatewayChat:
+    def __init__(self, chat, gateway):
+        self._chat = chat
+        self._gateway = gateway
+
+    def send_message(self, content, **kwargs):
+        return self._gateway.call(self._chat.send_message, content, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+# Drop-in wrapper for a GenerativeModel whose calls (and those of its chats) go through the gateway
+class GatewayModel:
+    def __init__(self, model, gateway):
+        self._model = model
+        self.gateway = gateway
+
+    def generate_content(self, contents, **kwargs):
+        return self.gateway.call(self._model.generate_content, contents, **kwargs)
+
+    def start_chat(self, **kwargs):
+        return GatewayChat(self._model.start_chat(**kwargs), self.gateway)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Memory budget for all loaded transformers pipelines, in megabytes
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "4096"))
+
+
+# Pipelines are built by the configured inference backend (see core.backends)
+def _default_loader(task, model):
+    from core.backends import load_pipeline
+    return load_pipeline(task, model)
+
+
+# Approximate resident size of a pipeline (or a bare model, such as a
+# SentenceTransformer) from its parameters and buffers, or from the exported
+# model files when it runs on ONNX Runtime
+def _pipeline_size(pipe):
+    model = getattr(pipe, "model", pipe)
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        # Dynamically quantized layers keep their int8 weights outside parameters()
+        for module in model.modules():
+            if hasattr(module, "_weight_bias"):
+                tensors.extend(t for t in module._weight_bias() if t is not None)
+        # Keyed by address, so a tensor reached more than once (tied weights,
+        # a packed weight that is also a buffer) is counted once
+        sizes = {t.data_ptr(): t.numel() * t.element_size() for t in tensors}
+        return sum(sizes.values())
+    except Exception:
+        pass
+    save_dir = getattr(model, "model_save_dir", None)
+    if save_dir and os.path.isdir(save_dir):
+        return sum(os.path.getsize(os.path.join(save_dir, name))
+                   for name in os.listdir(save_dir) if name.endswith((".onnx", ".onnx_data")))
+    return 0
+
+
+# Process-wide registry of transformers pipelines.
+# Streamlit keeps imported modules alive between reruns and sessions, so a
+# pipeline loaded here once is shared by every user of the process. Models are
+# loaded lazily on first use and evicted least-recently-used first once the
+# memory budget is exceeded.
+class ModelRegistry:
+    def __init__(self, budget_mb=MODEL_MEMORY_BUDGET_MB, loader=None):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.loader = loader or _default_loader
+        self._models = OrderedDict()  # (task, model) -> (pipeline, size in bytes)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = {}
+
+    def get(self, task, model):
+        key = (task, model)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model; the others wait and then hit
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key][0]
+                self.misses += 1
+
+            start = time.perf_counter()
+            pipe = self.loader(task, model)
+            elapsed = time.perf_counter() - start
+            size = _pipeline_size(pipe)
+
+            with self._lock:
+                self.load_seconds[model] = elapsed
+                self._models[key] = (pipe, size)
+                self._evict()
+            return pipe
+
+    # Drop least recently used pipelines until the budget fits, always keeping
+    # the most recent one so a single oversized model can still be served
+    def _evict(self):
+        while len(self._models) > 1 and self.resident_bytes() > self.budget_bytes:
+            self._models.popitem(last=False)
+            self.evictions += 1
+
+    def resident_bytes(self):
+        return sum(size for _, size in self._models.values())
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds": dict(self.load_seconds),
+                "loaded": [model for _, model in self._models],
+                "resident_mb": round(self.resident_bytes() / (1024 * 1024), 1),
+                "budget_mb": self.budget_bytes // (1024 * 1024),
+            }
+
+
+registry = ModelRegistry()
+
+
+def get_pipeline(task, model):
+    return registry.get(task, model)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_MB", "50")) * 1024 * 1024
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "500"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 2)))
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", ".pdf_cache")
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_MB", "500")) * 1024 * 1024
+
+# Pages handed to a worker at a time; smaller documents are read inline
+PAGES_PER_TASK = 16
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the app process runs many threads
+            _pool = ProcessPoolExecutor(PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _extract_pages(path, start, stop):
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+# Copy an upload to a temporary file in fixed-size blocks while hashing it,
+# so the whole file never has to sit in memory
+def _spool(upload, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+    try:
+        with tmp:
+            while True:
+                block = upload.read(block_size)
+                if not block:
+                    break
+                size += len(block)
+                if size > PDF_MAX_BYTES:
+                    raise ValueError(f"PDF is larger than the {PDF_MAX_BYTES // (1024 * 1024)} MB limit.")
+                digest.update(block)
+                tmp.write(block)
+    except Exception:
+        os.unlink(tmp.name)
+        raise
+    return tmp.name, digest.hexdigest()
+
+
+def _cache_path(file_hash):
+    return os.path.join(PDF_CACHE_DIR, f"{file_hash}.jsonl")
+
+
+# Keep the cache under PDF_CACHE_MAX_BYTES, dropping the least recently used
+# files first (a cache hit touches its file)
+def _evict_cache():
+    entries = []
+    with os.scandir(PDF_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".jsonl"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= PDF_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _extract(path, num_pages):
+    if num_pages <= PAGES_PER_TASK:
+        yield from _extract_pages(path, 0, num_pages)
+        return
+    pool = get_pool()
+    # Keep a couple of ranges per worker in flight and yield strictly in page order
+    pending = deque()
+    for start in range(0, num_pages, PAGES_PER_TASK):
+        stop = min(start + PAGES_PER_TASK, num_pages)
+        pending.append(pool.submit(_extract_pages, path, start, stop))
+        if len(pending) >= PDF_WORKERS * 2:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+# Yield the text of each page of an uploaded PDF, lazily and in order.
+# Pages are extracted in a process pool and cached on disk by file hash,
+# so re-uploading the same file costs nothing.
+def iter_pdf_pages(upload):
+    path, file_hash = _spool(upload)
+    try:
+        cached = _cache_path(file_hash)
+        try:
+            f = open(cached, encoding="utf-8")
+        except FileNotFoundError:
+            pass  # not extracted yet, or evicted
+        else:
+            with f:
+                os.utime(f.fileno())
+                for line in f:
+                    yield json.loads(line)
+            return
+
+        try:
+            num_pages = len(PdfReader(path).pages)
+        except PdfReadError as e:
+            raise ValueError(f"Not a readable PDF: {e}")
+        if num_pages > PDF_MAX_PAGES:
+            raise ValueError(f"PDF has {num_pages} pages; the limit is {PDF_MAX_PAGES}.")
+
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        partial = f"{cached}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(partial, "w", encoding="utf-8") as out:
+                try:
+                    for text in _extract(path, num_pages):
+                        out.write(json.dumps(text) + "\n")
+                        yield text
+                except PdfReadError as e:
+                    raise ValueError(f"Not a readable PDF: {e}")
+            os.replace(partial, cached)
+            _evict_cache()
+        finally:
+            if os.path.exists(partial):
+                os.unlink(partial)
+    finally:
+        os.unlink(path)
+
+
+def extract_pdf_text(upload):
+    return "\n".join(iter_pdf_pages(upload))
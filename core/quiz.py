@@ -0,0 +1,144 @@
+import json
+import re
+
+QUIZ_SIZE = 10
+# Generation rounds before giving up on filling the quiz
+QUIZ_MAX_ROUNDS = 3
+
+QUIZ_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question": {"type": "string"},
+        "options": {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 4},
+        "correct_answer": {"type": "string", "description": "exactly one of the options"},
+    },
+    "required": ["question", "options", "correct_answer"],
+}
+
+PROMPT = (
+    "Generate {count} quiz questions for {grade} students on the topic {topic} with 4 options and correct answer. "
+    "Reply in JSON Lines: one JSON object per line, no numbering, no markdown, nothing else. "
+    "Each object must match this JSON schema: {schema}"
+)
+MORE_PROMPT = " Do not repeat any of these questions: {existing}"
+
+_letter_answer = re.compile(r"^\(?([A-Da-d])\)?[.):]?$")
+
+
+# Check one parsed item against the schema and normalize it into
+# {"question", "options", "correct_answer"}; returns None if it is unusable
+def validate_item(item):
+    if not isinstance(item, dict):
+        return None
+    question = item.get("question")
+    options = item.get("options")
+    answer = item.get("correct_answer")
+    if not isinstance(question, str) or not question.strip():
+        return None
+    if not isinstance(options, list) or len(options) != 4:
+        return None
+    if not all(isinstance(option, str) and option.strip() for option in options):
+        return None
+    options = [option.strip() for option in options]
+    if len(set(options)) != 4 or not isinstance(answer, str):
+        return None
+    answer = answer.strip()
+    if answer not in options:
+        # Accept a bare option letter such as "B" or "(b)"
+        letter = _letter_answer.match(answer)
+        if not letter:
+            return None
+        answer = options["ABCD".index(letter.group(1).upper())]
+    return {"question": question.strip(), "options": options, "correct_answer": answer}
+
+
+# Incremental parser for a streamed quiz. Feed it chunks as they arrive; every
+# complete, valid question is returned as soon as its object is closed.
+# Models don't always answer in the JSON Lines they were asked for, so objects
+# are decoded wherever they start: one per line, pretty-printed over several
+# lines, inside a JSON array or a {"questions": [...]} wrapper, or in a
+# markdown code fence. Anything between objects is skipped.
+class QuizStreamParser:
+    def __init__(self):
+        self.items = []
+        self.rejected = 0
+        self._buffer = ""
+        self._seen = set()
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text):
+        self._buffer += text
+        return self._drain(final=False)
+
+    def close(self):
+        return self._drain(final=True)
+
+    def _drain(self, final):
+        items = []
+        buffer, pos = self._buffer, 0
+        while True:
+            start = buffer.find("{", pos)
+            if start < 0:
+                pos = len(buffer)
+                break
+            try:
+                obj, pos = self._decoder.raw_decode(buffer, start)
+            except ValueError:
+                # Most likely the object isn't complete yet; wait for more text,
+                # unless the stream has ended or a new object already started
+                # on a line of its own, in which case this one is broken
+                if not final and "\n{" not in buffer[start + 1:]:
+                    pos = start
+                    break
+                self.rejected += 1
+                pos = buffer.find("\n{", start + 1) + 1 or len(buffer)
+                continue
+            items.extend(self._accept(obj))
+        self._buffer = buffer[pos:]
+        return items
+
+    def _accept(self, obj):
+        if isinstance(obj, dict) and "question" not in obj:
+            # A wrapper such as {"questions": [...]}
+            nested = [value for value in obj.values() if isinstance(value, list)]
+            if nested:
+                return [item for value in nested for entry in value for item in self._accept(entry)]
+        item = validate_item(obj)
+        if item is None:
+            self.rejected += 1
+            return []
+        key = item["question"].lower()
+        if key in self._seen:
+            return []
+        self._seen.add(key)
+        self.items.append(item)
+        return [item]
+
+
+def quiz_prompt(topic, grade, count, existing=()):
+    prompt = PROMPT.format(count=count, grade=grade, topic=topic, schema=json.dumps(QUIZ_SCHEMA))
+    if existing:
+        prompt += MORE_PROMPT.format(existing=json.dumps([item["question"] for item in existing]))
+    return prompt
+
+
+# Yield quiz questions as they are parsed from the model's stream. If some
+# items come back missing or invalid, only that many are requested again.
+def stream_quiz(model, topic, grade, count=QUIZ_SIZE, max_rounds=QUIZ_MAX_ROUNDS):
+    parser = QuizStreamParser()
+    for _ in range(max_rounds):
+        missing = count - len(parser.items)
+        if missing <= 0:
+            return
+        response = model.generate_content(quiz_prompt(topic, grade, missing, parser.items), stream=True)
+        for chunk in response:
+            for item in parser.feed(chunk.text):
+                if len(parser.items) <= count:
+                    yield item
+        for item in parser.close():
+            if len(parser.items) <= count:
+                yield item
+
+
+def generate_quiz(model, topic, grade, count=QUIZ_SIZE):
+    return list(stream_quiz(model, topic, grade, count))
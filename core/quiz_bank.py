@@ -0,0 +1,217 @@
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.llm import BULK, priority
+from core.quiz import generate_quiz
+from core.quiz_cache import get_quiz_cache
+from core.runtime import get_model
+
+QUIZ_BANK_PATH = os.getenv("QUIZ_BANK_PATH", "quiz_bank.db")
+
+_stopwords = {"a", "an", "and", "the", "of", "in", "on", "for", "to", "with", "about"}
+
+
+def normalize_topic(topic):
+    return " ".join(topic.lower().split())
+
+
+# The words that make a topic what it is. Two topics with the same tokens
+# differ only in case, word order, plurals or stopwords ("The Fractions" and
+# "fraction"), so one's questions serve the other. Topics that share most but
+# not all of their words ("World War 1" and "World War 2") are different.
+def topic_tokens(topic):
+    words = re.findall(r"[a-z0-9]+", topic.lower())
+    # Crude plural folding so "fractions" matches "fraction"
+    return frozenset(word[:-1] if len(word) > 3 and word.endswith("s") else word
+                     for word in words if word not in _stopwords)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS bank_topics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT,
+            topic_norm TEXT,
+            grade TEXT,
+            created_at REAL,
+            UNIQUE (topic_norm, grade)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS bank_questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic_id INTEGER REFERENCES bank_topics (id),
+            question TEXT,
+            options TEXT,
+            correct_answer TEXT
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bank_questions_topic ON bank_questions (topic_id)")
+    conn.commit()
+    return conn
+
+
+# Read-side of the question bank. The topic index is small and kept in
+# memory, so finding a topic (by its normalized name or its tokens within the
+# grade) and sampling its questions needs no model call and, once warm, no
+# disk access.
+class QuizBank:
+    def __init__(self, path=QUIZ_BANK_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._questions = {}
+        self.reload()
+
+    def reload(self):
+        with self._lock:
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            rows = self._conn.execute("SELECT id, topic_norm, grade FROM bank_topics").fetchall()
+            self._exact = {(topic_norm, grade): topic_id for topic_id, topic_norm, grade in rows}
+            self._by_tokens = {}
+            for topic_id, topic_norm, grade in rows:
+                tokens = topic_tokens(topic_norm)
+                if tokens:
+                    self._by_tokens.setdefault((tokens, grade), topic_id)
+            self._questions.clear()
+
+    # data_version changes whenever another connection (the batch job) commits
+    def _reload_if_changed(self):
+        with self._lock:
+            changed = self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version
+        if changed:
+            self.reload()
+
+    def find_topic(self, topic, grade):
+        topic_id = self._exact.get((normalize_topic(topic), grade))
+        if topic_id is not None:
+            return topic_id
+        return self._by_tokens.get((topic_tokens(topic), grade))
+
+    def _load_questions(self, topic_id):
+        with self._lock:
+            questions = self._questions.get(topic_id)
+            if questions is None:
+                rows = self._conn.execute(
+                    "SELECT question, options, correct_answer FROM bank_questions WHERE topic_id = ?",
+                    (topic_id,)).fetchall()
+                questions = [{"question": q, "options": json.loads(options), "correct_answer": answer}
+                             for q, options, answer in rows]
+                self._questions[topic_id] = questions
+            return questions
+
+    # Up to count random questions for the closest banked topic, or [] on a miss
+    def sample(self, topic, grade, count=10):
+        self._reload_if_changed()
+        topic_id = self.find_topic(topic, grade)
+        questions = self._load_questions(topic_id) if topic_id is not None else []
+        if not questions:
+            self.misses += 1
+            return []
+        self.hits += 1
+        picked = random.sample(questions, min(count, len(questions)))
+        return [dict(q, options=list(q["options"])) for q in picked]
+
+    def stats(self):
+        return {"topics": len(self._exact), "hits": self.hits, "misses": self.misses}
+
+
+# Bank the questions for a topic and grade, replacing any from an earlier run
+# in the same transaction, so rebuilding a curriculum never duplicates a topic
+# and readers see either the old questions or the new ones. A failed
+# generation (no questions) leaves the banked ones alone.
+def add_questions(conn, topic, grade, questions):
+    if not questions:
+        return
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO bank_topics (topic, topic_norm, grade, created_at) VALUES (?, ?, ?, ?)",
+            (topic, normalize_topic(topic), grade, time.time()))
+        topic_id = conn.execute("SELECT id FROM bank_topics WHERE topic_norm = ? AND grade = ?",
+                                (normalize_topic(topic), grade)).fetchone()[0]
+        conn.execute("DELETE FROM bank_questions WHERE topic_id = ?", (topic_id,))
+        conn.executemany(
+            "INSERT INTO bank_questions (topic_id, question, options, correct_answer) VALUES (?, ?, ?, ?)",
+            [(topic_id, q["question"], json.dumps(q["options"]), q["correct_answer"]) for q in questions])
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_quiz_bank():
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuizBank()
+        return _bank
+
+
+# Questions come from the pre-generated bank when it has the topic (under any wording with the same words);
+# otherwise quizzes are generated live and cached per topic/grade so a whole class
+# asking for the same one costs a single model call
+def get_quiz(topic, grade):
+    quiz = get_quiz_bank().sample(topic, grade)
+    if quiz:
+        return quiz
+    return get_quiz_cache().get_or_generate(topic, grade, _generate_quiz)
+
+
+# Quizzes don't depend on the conversation, so they don't go through (or grow) a session chat.
+# The model answers in validated JSON Lines; only missing or invalid questions are asked for again.
+def _generate_quiz(topic, grade):
+    return generate_quiz(get_model(), topic, grade)
+
+
+# Curriculum files are CSV with topic,grade columns or a JSON list of {"topic", "grade"}
+def load_curriculum(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return [(item["topic"], item["grade"]) for item in json.load(f)]
+        return [(row["topic"], row["grade"]) for row in csv.DictReader(f)]
+
+
+# Offline batch job: python -m core.quiz_bank curriculum.csv --per-topic 30
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate the quiz question bank for a curriculum.")
+    parser.add_argument("curriculum", help="CSV (topic,grade) or JSON list of {topic, grade}")
+    parser.add_argument("--per-topic", type=int, default=30, help="questions to bank per topic and grade")
+    parser.add_argument("--workers", type=int, default=4, help="topics generated concurrently")
+    parser.add_argument("--db", default=QUIZ_BANK_PATH)
+    parser.add_argument("--skip-existing", action="store_true", help="leave already banked topics alone")
+    args = parser.parse_args()
+
+    model = get_model()
+    conn = _connect(args.db)
+    existing = {(topic_norm, grade) for topic_norm, grade in conn.execute("SELECT topic_norm, grade FROM bank_topics")}
+    curriculum = [(topic, grade) for topic, grade in load_curriculum(args.curriculum)
+                  if not (args.skip_existing and (normalize_topic(topic), grade) in existing)]
+    write_lock = threading.Lock()
+
+    def build(entry):
+        topic, grade = entry
+        # Bulk priority: a batch run shouldn't hold up students using the app on the same key
+        with priority(BULK):
+            questions = generate_quiz(model, topic, grade, count=args.per_topic)
+        with write_lock:
+            add_questions(conn, topic, grade, questions)
+        print(f"{grade} / {topic}: {len(questions)} questions")
+
+    with ThreadPoolExecutor(args.workers) as pool:
+        list(pool.map(build, curriculum))
+
+
+if __name__ == "__main__":
+    main()
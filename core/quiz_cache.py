@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+QUIZ_CACHE_PATH = os.getenv("QUIZ_CACHE_PATH", "quiz_cache.db")
+QUIZ_CACHE_TTL_S = float(os.getenv("QUIZ_CACHE_TTL_S", str(24 * 3600)))
+QUIZ_CACHE_MAX_ENTRIES = int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", "2000"))
+
+# Bump when the quiz prompt or parser changes so old entries stop matching
+QUIZ_FORMAT_VERSION = "2"
+
+
+def normalize_topic(topic):
+    return " ".join(topic.lower().split())
+
+
+# Content address of a quiz: the normalized request plus the format version
+def quiz_key(topic, grade):
+    raw = json.dumps([QUIZ_FORMAT_VERSION, normalize_topic(topic), grade.strip().lower()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# Persistent cache of generated quizzes shared by every session.
+# Entries expire after the TTL, the least recently used ones are evicted
+# beyond the size limit, and concurrent misses for the same key are
+# coalesced so only one request per key goes to the model.
+class QuizCache:
+    def __init__(self, path=QUIZ_CACHE_PATH, ttl=QUIZ_CACHE_TTL_S, max_entries=QUIZ_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS quiz_cache (
+                key TEXT PRIMARY KEY,
+                topic TEXT,
+                grade TEXT,
+                payload TEXT,
+                created_at REAL,
+                last_access REAL
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quiz_cache_access ON quiz_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, created_at FROM quiz_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM quiz_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE quiz_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return payload
+
+    def put(self, key, topic, grade, payload):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quiz_cache (key, topic, grade, payload, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, topic, grade, payload, now, now))
+            self._conn.execute(
+                "DELETE FROM quiz_cache WHERE key IN (SELECT key FROM quiz_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+            self._conn.commit()
+
+    def get_or_generate(self, topic, grade, generate):
+        key = quiz_key(topic, grade)
+        payload = self.get(key)
+        if payload is not None:
+            self.hits += 1
+            return json.loads(payload)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return json.loads(future.result())
+
+        try:
+            quiz = generate(topic, grade)
+            payload = json.dumps(quiz)
+            # An empty quiz means the model output could not be parsed; don't keep it
+            if quiz:
+                self.put(key, topic, grade, payload)
+            future.set_result(payload)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return json.loads(payload)
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_quiz_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QuizCache()
+        return _cache
@@ -0,0 +1,267 @@
+import logging
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from email.mime.text import MIMEText
+
+REMINDER_DB_PATH = os.getenv("REMINDER_DB_PATH", "reminders.db")
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "50"))
+REMINDER_MAX_ATTEMPTS = int(os.getenv("REMINDER_MAX_ATTEMPTS", "5"))
+REMINDER_RETRY_BASE_S = float(os.getenv("REMINDER_RETRY_BASE_S", "30"))
+# A claimed reminder not marked sent or failed within this time (its process
+# died mid-send) is picked up again by any worker
+REMINDER_LEASE_S = float(os.getenv("REMINDER_LEASE_S", "300"))
+# How often a worker looks for reminders scheduled by other processes
+REMINDER_POLL_S = float(os.getenv("REMINDER_POLL_S", "5"))
+
+# Point these at a local debugging server (e.g. SMTP_PORT=1025 SMTP_SSL=0) for testing
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_SSL = os.getenv("SMTP_SSL", "1") == "1"
+SMTP_IDLE_S = float(os.getenv("SMTP_IDLE_S", "60"))
+EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
+EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+
+# Longest the worker waits before trying again after an unexpected error
+WORKER_MAX_BACKOFF_S = 60
+
+logger = logging.getLogger(__name__)
+
+
+# One SMTP connection reused for every reminder the worker sends. It is opened
+# on demand, re-opened if the server dropped it, and closed when idle.
+class SmtpConnection:
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, use_ssl=SMTP_SSL,
+                 username=EMAIL_ADDRESS, password=EMAIL_PASSWORD, idle_s=SMTP_IDLE_S):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.idle_s = idle_s
+        self.connects = 0
+        self._server = None
+        self._last_used = 0.0
+
+    def _open(self):
+        server_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = server_class(self.host, self.port, timeout=30)
+        if self.password:
+            server.login(self.username, self.password)
+        self.connects += 1
+        return server
+
+    def send(self, msg):
+        if self._server is None:
+            self._server = self._open()
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._server = self._open()
+            self._server.send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self):
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_s:
+            self.close()
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except OSError:
+                pass
+            self._server = None
+
+
+# Durable reminder queue. Jobs are rows in a local SQLite table, so pending
+# reminders survive a restart; a worker thread sleeps until the next one is
+# due and sends every due reminder in one batch over the shared SMTP
+# connection. Failed sends are retried with exponential backoff and jitter.
+# Several processes (Learning.py, VA.py) can share the table: a worker claims
+# the jobs it sends for REMINDER_LEASE_S, and the table, not process memory,
+# says what is due.
+class ReminderScheduler:
+    def __init__(self, path=REMINDER_DB_PATH, smtp=None, batch_size=REMINDER_BATCH_SIZE,
+                 max_attempts=REMINDER_MAX_ATTEMPTS, retry_base_s=REMINDER_RETRY_BASE_S,
+                 lease_s=REMINDER_LEASE_S, poll_s=REMINDER_POLL_S):
+        self.smtp = smtp or SmtpConnection()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_s = retry_base_s
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.sent = 0
+        self.failed = 0
+        self._scheduled = 0  # bumped by schedule(), so the worker can tell it missed a notify
+        self._cond = threading.Condition()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                from_addr TEXT,
+                to_addr TEXT,
+                subject TEXT,
+                body TEXT,
+                due_at REAL,
+                next_attempt_at REAL,
+                attempts INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                last_error TEXT
+            )
+        ''')
+        # Tables created before claims had a lease don't have claimed_at
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reminders)")}
+        if "claimed_at" not in columns:
+            self._conn.execute("ALTER TABLE reminders ADD COLUMN claimed_at REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_status ON reminders (status, next_attempt_at)")
+        self._conn.commit()
+        self._worker = threading.Thread(target=self._run, name="reminder-worker", daemon=True)
+        self._worker.start()
+
+    def schedule(self, to_addr, subject, body, due_at, from_addr=EMAIL_ADDRESS):
+        with self._cond:
+            cursor = self._conn.execute(
+                "INSERT INTO reminders (from_addr, to_addr, subject, body, due_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (from_addr, to_addr, subject, body, due_at, due_at))
+            self._conn.commit()
+            self._scheduled += 1
+            self._cond.notify()
+            return cursor.lastrowid
+
+    # When the next job can be claimed: the earliest pending attempt, or the
+    # earliest claim whose lease runs out. Must be called with the condition held.
+    def _next_due(self):
+        pending, claimed = self._conn.execute(
+            "SELECT (SELECT MIN(next_attempt_at) FROM reminders WHERE status = 'pending'), "
+            "(SELECT MIN(claimed_at) FROM reminders WHERE status = 'sending')").fetchone()
+        times = [t for t in (pending, claimed + self.lease_s if claimed is not None else None) if t is not None]
+        return min(times) if times else None
+
+    def _due_batch(self):
+        while True:
+            with self._cond:
+                now = time.time()
+                next_due = self._next_due()
+                if next_due is not None and next_due <= now:
+                    claimed = self._claim(now)
+                    if claimed:
+                        return claimed
+                    continue  # another process claimed them first
+                scheduled = self._scheduled
+            # Closing talks to the server, so schedule() must not wait on it
+            self.smtp.close_if_idle()
+            with self._cond:
+                if self._scheduled == scheduled:
+                    # Wake up for the next due job, or earlier to see jobs other processes scheduled
+                    self._cond.wait(min(self.poll_s, next_due - now) if next_due is not None else self.poll_s)
+
+    # Claim due jobs so another process sharing the table doesn't send them
+    # too. The claiming UPDATE re-checks that a job is still claimable, so of
+    # two processes racing for it only one gets it.
+    def _claim(self, now):
+        claimable = ("((status = 'pending' AND next_attempt_at <= ?) "
+                     "OR (status = 'sending' AND claimed_at <= ?))")
+        expired = now - self.lease_s
+        candidates = self._conn.execute(
+            f"SELECT id FROM reminders WHERE {claimable} ORDER BY next_attempt_at LIMIT ?",
+            (now, expired, self.batch_size)).fetchall()
+        claimed = []
+        for (job_id,) in candidates:
+            cursor = self._conn.execute(
+                f"UPDATE reminders SET status = 'sending', claimed_at = ? WHERE id = ? AND {claimable}",
+                (now, job_id, now, expired))
+            if cursor.rowcount:
+                claimed.append(job_id)
+        self._conn.commit()
+        if not claimed:
+            return []
+        marks = ",".join("?" * len(claimed))
+        return self._conn.execute(
+            f"SELECT id, from_addr, to_addr, subject, body, attempts FROM reminders WHERE id IN ({marks})",
+            claimed).fetchall()
+
+    # Keep the worker alive through unexpected errors (e.g. the database is
+    # locked or its disk is full): log, back off, and carry on. Jobs claimed by a
+    # batch that failed this way are sent again once their lease runs out.
+    def _run(self):
+        errors = 0
+        while True:
+            try:
+                self._send_batch(self._due_batch())
+                errors = 0
+            except Exception:
+                delay = min(self.poll_s * 2 ** errors, WORKER_MAX_BACKOFF_S)
+                errors += 1
+                logger.exception("The reminder worker failed; retrying in %.1f s", delay)
+                with self._cond:
+                    try:
+                        self._conn.rollback()  # a claim may have failed halfway
+                    except sqlite3.Error:
+                        pass
+                time.sleep(delay)
+
+    def _send_batch(self, batch):
+        for i, (job_id, from_addr, to_addr, subject, body, attempts) in enumerate(batch):
+            msg = MIMEText(body)
+            msg['Subject'] = subject
+            msg['From'] = from_addr
+            msg['To'] = to_addr
+            try:
+                self.smtp.send(msg)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                # The server rejected this message only
+                self._retry(job_id, attempts + 1, e)
+            except Exception as e:
+                # The connection itself failed; back off the rest of the batch too
+                self.smtp.close()
+                for job in batch[i:]:
+                    self._retry(job[0], job[5] + 1, e)
+                break
+            else:
+                self._finish(job_id, "sent", attempts + 1)
+
+    def _finish(self, job_id, status, attempts, error=None):
+        with self._cond:
+            self._conn.execute("UPDATE reminders SET status = ?, attempts = ?, last_error = ? WHERE id = ?",
+                               (status, attempts, error, job_id))
+            self._conn.commit()
+        if status == "sent":
+            self.sent += 1
+        else:
+            self.failed += 1
+
+    def _retry(self, job_id, attempts, error):
+        if attempts >= self.max_attempts:
+            logger.error("Reminder %s failed after %d attempts: %s", job_id, attempts, error)
+            self._finish(job_id, "failed", attempts, str(error))
+            return
+        delay = self.retry_base_s * 2 ** (attempts - 1) * random.uniform(0.5, 1.5)
+        next_attempt_at = time.time() + delay
+        with self._cond:
+            self._conn.execute(
+                "UPDATE reminders SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt_at, str(error), job_id))
+            self._conn.commit()
+
+    def stats(self):
+        with self._cond:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM reminders GROUP BY status").fetchall())
+        return {"queued": counts.get("pending", 0), "sent": self.sent, "failed": self.failed,
+                "smtp_connects": self.smtp.connects, "by_status": counts}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ReminderScheduler()
+        return _scheduler
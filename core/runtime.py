@@ -0,0 +1,40 @@
+import os
+import threading
+
+from core.llm import GatewayModel, get_gateway
+from core.sessions import get_session_manager
+
+# Base URL of a Gemini-compatible REST endpoint, e.g. the local fake server
+# (python -m core.fake_gemini); unset means Google's API
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+
+_model = None
+_model_lock = threading.Lock()
+
+
+# The Gemini model, configured once per process rather than on every rerun
+# (GEMINI_STUB=1 swaps in an offline stand-in). Every call to it goes through
+# the LLM gateway's rate limit, priorities, retries and circuit breaker.
+def get_model():
+    global _model
+    with _model_lock:
+        if _model is None:
+            if os.getenv("GEMINI_STUB"):
+                from core.stub_model import StubModel
+                model = StubModel()
+            else:
+                import google.generativeai as genai
+                if GEMINI_API_ENDPOINT:
+                    genai.configure(api_key=os.getenv("GOOGLE_API_KEY") or "local", transport="rest",
+                                    client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+                else:
+                    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                model = genai.GenerativeModel("gemini-pro")
+            _model = GatewayModel(model, get_gateway())
+        return _model
+
+
+# Per-conversation chats on the process-wide model, shared by every entry
+# point (Learning.py, VA.py, the voice CLI) running in this process
+def get_chat_sessions():
+    return get_session_manager(get_model())
@@ -0,0 +1,123 @@
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import as_completed
+
+import aiohttp
+
+from core.search_cache import get_search_cache
+
+# Base URLs can point at local mock servers for testing
+YOUTUBE_API_URL = os.getenv("YOUTUBE_API_URL", "https://www.googleapis.com/youtube/v3")
+SERPER_API_URL = os.getenv("SERPER_API_URL", "https://google.serper.dev")
+YOUTUBE_TIMEOUT_S = float(os.getenv("YOUTUBE_TIMEOUT_S", "5"))
+SERPER_TIMEOUT_S = float(os.getenv("SERPER_TIMEOUT_S", "5"))
+
+_loop = None
+_sessions = {}
+_loop_lock = threading.Lock()
+
+
+# All searches run on one background event loop that owns a keep-alive
+# connection pool, so Streamlit reruns and sessions reuse open connections
+def get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="search-loop", daemon=True).start()
+        return _loop
+
+
+@atexit.register
+def _close_sessions():
+    session = _sessions.get(_loop)
+    if session is not None and not session.closed:
+        asyncio.run_coroutine_threadsafe(session.close(), _loop).result(timeout=5)
+
+
+# One pooled client session per event loop
+async def get_session():
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+        session = _sessions[loop] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+# For callers that run searches on their own loop (the HTTP API), at shutdown
+async def close_session():
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def fetch_youtube_videos(query, api_key, max_results=5):
+    params = {
+        'q': query,
+        'part': 'snippet',
+        'type': 'video',
+        'maxResults': max_results,
+        'order': 'viewCount',
+        'key': api_key or '',
+    }
+    try:
+        session = await get_session()
+        timeout = aiohttp.ClientTimeout(total=YOUTUBE_TIMEOUT_S)
+        async with session.get(f"{YOUTUBE_API_URL}/search", params=params, timeout=timeout) as response:
+            if response.status != 200:
+                return f"An error occurred: {response.status} - {await response.text()}"
+            results = await response.json()
+            return results.get('items', [])
+    except asyncio.TimeoutError:
+        return f"An error occurred: YouTube did not answer within {YOUTUBE_TIMEOUT_S:g}s"
+    except Exception as e:
+        return f"An error occurred: {e}"
+
+
+async def fetch_serper_results(query, api_key, num_results=5):
+    headers = {'X-API-KEY': api_key or ''}
+    params = {'q': query, 'num': num_results, 'gl': 'us', 'hl': 'en'}
+    try:
+        session = await get_session()
+        timeout = aiohttp.ClientTimeout(total=SERPER_TIMEOUT_S)
+        async with session.get(f"{SERPER_API_URL}/search", headers=headers, params=params, timeout=timeout) as response:
+            if response.status != 200:
+                return f"An error occurred: {response.status} - {await response.text()}"
+            results = await response.json(content_type=None)
+            return results.get('organic', [])
+    except asyncio.TimeoutError:
+        return f"An error occurred: Serper did not answer within {SERPER_TIMEOUT_S:g}s"
+    except Exception as e:
+        return f"An error occurred: {e}"
+
+
+# Provider calls go through the search cache, so repeated queries from
+# different students cost no quota and stale entries refresh in the background
+def _providers(query, youtube_api_key, serper_api_key):
+    cache = get_search_cache()
+    return {
+        "youtube": cache.get_or_fetch("youtube", query, lambda: fetch_youtube_videos(query, youtube_api_key)),
+        "serper": cache.get_or_fetch("serper", query, lambda: fetch_serper_results(query, serper_api_key)),
+    }
+
+
+# Query every provider concurrently and yield (provider, results) in the order
+# they arrive. Results are a list, or an error string as before.
+def search_all(query, youtube_api_key, serper_api_key):
+    loop = get_loop()
+    futures = {
+        asyncio.run_coroutine_threadsafe(coro, loop): name
+        for name, coro in _providers(query, youtube_api_key, serper_api_key).items()
+    }
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+# Awaitable variant for callers that already run an event loop
+async def search_all_async(query, youtube_api_key, serper_api_key):
+    providers = _providers(query, youtube_api_key, serper_api_key)
+    results = await asyncio.gather(*providers.values())
+    return dict(zip(providers, results))
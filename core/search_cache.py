@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "search_cache.db")
+SEARCH_CACHE_MEMORY_ENTRIES = int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", "1000"))
+# Past its TTL an entry is still served for this long while it is refreshed
+SEARCH_CACHE_STALE_S = float(os.getenv("SEARCH_CACHE_STALE_S", str(7 * 24 * 3600)))
+
+# YouTube quota is the scarce one, so its results are kept longer
+PROVIDER_TTLS = {
+    "youtube": float(os.getenv("YOUTUBE_CACHE_TTL_S", str(6 * 3600))),
+    "serper": float(os.getenv("SERPER_CACHE_TTL_S", "3600")),
+}
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+# Two-tier cache for search provider results: an in-memory LRU in front of
+# an SQLite table. Fresh entries are returned directly; stale ones are
+# returned immediately while a single background refresh replaces them.
+# Error strings from the providers are never cached.
+class SearchCache:
+    def __init__(self, path=SEARCH_CACHE_PATH, memory_entries=SEARCH_CACHE_MEMORY_ENTRIES,
+                 stale_s=SEARCH_CACHE_STALE_S, ttls=None):
+        self.memory_entries = memory_entries
+        self.stale_s = stale_s
+        self.ttls = dict(PROVIDER_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # (provider, query) -> (results, fetched_at)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                provider TEXT,
+                query TEXT,
+                payload TEXT,
+                fetched_at REAL,
+                PRIMARY KEY (provider, query)
+            )
+        ''')
+        self._conn.commit()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, provider, query):
+        key = (provider, query)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM search_cache WHERE provider = ? AND query = ?", key).fetchone()
+            if row is None:
+                return None
+            entry = (json.loads(row[0]), row[1])
+            self._remember(key, entry)
+            return entry
+
+    def store(self, provider, query, results):
+        entry = (results, time.time())
+        with self._lock:
+            self._remember((provider, query), entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (provider, query, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (provider, query, json.dumps(results), entry[1]))
+            self._conn.commit()
+
+    async def _fetch_and_store(self, provider, query, fetch):
+        results = await fetch()
+        if not isinstance(results, str):
+            self.store(provider, query, results)
+        return results
+
+    # Start (or join) the one fetch in flight for this key on the current loop
+    def _fetch_once(self, provider, query, fetch):
+        key = (provider, query)
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch_and_store(provider, query, fetch))
+            self._inflight[key] = task
+
+            def forget(done):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            task.add_done_callback(forget)
+        return task
+
+    # fetch is a zero-argument coroutine function that calls the provider
+    async def get_or_fetch(self, provider, query, fetch):
+        query = normalize_query(query)
+        entry = self.lookup(provider, query)
+        if entry is not None:
+            results, fetched_at = entry
+            age = time.time() - fetched_at
+            ttl = self.ttls.get(provider, 3600)
+            if age <= ttl:
+                self.hits += 1
+                return results
+            if age <= ttl + self.stale_s:
+                self.stale_hits += 1
+                self._fetch_once(provider, query, fetch)
+                return results
+        self.misses += 1
+        return await asyncio.shield(self._fetch_once(provider, query, fetch))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+import time
+
+# Rough per-session context budget; history beyond it is folded into a summary
+CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "4000"))
+# Most recent messages (user + model) kept verbatim after compaction
+CHAT_KEEP_MESSAGES = int(os.getenv("CHAT_KEEP_MESSAGES", "6"))
+# Sessions idle for longer than this are dropped
+CHAT_SESSION_IDLE_S = float(os.getenv("CHAT_SESSION_IDLE_S", "1800"))
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = ("Summarize the following conversation in a short paragraph. "
+                  "Keep names, facts and open questions the user may refer back to.\n\n")
+
+
+def _role(message):
+    return message["role"] if isinstance(message, dict) else message.role
+
+
+def _text(message):
+    parts = message["parts"] if isinstance(message, dict) else message.parts
+    return " ".join(part if isinstance(part, str) else getattr(part, "text", "") for part in parts)
+
+
+# About four characters per token for English text; close enough for a budget
+def estimate_tokens(history):
+    return sum(len(_text(message)) for message in history) // 4
+
+
+class SessionChat:
+    def __init__(self, model):
+        self.chat = model.start_chat(history=[])
+        self.summary = ""
+        self.last_used = time.monotonic()
+
+
+# Gives every user session its own Gemini chat instead of one chat shared by
+# the whole process. Before a session sends a message its history is checked
+# against the token budget, and older turns are replaced by a rolling summary
+# so request size stays bounded however long the conversation runs.
+class SessionManager:
+    def __init__(self, model, token_budget=CHAT_TOKEN_BUDGET, keep_messages=CHAT_KEEP_MESSAGES,
+                 idle_s=CHAT_SESSION_IDLE_S):
+        self.model = model
+        self.token_budget = token_budget
+        self.keep_messages = keep_messages
+        self.idle_s = idle_s
+        self.compactions = 0
+        self.truncations = 0
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_chat(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = SessionChat(self.model)
+            session.last_used = now
+        if estimate_tokens(session.chat.history) > self.token_budget:
+            self._compact(session)
+        return session.chat
+
+    def send_message(self, session_id, content, **kwargs):
+        return self.get_chat(session_id).send_message(content, **kwargs)
+
+    # Forget a streamed reply that failed halfway and the message that asked
+    # for it; Gemini won't build the chat's history past a broken stream
+    def discard_broken_reply(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            return
+        try:
+            session.chat.history
+        except Exception:
+            session.chat.rewind()
+
+    def end(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _expire(self, now):
+        for session_id, session in list(self._sessions.items()):
+            if now - session.last_used > self.idle_s:
+                del self._sessions[session_id]
+
+    def _compact(self, session):
+        history = list(session.chat.history)
+        if session.summary:
+            # The first exchange is the seed carrying the previous summary
+            history = history[2:]
+        # Keep an even number of recent messages so the new history still starts with the user
+        keep = self.keep_messages - self.keep_messages % 2
+        split = max(len(history) - keep, 0)
+        older, recent = history[:split], history[split:]
+        if not older:
+            return
+        transcript = "\n".join(f"{_role(message)}: {_text(message)}" for message in older)
+        if session.summary:
+            transcript = f"Earlier summary: {session.summary}\n{transcript}"
+        try:
+            summary = self.model.generate_content(SUMMARY_PROMPT + transcript).text.strip()
+        except Exception:
+            # Drop the older turns unsummarized rather than retrying on every message;
+            # the previous summary, if any, is kept
+            logger.warning("Summarizing chat history failed; dropping %d older messages", len(older),
+                           exc_info=True)
+            self.truncations += 1
+        else:
+            session.summary = summary
+            self.compactions += 1
+        seed = [
+            {"role": "user", "parts": [f"Summary of our conversation so far: {session.summary}"]},
+            {"role": "model", "parts": ["Understood, I'll keep that in mind."]},
+        ] if session.summary else []
+        session.chat = self.model.start_chat(history=seed + recent)
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._sessions), "compactions": self.compactions,
+                    "truncations": self.truncations}
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+# Process-wide manager; Streamlit re-executes the app script on every rerun,
+# so it has to live in an imported module to keep chats between reruns
+def get_session_manager(model):
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SessionManager(model)
+        return _manager
@@ -0,0 +1,76 @@
+import json
+import re
+import time
+
+# Offline stand-in for google.generativeai's GenerativeModel, enabled with
+# GEMINI_STUB=1. Replies are deterministic and arrive after a fixed delay so
+# cache hit rates and latency can be measured without an API key or quota.
+
+
+class StubResponse:
+    def __init__(self, text, chunk_size=80):
+        self.text = text
+        self._chunk_size = chunk_size
+
+    # Streaming responses are iterated chunk by chunk, each with a .text
+    def __iter__(self):
+        for start in range(0, len(self.text), self._chunk_size):
+            yield StubResponse(self.text[start:start + self._chunk_size])
+
+
+def _quiz_reply(prompt):
+    count = int(re.search(r"Generate (\d+)", prompt).group(1))
+    topic = re.search(r"on the topic (.+?) with", prompt)
+    topic = topic.group(1) if topic else "the topic"
+    if "JSON Lines" in prompt:
+        # Follow-up requests list the questions already asked; continue after them
+        existing = re.search(r"Do not repeat any of these questions: (\[.*\])", prompt, re.S)
+        first = len(json.loads(existing.group(1))) + 1 if existing else 1
+        return "\n".join(json.dumps({
+            "question": f"Which statement about {topic} is true? ({i})",
+            "options": [f"Statement {letter}{i}" for letter in "ABCD"],
+            "correct_answer": f"Statement B{i}",
+        }) for i in range(first, first + count))
+    questions = []
+    for i in range(1, count + 1):
+        questions.append(
+            f"{i}. Which statement about {topic} is true? ({i})\n"
+            f"A) Statement A{i}\nB) Statement B{i}\nC) Statement C{i}\nD) Statement D{i}\n"
+            f"Correct answer: B) Statement B{i}"
+        )
+    return "\n\n".join(questions)
+
+
+def stub_reply(prompt):
+    if re.search(r"Generate \d+ quiz questions", prompt):
+        return _quiz_reply(prompt)
+    return f"This is an offline answer to: {prompt[-200:]}"
+
+
+class StubChat:
+    def __init__(self, history=None, latency=0.5):
+        self.history = list(history or [])
+        self.latency = latency
+        self.calls = 0
+
+    def send_message(self, content, stream=False, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        text = stub_reply(content)
+        self.history.append({"role": "user", "parts": [content]})
+        self.history.append({"role": "model", "parts": [text]})
+        return StubResponse(text)
+
+
+class StubModel:
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.calls = 0
+
+    def start_chat(self, history=None):
+        return StubChat(history, self.latency)
+
+    def generate_content(self, contents, stream=False, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return StubResponse(stub_reply(contents))
@@ -0,0 +1,98 @@
+import re
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from core.batching import get_batcher
+from core.models import get_pipeline
+
+SUMMARY_MODEL = "facebook/bart-large-cnn"
+
+# bart-large-cnn accepts 1024 tokens; leave headroom for special tokens
+CHUNK_TOKENS = 900
+# Chunks in flight at once, which bounds memory for very long documents
+MAX_IN_FLIGHT = 8
+
+_sentence_end = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+def _token_count(tokenizer, text):
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+# Yield chunks of at most max_tokens tokens, breaking at sentence boundaries
+# where possible and splitting overlong sentences on token boundaries
+def split_into_chunks(text, tokenizer, max_tokens=CHUNK_TOKENS):
+    current, current_tokens = [], 0
+    for sentence in _sentence_end.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        n = _token_count(tokenizer, sentence)
+        if n > max_tokens:
+            if current:
+                yield " ".join(current)
+                current, current_tokens = [], 0
+            ids = tokenizer.encode(sentence, add_special_tokens=False)
+            for start in range(0, len(ids), max_tokens):
+                yield tokenizer.decode(ids[start:start + max_tokens])
+            continue
+        if current_tokens + n > max_tokens:
+            yield " ".join(current)
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += n
+    if current:
+        yield " ".join(current)
+
+
+def _summarize_chunks(chunks, tokenizer, max_length, min_length):
+    batcher = get_batcher("summarization", SUMMARY_MODEL)
+    pending = {}
+    chunks = iter(chunks)
+    index = 0
+    exhausted = False
+    while pending or not exhausted:
+        while not exhausted and len(pending) < MAX_IN_FLIGHT:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                break
+            # Short chunks cannot produce a summary longer than themselves
+            n = _token_count(tokenizer, chunk)
+            future = batcher.submit(chunk, max_length=min(max_length, max(n, 8)),
+                                    min_length=min(min_length, n // 2), do_sample=False)
+            pending[future] = index
+            index += 1
+        if not pending:
+            break
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()[0]['summary_text']
+
+
+# Map-reduce summarization that streams progress. Yields ("partial", index, text)
+# for every chunk summary as it finishes, in completion order, and finally
+# ("final", None, text). Chunk summaries are reduced hierarchically until they
+# fit into a single model call.
+def stream_summary(text, max_length=150, min_length=30):
+    tokenizer = get_pipeline("summarization", SUMMARY_MODEL).tokenizer
+    chunks = split_into_chunks(text, tokenizer)
+    level = 0
+    while True:
+        summaries = {}
+        for index, summary in _summarize_chunks(chunks, tokenizer, max_length, min_length):
+            summaries[index] = summary
+            if level == 0:
+                yield "partial", index, summary
+        ordered = [summaries[i] for i in sorted(summaries)]
+        if len(ordered) <= 1:
+            yield "final", None, ordered[0] if ordered else ""
+            return
+        combined = " ".join(ordered)
+        chunks = list(split_into_chunks(combined, tokenizer))
+        level += 1
+
+
+def summarize(text, max_length=150, min_length=30):
+    for kind, _, summary in stream_summary(text, max_length, min_length):
+        if kind == "final":
+            return summary
@@ -0,0 +1,223 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from core.batching import get_batcher
+
+MAX_LENGTH = 400
+TM_PATH = os.getenv("TM_PATH", "translation_memory.db")
+TM_MEMORY_ENTRIES = int(os.getenv("TM_MEMORY_ENTRIES", "10000"))
+
+# Language -> (pipeline task, model)
+TRANSLATORS = {
+    "French": ("translation_en_to_fr", "t5-small"),
+    "Hindi": ("translation_en_to_hi", "Helsinki-NLP/opus-mt-en-hi"),
+    "Malayalam": ("translation_en_to_ml", "Helsinki-NLP/opus-mt-en-ml"),
+}
+
+# Sentence ends, and line breaks, with the whitespace that follows them kept as a separator
+_sentence_end = re.compile(r"((?<=[.!?])\s+|\s*\n\s*)")
+_punctuation = re.compile(r"[^\w\s]")
+
+
+# Split text into (sentence, separator) pairs; joining them back gives the original text
+def segment(text):
+    parts = _sentence_end.split(text.strip())
+    parts.append("")
+    return [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2) if parts[i]]
+
+
+# Exact key: the sentence as typed, with runs of whitespace collapsed
+def exact_key(sentence):
+    return " ".join(sentence.split())
+
+
+# Near key: also ignores case, punctuation and Unicode presentation forms, so
+# "what is your name" finds the stored "What is your name?"
+def near_key(sentence):
+    folded = unicodedata.normalize("NFKC", sentence).casefold()
+    return " ".join(_punctuation.sub(" ", folded).split())
+
+
+# Future resolving to func(result) once the given future is done
+def _map_future(future, func):
+    mapped = Future()
+
+    def done(source):
+        try:
+            mapped.set_result(func(source.result()))
+        except Exception as e:
+            mapped.set_exception(e)
+
+    future.add_done_callback(done)
+    return mapped
+
+
+# Future resolving to func([results]) once all the given futures are done
+def _gather_futures(futures, func):
+    gathered = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            gathered.set_result(func([future.result() for future in futures]))
+        except Exception as e:
+            gathered.set_exception(e)
+
+    if not futures:
+        gathered.set_result(func([]))
+    for future in futures:
+        future.add_done_callback(done)
+    return gathered
+
+
+# Sentence-level translation memory: an in-memory LRU in front of an SQLite
+# table, keyed per language by the exact and the near-normalized source
+# sentence. A sentence already being translated for another caller is shared
+# rather than sent to the model twice.
+class TranslationMemory:
+    def __init__(self, path=TM_PATH, memory_entries=TM_MEMORY_ENTRIES):
+        self.memory_entries = memory_entries
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # (language, "exact"|"near", key) -> translation
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS translation_memory (
+                language TEXT,
+                source_key TEXT,
+                near_key TEXT,
+                translation TEXT,
+                created_at REAL,
+                PRIMARY KEY (language, source_key)
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tm_near ON translation_memory (language, near_key)")
+        self._conn.commit()
+
+    def _remember(self, key, translation):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # Must be called with the lock held
+    def _lookup(self, language, exact, near):
+        for kind, key, column in (("exact", exact, "source_key"), ("near", near, "near_key")):
+            memory_key = (language, kind, key)
+            translation = self._memory.get(memory_key)
+            if translation is None:
+                row = self._conn.execute(
+                    f"SELECT translation FROM translation_memory WHERE language = ? AND {column} = ? LIMIT 1",
+                    (language, key)).fetchone()
+                if row is None:
+                    continue
+                translation = row[0]
+                self._remember(memory_key, translation)
+            else:
+                self._memory.move_to_end(memory_key)
+            return kind, translation
+        return None, None
+
+    def store(self, language, sentence, translation):
+        exact, near = exact_key(sentence), near_key(sentence)
+        with self._lock:
+            self._remember((language, "exact", exact), translation)
+            self._remember((language, "near", near), translation)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translation_memory (language, source_key, near_key, translation, created_at) VALUES (?, ?, ?, ?, ?)",
+                (language, exact, near, translation, time.time()))
+            self._conn.commit()
+
+    # Future of the translation of one sentence: from memory when it has been
+    # translated before, otherwise from compute(sentence), a Future itself
+    def get_or_submit(self, language, sentence, compute):
+        exact, near = exact_key(sentence), near_key(sentence)
+        with self._lock:
+            kind, translation = self._lookup(language, exact, near)
+            if kind is not None:
+                if kind == "exact":
+                    self.exact_hits += 1
+                else:
+                    self.near_hits += 1
+                future = Future()
+                future.set_result(translation)
+                return future
+            future = self._inflight.get((language, near))
+            if future is not None:
+                self.coalesced += 1
+                return future
+            self.misses += 1
+            future = compute(sentence)
+            self._inflight[(language, near)] = future
+
+        def finished(done):
+            with self._lock:
+                self._inflight.pop((language, near), None)
+            if done.exception() is None:
+                self.store(language, sentence, done.result())
+
+        future.add_done_callback(finished)
+        return future
+
+    def stats(self):
+        lookups = self.exact_hits + self.near_hits + self.coalesced + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+        }
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory():
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory()
+        return _memory
+
+
+# Queue text for translation and return a Future of the translated string.
+# The text is translated sentence by sentence: sentences in the translation
+# memory cost nothing, and the rest go to the model, where requests for the
+# same language from every caller share batches.
+def submit_translation(text, language):
+    if language not in TRANSLATORS:
+        raise ValueError(f"Unsupported language: {language}. Choose one of {', '.join(TRANSLATORS)}.")
+    task, model = TRANSLATORS[language]
+    batcher = get_batcher(task, model)
+
+    def compute(sentence):
+        return _map_future(batcher.submit(sentence, max_length=MAX_LENGTH),
+                           lambda output: output[0]['translation_text'])
+
+    memory = get_translation_memory()
+    segments = segment(text)
+    futures = [memory.get_or_submit(language, sentence, compute) for sentence, _ in segments]
+    return _gather_futures(futures, lambda translations: "".join(
+        translation + separator for translation, (_, separator) in zip(translations, segments)))
+
+
+def translate(text, language):
+    return submit_translation(text, language).result()
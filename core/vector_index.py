@@ -0,0 +1,329 @@
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from core.models import get_pipeline
+
+# Sentence-transformers model that embeds passages and queries; runs on CPU
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", ".vector_index")
+# Passage size, and how much of the previous passage each one repeats so an
+# answer spanning a boundary is still found whole in one of them
+CHUNK_WORDS = int(os.getenv("CHUNK_WORDS", "150"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("CHUNK_OVERLAP_WORDS", "30"))
+# Passages put into a prompt, and the least similarity (cosine, -1..1) for one to count as relevant
+RAG_TOP_K = int(os.getenv("RAG_TOP_K", "4"))
+RAG_MIN_SCORE = float(os.getenv("RAG_MIN_SCORE", "0.3"))
+
+EMBED_BATCH_SIZE = 32
+
+# Collection of the material the AI-BOT may quote: course PDFs and notes indexed from the command line
+COURSE = "course"
+
+Passage = namedtuple("Passage", "score text name doc_id")
+
+_sentence_end = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+# True when sentence-transformers is installed; without it the pages fall back to whole-text prompts
+def available():
+    return importlib.util.find_spec("sentence_transformers") is not None
+
+
+# Yield passages of about max_words words, breaking at sentence boundaries and
+# starting each passage with the last overlap words' worth of sentences of the one before
+def chunk_text(text, max_words=CHUNK_WORDS, overlap_words=CHUNK_OVERLAP_WORDS):
+    current, current_words = [], 0
+    for sentence in _sentence_end.split(text):
+        words = sentence.split()
+        if not words:
+            continue
+        # Sentences longer than a passage are cut into word windows
+        pieces = [words[i:i + max_words] for i in range(0, len(words), max_words)]
+        for piece in pieces:
+            if current and current_words + len(piece) > max_words:
+                yield " ".join(" ".join(s) for s in current)
+                kept, kept_words = [], 0
+                for s in reversed(current):
+                    if kept_words + len(s) > overlap_words:
+                        break
+                    kept.insert(0, s)
+                    kept_words += len(s)
+                current, current_words = kept, kept_words
+            current.append(piece)
+            current_words += len(piece)
+    if current:
+        yield " ".join(" ".join(s) for s in current)
+
+
+# Unit-length float32 embeddings, one row per text, so a dot product is the cosine similarity
+def embed(texts):
+    model = get_pipeline("sentence-embedding", EMBEDDING_MODEL)
+    vectors = model.encode(list(texts), batch_size=EMBED_BATCH_SIZE, normalize_embeddings=True,
+                           convert_to_numpy=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+# Indices of the k highest scores, best first
+def top_k(scores, k):
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+# Passage embeddings in one float32 file, memory-mapped for search, with the
+# passage texts and documents in SQLite. A document's passages are stored in
+# consecutive rows, so searching one document reads just its slice of the file.
+# Documents are keyed by a hash of their text and indexed once.
+#
+# Several processes may share the index (the app and `python -m core.vector_index
+# add`), so SQLite is the source of truth: a writer appends its vectors while
+# holding the database's write lock, and readers re-map the file whenever more
+# rows have been committed than their mapping covers.
+class VectorIndex:
+    def __init__(self, directory=None, model=EMBEDDING_MODEL, embed=embed):
+        # One index per embedding model: vectors of different models can't be compared
+        self.directory = directory or os.path.join(VECTOR_INDEX_DIR, model.replace("/", "--"))
+        self.embed = embed
+        self.searches = 0
+        self.search_seconds = 0.0
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._lock = threading.Lock()
+        # Autocommit; transactions are opened explicitly where they are needed
+        self._conn = sqlite3.connect(os.path.join(self.directory, "index.db"), timeout=30,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                name TEXT,
+                collection TEXT,
+                first_row INTEGER,
+                rows INTEGER,
+                created_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS passages (
+                row INTEGER PRIMARY KEY,
+                doc_id TEXT,
+                text TEXT
+            );
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        ''')
+        # The mapping and the number of rows and dimensions it covers
+        self._vectors = None
+        self.rows = 0
+        self.dim = None
+
+    # Rows committed so far and the vector size (None while the index is empty).
+    # Must be called with the lock held.
+    def _committed(self):
+        rows = self._conn.execute("SELECT COALESCE(MAX(first_row + rows), 0) FROM documents").fetchone()[0]
+        dim = self._conn.execute("SELECT value FROM settings WHERE key = 'dim'").fetchone()
+        return rows, int(dim[0]) if dim else None
+
+    # Mapping of every committed row, re-made when other writers have added rows.
+    # Must be called with the lock held.
+    def _map(self):
+        rows, dim = self._committed()
+        if rows != self.rows or self._vectors is None:
+            self._vectors = None
+            self.rows, self.dim = rows, dim
+            if rows:
+                self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, dim))
+        return self._vectors
+
+    def _exists(self, doc_id):
+        return self._conn.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone() is not None
+
+    @staticmethod
+    def document_id(text, collection):
+        return hashlib.sha256(f"{collection}\0{text}".encode("utf-8")).hexdigest()
+
+    # Index a document's text (unless it already is) and return its id
+    def add(self, text, name, collection=COURSE):
+        doc_id = self.document_id(text, collection)
+        with self._lock:
+            if self._exists(doc_id):
+                return doc_id
+        passages = list(chunk_text(text))
+        if not passages:
+            return doc_id
+        # Embedding is the slow part and happens outside any lock
+        vectors = self.embed(passages)
+
+        with self._lock:
+            # The write lock is held from reading the row count until the
+            # commit, so writers in other processes append one after another
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._exists(doc_id):
+                    self._conn.execute("ROLLBACK")
+                    return doc_id
+                self._conn.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('dim', ?)",
+                                   (str(vectors.shape[1]),))
+                first_row, dim = self._committed()
+                if dim != vectors.shape[1]:
+                    raise ValueError(f"Embeddings have {vectors.shape[1]} dimensions; the index at "
+                                     f"{self.directory} holds {dim}.")
+                # Release the mapping before the file changes (Windows won't resize a mapped file)
+                self._vectors = None
+                with open(self._vectors_path, "ab") as f:
+                    # Drop vectors a writer appended without committing (e.g. it crashed)
+                    if f.tell() > first_row * dim * 4:
+                        f.truncate(first_row * dim * 4)
+                    vectors.tofile(f)
+                self._conn.executemany("INSERT INTO passages (row, doc_id, text) VALUES (?, ?, ?)",
+                                       [(first_row + i, doc_id, passage) for i, passage in enumerate(passages)])
+                self._conn.execute(
+                    "INSERT INTO documents (doc_id, name, collection, first_row, rows, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_id, name, collection, first_row, len(passages), time.time()))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return doc_id
+
+    # The k passages most similar to the query, best first, from one collection
+    # and/or the given documents (everything when neither is given)
+    def search(self, query, k=RAG_TOP_K, collection=None, doc_ids=None, min_score=-1.0):
+        start = time.perf_counter()
+        conditions, params = [], []
+        if collection is not None:
+            conditions.append("collection = ?")
+            params.append(collection)
+        if doc_ids is not None:
+            conditions.append(f"doc_id IN ({', '.join('?' * len(doc_ids))})")
+            params.extend(doc_ids)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            ranges = self._conn.execute(f"SELECT first_row, rows FROM documents{where}", params).fetchall()
+        # Nothing to search: don't load the embedding model just to find that out
+        if not ranges:
+            return []
+        query_vector = self.embed([query])[0]
+
+        with self._lock:
+            # Rows are only ever added, so the ranges read above are covered by
+            # a mapping made now
+            vectors = self._map()
+            if conditions:
+                rows = np.concatenate([np.arange(first, first + n) for first, n in ranges])
+                scores = vectors[rows] @ query_vector
+            else:
+                rows = np.arange(len(vectors))
+                scores = vectors @ query_vector
+            best = [i for i in top_k(scores, k) if scores[i] >= min_score]
+            results = []
+            for i in best:
+                text, name, doc_id = self._conn.execute(
+                    "SELECT p.text, d.name, d.doc_id FROM passages p JOIN documents d ON d.doc_id = p.doc_id "
+                    "WHERE p.row = ?", (int(rows[i]),)).fetchone()
+                results.append(Passage(float(scores[i]), text, name, doc_id))
+            self.searches += 1
+            self.search_seconds += time.perf_counter() - start
+        return results
+
+    def stats(self):
+        with self._lock:
+            documents = self._conn.execute(
+                "SELECT collection, COUNT(*), SUM(rows) FROM documents GROUP BY collection").fetchall()
+            rows, dim = self._committed()
+            return {
+                "documents": {collection: count for collection, count, _ in documents},
+                "passages": {collection: rows for collection, _, rows in documents},
+                "vectors_mb": round(rows * (dim or 0) * 4 / (1024 * 1024), 1),
+                "searches": self.searches,
+                "avg_search_ms": round(self.search_seconds / self.searches * 1000, 1) if self.searches else 0.0,
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_vector_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VectorIndex()
+        return _index
+
+
+# Passages as numbered prompt context, each with the document it came from
+def format_passages(passages):
+    return "\n\n".join(f"[{i}] ({passage.name}) {passage.text}" for i, passage in enumerate(passages, 1))
+
+
+# Prompt for a question to the AI-BOT, with the most relevant passages of the
+# course material when there are any; returns (prompt, passages used)
+def course_prompt(question):
+    if not available():
+        return question, []
+    passages = get_vector_index().search(question, collection=COURSE, min_score=RAG_MIN_SCORE)
+    if not passages:
+        return question, []
+    prompt = ("Answer the question, using the course material below where it is relevant.\n\n"
+              f"Course material:\n{format_passages(passages)}\n\nQuestion: {question}")
+    return prompt, passages
+
+
+# Prompt asking for feedback on a student's answers (text extracted from their
+# PDF). Short answers are sent whole; in longer ones each question only brings
+# the passages of the answers that address it. Answers are ranked in memory and
+# never stored in the index.
+def feedback_prompt(questions, text, per_question=2):
+    if not available() or len(text.split()) <= CHUNK_WORDS * RAG_TOP_K:
+        return f"Check the following answers and provide feedback: {text}"
+    passages = list(chunk_text(text))
+    scores = embed([question['question'] for question in questions]) @ embed(passages).T
+    sections = []
+    for i, (question, question_scores) in enumerate(zip(questions, scores), 1):
+        excerpts = "\n".join(f"- {passages[j]}" for j in sorted(top_k(question_scores, per_question)))
+        sections.append(f"Q{i}: {question['question']}\nRelevant parts of the answers:\n{excerpts}")
+    return ("Check the student's answers to the following questions and provide feedback. "
+            "For each question, only the parts of the answers that address it are shown.\n\n"
+            + "\n\n".join(sections))
+
+
+# python -m core.vector_index add notes.pdf chapter2.txt
+# python -m core.vector_index search "what is photosynthesis"
+def main():
+    parser = argparse.ArgumentParser(description="Course material index for retrieval-augmented answers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="index PDFs or text files as course material")
+    add.add_argument("files", nargs="+")
+    find = commands.add_parser("search", help="show the passages most similar to a query")
+    find.add_argument("query")
+    find.add_argument("-k", type=int, default=RAG_TOP_K)
+    args = parser.parse_args()
+
+    index = get_vector_index()
+    if args.command == "add":
+        from core.pdf import extract_pdf_text
+        for path in args.files:
+            with open(path, "rb") as f:
+                text = extract_pdf_text(f) if path.lower().endswith(".pdf") else f.read().decode("utf-8")
+            doc_id = index.add(text, os.path.basename(path))
+            print(f"{path}: {doc_id[:12]}")
+        print(index.stats())
+        return
+    for passage in index.search(args.query, k=args.k, collection=COURSE):
+        print(f"{passage.score:.3f}  {passage.name}: {passage.text[:200]}")
+
+
+if __name__ == "__main__":
+    main()
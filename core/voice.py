@@ -0,0 +1,256 @@
+import argparse
+import itertools
+import os
+import queue
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from core.lazy import lazy_import
+
+sr = lazy_import("speech_recognition")
+
+# Set VOICE_TTS=0 to run the pipeline without speaking (e.g. on a server without audio)
+VOICE_TTS = os.getenv("VOICE_TTS", "1") != "0"
+# How long a page waits for one spoken turn to finish
+VOICE_TURN_TIMEOUT_S = float(os.getenv("VOICE_TURN_TIMEOUT_S", "60"))
+# Spoken turns recognized and answered at the same time, across all sessions
+VOICE_WORKERS = int(os.getenv("VOICE_WORKERS", "8"))
+
+# kind: "listening", "heard", "sentence", "reply" or "error"; elapsed: seconds since the turn started
+VoiceEvent = namedtuple("VoiceEvent", "turn kind text elapsed")
+
+_sentence_end = re.compile(r"(?<=[.!?])\s+")
+
+
+# Split streamed text into the sentences that are complete so far and the unfinished rest
+def split_sentences(buffer):
+    parts = _sentence_end.split(buffer)
+    return [part.strip() for part in parts[:-1] if part.strip()], parts[-1]
+
+
+# One text-to-speech engine for the whole process, owned by its own thread
+# (pyttsx3 engines must be driven from the thread that created them).
+# Sentences are spoken in the order they are queued.
+class Speaker:
+    def __init__(self):
+        self.spoken = 0
+        self.error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+
+    def say(self, text):
+        self._queue.put(text)
+
+    # Block until everything queued so far has been spoken
+    def wait(self):
+        self._queue.join()
+
+    def _run(self):
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+        except Exception as e:
+            self.error = f"Text-to-speech is unavailable: {e}"
+            engine = None
+        while True:
+            text = self._queue.get()
+            try:
+                if engine is not None:
+                    engine.say(text)
+                    engine.runAndWait()
+                    self.spoken += 1
+            except Exception as e:
+                self.error = str(e)
+            finally:
+                self._queue.task_done()
+
+
+_speaker = None
+_speaker_lock = threading.Lock()
+
+
+def get_speaker():
+    global _speaker
+    with _speaker_lock:
+        if _speaker is None:
+            _speaker = Speaker()
+        return _speaker
+
+
+# Capture -> speech recognition -> LLM -> speech. The reply is spoken
+# sentence by sentence while the LLM is still streaming the rest, so a turn
+# costs roughly capture + recognition + time to the first sentence, instead of
+# the sum of every stage.
+#
+# One pipeline serves the whole process (see get_voice_pipeline). The
+# microphone is one device, so it is read by a single capture thread; every
+# turn is then recognized and answered on its own worker from a bounded pool,
+# so one user's long reply doesn't hold up another's question. Each turn
+# carries its own respond callable and gets its own events, so sessions never
+# see each other's turns. Speech goes to the one shared Speaker.
+#
+#   respond(text)     returns an iterable of chunks with .text (a streamed model
+#                     reply); the default for turns that don't bring their own
+#   recognize(audio)  turns sr.AudioData into text; Google Web Speech by default
+#   speaker           a Speaker, or None to stay silent
+#   workers           turns recognized and answered at the same time
+class VoicePipeline:
+    def __init__(self, respond=None, recognize=None, speaker=None, workers=VOICE_WORKERS):
+        self.respond = respond
+        self.recognizer = sr.Recognizer()
+        self.recognize = recognize or self.recognizer.recognize_google
+        self.speaker = speaker
+        self._events = {}
+        self._turns = itertools.count(1)
+        self._capture_queue = queue.Queue()
+        self._microphone = None
+        self._workers = ThreadPoolExecutor(workers, thread_name_prefix="voice-turn")
+        self._capture_thread = threading.Thread(target=self._capture, name="voice-capture", daemon=True)
+        self._capture_thread.start()
+
+    # Start a turn from the microphone, or from a WAV file (path or file object).
+    # Returns the turn number to read its events with.
+    def listen(self, wav=None, respond=None):
+        turn = next(self._turns)
+        self._events[turn] = queue.Queue()
+        respond = respond or self.respond
+        if wav is None:
+            self._capture_queue.put((turn, time.perf_counter(), respond))
+        else:
+            # Recordings don't need the microphone; the whole turn runs on a worker
+            self._workers.submit(self._turn, turn, time.perf_counter(), respond, wav=wav)
+        return turn
+
+    # Events of one turn as they happen, up to its "reply" or "error"
+    def turn_events(self, turn, timeout=VOICE_TURN_TIMEOUT_S):
+        events = self._events.get(turn)
+        if events is None:
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    yield VoiceEvent(turn, "error", "No answer in time, please try again.", timeout)
+                    return
+                yield event
+                if event.kind in ("reply", "error"):
+                    return
+        finally:
+            # Whatever the workers still emit for this turn is dropped
+            self._events.pop(turn, None)
+
+    def close(self):
+        self._capture_queue.put(None)
+        self._workers.shutdown(wait=False)
+
+    def _emit(self, turn, started, kind, text=""):
+        events = self._events.get(turn)
+        if events is not None:
+            events.put(VoiceEvent(turn, kind, text, time.perf_counter() - started))
+
+    def _capture(self):
+        while True:
+            item = self._capture_queue.get()
+            if item is None:
+                return
+            turn, started, respond = item
+            try:
+                if self._microphone is None:
+                    # Calibrate for background noise once, not on every turn
+                    self._microphone = sr.Microphone()
+                    with self._microphone as source:
+                        self.recognizer.adjust_for_ambient_noise(source)
+                self._emit(turn, started, "listening")
+                with self._microphone as source:
+                    audio = self.recognizer.listen(source)
+            except Exception as e:
+                self._emit(turn, started, "error", f"Could not capture audio; {e}")
+                continue
+            self._workers.submit(self._turn, turn, started, respond, audio=audio)
+
+    # Recognize one turn's audio (read from wav first if given) and answer it
+    def _turn(self, turn, started, respond, audio=None, wav=None):
+        try:
+            if audio is None:
+                with sr.AudioFile(wav) as source:
+                    audio = self.recognizer.record(source)
+        except Exception as e:
+            self._emit(turn, started, "error", f"Could not capture audio; {e}")
+            return
+        try:
+            text = self.recognize(audio)
+        except sr.UnknownValueError:
+            self._emit(turn, started, "error", "Could not understand audio")
+            return
+        except sr.RequestError as e:
+            self._emit(turn, started, "error", f"Could not request results; {e}")
+            return
+        except Exception as e:
+            self._emit(turn, started, "error", f"Could not recognize speech; {e}")
+            return
+        self._emit(turn, started, "heard", text)
+
+        parts, buffer = [], ""
+        try:
+            for chunk in respond(text):
+                parts.append(chunk.text)
+                sentences, buffer = split_sentences(buffer + chunk.text)
+                for sentence in sentences:
+                    self._speak(turn, started, sentence)
+            if buffer.strip():
+                self._speak(turn, started, buffer.strip())
+        except Exception as e:
+            self._emit(turn, started, "error", f"Could not get an answer; {e}")
+            return
+        self._emit(turn, started, "reply", "".join(parts))
+
+    def _speak(self, turn, started, sentence):
+        self._emit(turn, started, "sentence", sentence)
+        if self.speaker is not None:
+            self.speaker.say(sentence)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+# The process's voice pipeline, shared by every session: one capture thread
+# and at most VOICE_WORKERS turn workers, however many pages are open
+def get_voice_pipeline():
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = VoicePipeline(speaker=get_speaker() if VOICE_TTS else None)
+        return _pipeline
+
+
+# Run spoken questions from WAV files through the pipeline and print when
+# each stage delivered: python -m core.voice question1.wav question2.wav
+def main():
+    from core.runtime import get_chat_sessions
+
+    parser = argparse.ArgumentParser(description="Voice pipeline with WAV files as input.")
+    parser.add_argument("wav", nargs="+", help="recorded questions (WAV, AIFF or FLAC)")
+    parser.add_argument("--no-speak", action="store_true", help="don't speak the replies")
+    args = parser.parse_args()
+
+    sessions = get_chat_sessions()
+    pipeline = VoicePipeline(lambda text: sessions.send_message("voice-cli", text, stream=True),
+                             speaker=None if args.no_speak or not VOICE_TTS else get_speaker())
+    for path in args.wav:
+        turn = pipeline.listen(wav=path)
+        for event in pipeline.turn_events(turn):
+            print(f"[{path}] {event.elapsed * 1000:7.0f} ms  {event.kind:9} {event.text}")
+    if pipeline.speaker is not None:
+        pipeline.speaker.wait()
+    pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import streamlit as st
+
+from core.lazy import lazy_import, set_section
+
+# Sidebar title -> page module. A page module is only imported the first
+# time its page is opened, and exposes render() drawing the whole page.
+PAGES = {
+    "Home": "sections.home",
+    "Educational Content Finder": "sections.content_finder",
+    "Meeting Reminder": "sections.meeting_reminder",
+    "Lecture Enhancement": "sections.lecture_enhancement",
+    "Automated Feedback System": "sections.feedback",
+    "Language Learning Companion": "sections.language",
+    "AI-BOT": "sections.ai_bot",
+    "Lets Try Quizzz": "sections.quiz",
+    "Class Results": "sections.class_results",
+    "Automated Assignment Generator": "sections.assignments",
+    "Voice Assistant": "sections.voice_assistant",
+}
+
+# Fragments rerun on their own when one of their widgets changes, so an
+# interaction inside a page doesn't re-execute the rest of the app
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def render(title):
+    module = lazy_import(PAGES[title])
+
+    def page():
+        # Imports made while the page runs, including fragment-only reruns, are attributed to it
+        set_section(title)
+        module.render()
+
+    if _fragment is not None:
+        page = _fragment(page)
+    page()
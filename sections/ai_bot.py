@@ -0,0 +1,51 @@
+import streamlit as st
+
+from core.chat_store import get_store
+from core.llm import LLMUnavailable
+from core.runtime import get_chat_sessions
+from core.vector_index import course_prompt
+from sections.common import current_conversation_id, get_gemini_response, page_state, stream_response
+
+
+def render():
+    st.header("💬 AI-BOT")
+    state = page_state("ai_bot")
+
+    # AI-BOT history is stored, and its chat kept, separately from the voice conversation of the same session
+    bot_conversation_id = f"{current_conversation_id()}-bot"
+
+    # Initialize chat history if it doesn't exist
+    if 'chat_history' not in state:
+        state['chat_history'] = get_store().load_history(bot_conversation_id)
+
+    input_text = st.text_input("Input: ", key="ai_bot_input")
+    submit = st.button("Ask the question")
+
+    if submit and input_text:
+        # Only the passages of the course material relevant to the question go into the prompt
+        prompt, passages = course_prompt(input_text)
+        try:
+            # The bot's Gemini chat is its own too, apart from the voice and assignment pages
+            response = get_gemini_response(prompt, session_id=bot_conversation_id)
+            st.subheader("The Response is")
+            answer = stream_response(st.empty(), response)
+        except LLMUnavailable as e:
+            st.error(str(e))
+        except Exception as e:
+            # The reply broke off while streaming
+            get_chat_sessions().discard_broken_reply(bot_conversation_id)
+            st.error(f"An error occurred: {e}")
+        else:
+            if passages:
+                with st.expander("Course material used"):
+                    for passage in passages:
+                        st.markdown(f"**{passage.name}** ({passage.score:.2f}): {passage.text}")
+
+            # One record per turn, written once the stream has finished
+            turn = [("You", input_text), ("AI-BOT", answer)]
+            state['chat_history'].extend(turn)
+            get_store().save_messages(turn, conversation_id=bot_conversation_id)
+
+    # Display the chat history
+    if state['chat_history']:
+        st.markdown("\n\n".join(f"**{role}:** {text}" for role, text in state['chat_history']))
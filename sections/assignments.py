@@ -0,0 +1,89 @@
+import pandas as pd
+import streamlit as st
+
+from core.llm import LLMUnavailable
+from core.quiz_bank import get_quiz
+from core.vector_index import feedback_prompt
+from sections.common import GRADES, current_conversation_id, get_gemini_response, page_state, plot_chart, process_pdf
+
+
+def render():
+    st.header("📝 Automated Assignment Generator")
+    st.write("Generate multiple questions based on a topic.")
+    state = page_state("assignments")
+    topic = st.text_input("Enter the topic:")
+    grade = st.selectbox("Select the grade level:", GRADES)
+
+    if st.button("Generate Questions"):
+        if topic and grade:
+            try:
+                quiz = get_quiz(topic, grade)
+            except LLMUnavailable as e:
+                st.error(str(e))
+            else:
+                state['quiz_data'] = {'questions': quiz, 'user_answers': ["" for _ in quiz]}
+                st.write("### Quiz Questions:")
+                for i, q in enumerate(quiz):
+                    st.write(f"Q{i+1}: {q['question']}")
+        else:
+            st.error("Please enter both topic and grade.")
+
+    if 'quiz_data' in state:
+        quiz_data = state['quiz_data']
+        st.write("### Your Answers:")
+        with st.form("answers_form"):
+            for i, q in enumerate(quiz_data['questions']):
+                st.write(f"Q{i+1}: {q['question']}")
+                quiz_data['user_answers'][i] = st.text_area(f"Your Answer for Q{i+1}", key=f"answer_{i}")
+
+            submit_answers = st.form_submit_button("Submit Answers")
+
+            if submit_answers:
+                # Option to either type answers or upload PDF
+                option = st.radio("Select answer submission method:", ["Type Answers", "Upload PDF"])
+
+                if option == "Type Answers":
+                    # Generate a report for typed answers
+                    st.write("### Typed Answer Report:")
+                    answers_df = pd.DataFrame({
+                        'Question': [q['question'] for q in quiz_data['questions']],
+                        'Student Answer': quiz_data['user_answers'],
+                        'Feedback': ["Pending"] * len(quiz_data['user_answers'])
+                    })
+
+                    # Generate a chart
+                    plot_chart(answers_df, "Student Typed Answer Report")
+
+                elif option == "Upload PDF":
+                    st.write("Upload your PDF answers:")
+                    pdf_file = st.file_uploader("Choose a PDF file", type="pdf")
+
+                    if pdf_file is not None:
+                        # Process the PDF file
+                        text = process_pdf(pdf_file)
+                        state['uploaded_pdf_text'] = text
+                        st.success("PDF uploaded and processed successfully.")
+
+                        # Get feedback from LLM
+                        query = feedback_prompt(quiz_data['questions'], text)
+                        try:
+                            # Feedback requests get a chat of their own, apart from the voice and AI-BOT chats
+                            response = get_gemini_response(query, session_id=f"{current_conversation_id()}-assignments")
+                            feedback = "".join([chunk.text for chunk in response])
+                        except LLMUnavailable as e:
+                            st.error(str(e))
+                            return
+
+                        st.write("### Feedback:")
+                        st.write(feedback)
+
+                        # Generate report
+                        st.write("### Answer Report:")
+                        answers_df = pd.DataFrame({
+                            'Question': [q['question'] for q in quiz_data['questions']],
+                            'Student Answer': [text] * len(quiz_data['questions']),
+                            'Feedback': [feedback] * len(quiz_data['questions'])
+                        })
+
+                        # Generate a chart
+                        plot_chart(answers_df, "Student PDF Answer Report")
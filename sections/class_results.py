@@ -0,0 +1,76 @@
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core import grading
+from core.charts import bar_spec
+from sections.common import show_chart
+
+
+# A CSV for grading a whole class at once: a "student" column and one column
+# per question, holding the option each student chose
+def submissions_template(questions):
+    return pd.DataFrame(columns=["student"] + [q["question"] for q in questions]).to_csv(index=False)
+
+
+def grade_upload(cohort, questions, upload):
+    table = pd.read_csv(upload, dtype=str).fillna("")
+    if "student" not in table.columns:
+        st.error("The file needs a 'student' column.")
+        return
+    missing = [q["question"] for q in questions if q["question"] not in table.columns]
+    if len(missing) == len(questions):
+        st.error("None of the file's columns is a question of this class's quiz.")
+        return
+    asked = [q for q in questions if q["question"] in table.columns]
+    responses = grading.encode_answers(asked, table[[q["question"] for q in asked]].values.tolist())
+    grading.get_gradebook().record_many(cohort["topic"], cohort["grade"], asked,
+                                        list(zip(table["student"], responses)))
+    st.success(f"Graded {len(table)} submissions.")
+
+
+def render():
+    st.header("📊 Class Results")
+    st.write("How each class did on its quizzes, and which questions worked.")
+    cohorts = grading.get_gradebook().cohorts()
+    if not cohorts:
+        st.info("No quiz has been submitted yet.")
+        return
+    cohort = st.selectbox("Class quiz:", cohorts,
+                          format_func=lambda c: f"{c['grade']}: {c['topic']} ({c['students']} students)")
+
+    # Uploaded answers are graded before the results above them are drawn, so they include them
+    results = st.container()
+    _, questions, _ = grading.get_gradebook().cohort(cohort["cohort"])
+    st.write("### Grade Submissions")
+    st.download_button("Download CSV template", submissions_template(questions),
+                       file_name="submissions.csv", mime="text/csv")
+    upload = st.file_uploader("Upload the class's answers (CSV)", type=["csv"])
+    if upload is not None and st.button("Grade"):
+        grade_upload(cohort, questions, io.BytesIO(upload.getvalue()))
+
+    students, questions, responses = grading.get_gradebook().cohort(cohort["cohort"])
+    key = grading.answer_key(questions)
+    scores = grading.scores(responses, key)
+    with results:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Students", len(students))
+        col2.metric("Average score", f"{np.nanmean(scores):.0f}%")
+        col3.metric("Questions", len(questions))
+
+        # Students per score band
+        bands = np.histogram(scores, bins=[0, 20, 40, 60, 80, 100.01])[0]
+        show_chart(bar_spec(["0-19", "20-39", "40-59", "60-79", "80-100"], bands, "Scores",
+                            xlabel="Score (%)", ylabel="Students"))
+
+        st.write("### Item Analysis")
+        st.caption("Difficulty is the share answering correctly; questions with low or negative "
+                   "discrimination don't separate strong from weak students and are worth reviewing.")
+        analysis = grading.item_analysis(responses, key, labels=[q["question"] for q in questions])
+        st.dataframe(analysis.round(2), use_container_width=True)
+
+        with st.expander("Scores by student"):
+            st.dataframe(pd.DataFrame({"Student": students, "Score (%)": np.round(scores, 1)}),
+                         use_container_width=True)
@@ -0,0 +1,78 @@
+import time
+import uuid
+
+import streamlit as st
+
+from core.charts import CHART_BACKEND, bar_spec, render_png, vega_lite
+from core.lazy import lazy_import
+from core.llm import INTERACTIVE, priority
+from core.runtime import get_chat_sessions
+
+pdf = lazy_import("core.pdf")
+
+GRADES = [
+    "Grade 1", "Grade 2", "Grade 3", "Grade 4", "Grade 5",
+    "Grade 6", "Grade 7", "Grade 8", "Grade 9", "Grade 10",
+    "Grade 11", "Grade 12"
+]
+
+
+# Session state belonging to one page. Pages keep their values in their own
+# dict, so two pages using the same name (e.g. for a quiz) don't overwrite each other.
+def page_state(page):
+    return st.session_state.setdefault(f"page:{page}", {})
+
+
+# Conversation id for this browser session, kept in the URL so a refresh restores the history
+def current_conversation_id():
+    if 'conversation_id' not in st.session_state:
+        conversation_id = st.query_params.get('conversation') or uuid.uuid4().hex
+        st.query_params['conversation'] = conversation_id
+        st.session_state['conversation_id'] = conversation_id
+    return st.session_state['conversation_id']
+
+
+# Someone is waiting on the page for this answer, so it goes ahead of bulk work.
+# Pages with a conversation of their own pass its session_id.
+def get_gemini_response(question, session_id=None):
+    with priority(INTERACTIVE):
+        response = get_chat_sessions().send_message(session_id or current_conversation_id(), question, stream=True)
+    return response
+
+
+# Render a streamed response into one placeholder, redrawing at most every
+# refresh_s seconds, and return the full text once the stream is done
+def stream_response(placeholder, response, refresh_s=0.05):
+    parts = []
+    last_render = 0.0
+    for chunk in response:
+        parts.append(chunk.text)
+        now = time.monotonic()
+        if now - last_render >= refresh_s:
+            placeholder.markdown("".join(parts) + " ▌")
+            last_render = now
+    text = "".join(parts)
+    placeholder.markdown(text)
+    return text
+
+
+def process_pdf(pdf_file):
+    try:
+        return pdf.extract_pdf_text(pdf_file)
+    except ValueError as e:
+        st.error(str(e))
+        return ""
+
+
+# Charts are described by a small spec; rendered PNGs are cached by spec, or the
+# spec is handed to the browser as Vega-Lite when CHART_BACKEND=client
+def show_chart(spec):
+    if CHART_BACKEND == "client":
+        st.vega_lite_chart(spec=vega_lite(spec), use_container_width=True)
+    else:
+        st.image(render_png(spec))
+
+
+def plot_chart(data, title):
+    show_chart(bar_spec(data['Question'], range(len(data)), title,
+                        xlabel='Questions', ylabel='Answer Scores', rotate_xticks=90))
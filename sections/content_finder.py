@@ -0,0 +1,75 @@
+import os
+
+import streamlit as st
+
+from core import search
+from sections.common import GRADES
+
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+
+
+def render_youtube_videos(videos):
+    if isinstance(videos, str):
+        st.error(videos)
+        return
+    st.write("### YouTube Videos:")
+    for video in videos:
+        title = video['snippet']['title']
+        video_id = video['id']['videoId']
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        thumbnail_url = video['snippet']['thumbnails']['high']['url']
+        description = video['snippet'].get('description', 'No description available')
+
+        st.markdown(f"""
+            <a href="{video_url}" target="_blank">
+                <img src="{thumbnail_url}" alt="{title}" style="width:120px; height:90px; object-fit:cover;"/>
+            </a>
+            Title: <strong>{title}</strong><br>
+            Description: <strong><span style="font-size:14px;">{description[:150]}...</span> <!-- Truncate description if too long --></strong><br>
+
+        """, unsafe_allow_html=True)
+        st.write("---")
+
+
+def render_serper_results(google_results):
+    if isinstance(google_results, str):
+        st.error(google_results)
+        return
+    st.write("### Resource Results:")
+    for result in google_results:
+        title = result.get('title', 'No title available')
+        link = result.get('link', 'No link available')
+        snippet = result.get('snippet', 'No description available')
+
+        st.write(f"**Title:** {title}")
+        st.write(f"**Link:** [View Resource]({link})")
+        st.write(f"**Description:** {snippet}")
+        st.write("---")
+
+
+def render():
+    st.header("📚 Educational Content Finder")
+
+    query = st.text_input("Enter your query:")
+    grade = st.selectbox("Select your grade level:", GRADES)
+
+    if st.button("Search"):
+        if query:
+            search_query = f"{query} for {grade}"
+            # Both providers are queried at once; each section fills in as soon as its results arrive
+            st.write(f"### Searching YouTube for: {search_query}")
+            youtube_area = st.container()
+            st.write(f"### Resource Results: {search_query}")
+            serper_area = st.container()
+            renderers = {
+                "youtube": (youtube_area, render_youtube_videos),
+                "serper": (serper_area, render_serper_results),
+            }
+            with st.spinner("Searching..."):
+                for provider, results in search.search_all(search_query, YOUTUBE_API_KEY, SERPER_API_KEY):
+                    area, render_results = renderers[provider]
+                    with area:
+                        render_results(results)
+        else:
+            st.error("Please enter a query.")
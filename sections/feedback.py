@@ -0,0 +1,13 @@
+import streamlit as st
+
+
+def render():
+    st.header("📝 Automated Feedback System")
+    st.write("Get feedback on your assignment.")
+    assignment = st.text_area("Enter assignment text:")
+    if st.button("Get Feedback"):
+        if assignment:
+            feedback = "Great job! Consider expanding your analysis in the third paragraph."
+            st.write("Feedback:", feedback)
+        else:
+            st.error("Please enter assignment text to get feedback.")
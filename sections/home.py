@@ -0,0 +1,5 @@
+import streamlit as st
+
+
+def render():
+    st.image("E:\\Adarsh\\AI\\AI_Learning\\Random Input Vector (5).png", use_column_width=True, caption="AI-Powered Adaptive Learning Platform")
@@ -0,0 +1,18 @@
+import streamlit as st
+
+from core.translation import TRANSLATORS, translate
+
+
+def render():
+    st.header("🌐 Language Learning Companion")
+    st.write("Translate your practice sentence.")
+    language_input = st.text_input("Practice a sentence:")
+    language = st.selectbox("Select language for translation:", list(TRANSLATORS))
+
+    if st.button("Get Translation"):
+        if language_input:
+            # Sentences seen before come from the translation memory; the rest are batched per model
+            translation = translate(language_input, language)
+            st.write(f"Translation ({language}):", translation)
+        else:
+            st.error("Please enter a sentence to translate.")
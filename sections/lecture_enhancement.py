@@ -0,0 +1,27 @@
+import streamlit as st
+
+from core.summarize import stream_summary
+from sections.common import process_pdf
+
+
+def render():
+    st.header("📝 Lecture Enhancement")
+    st.write("Summarize your lecture notes.")
+    lecture_notes = st.text_area("Enter lecture notes:")
+    lecture_pdf = st.file_uploader("Or upload lecture notes as PDF", type="pdf")
+    if st.button("Summarize"):
+        if lecture_pdf is not None:
+            lecture_notes = process_pdf(lecture_pdf)
+        if lecture_notes:
+            # Long notes are summarized chunk by chunk; show each part as soon as it is ready
+            summary_placeholder = st.empty()
+            partial_summaries = {}
+            for kind, index, summary in stream_summary(lecture_notes):
+                if kind == "partial":
+                    partial_summaries[index] = summary
+                    summary_placeholder.markdown("**Summarizing...**\n\n" + "\n\n".join(
+                        partial_summaries[i] for i in sorted(partial_summaries)))
+                else:
+                    summary_placeholder.write(f"Summary: {summary}")
+        else:
+            st.error("Please enter lecture notes to summarize.")
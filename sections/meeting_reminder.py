@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from core import reminders
+
+
+def render():
+    st.header("📅 Meeting Reminder")
+    st.write("Set a reminder for your meeting.")
+    name = st.text_input("Enter your name:")
+    email = st.text_input("Enter your email:")
+    meeting_description = st.text_area("Enter meeting description:")
+    meeting_time = st.time_input("Choose a time for your meeting:")
+    reminder_time = st.slider("Set reminder minutes before the meeting:", 5, 60, 15)
+
+    if st.button("Set Reminder"):
+        if name and email and meeting_description:
+            meeting_datetime = datetime.combine(datetime.today(), meeting_time)
+            reminder_datetime = meeting_datetime - timedelta(minutes=reminder_time)
+
+            subject = "Meeting Reminder"
+            body = (f"Hi {name},\n\nThis is a reminder for your meeting.\n\n"
+                    f"Meeting Time: {meeting_time}\n"
+                    f"Description: {meeting_description}\n\n"
+                    f"You'll receive this reminder {reminder_time} minutes before the meeting.\n\n"
+                    f"Best regards,\nYour Reminder Service")
+
+            # Queued in the durable reminder table; the background worker sends it when due
+            reminders.get_scheduler().schedule(
+                to_addr=email,
+                subject=subject,
+                body=body,
+                due_at=reminder_datetime.timestamp()
+            )
+            st.success(f"Reminder set for {name} at {meeting_time}. You'll receive an email reminder {reminder_time} minutes before.")
+        else:
+            st.error("Please enter your name, email, and meeting description.")
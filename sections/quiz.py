@@ -0,0 +1,76 @@
+import pandas as pd
+import streamlit as st
+
+from core import grading
+from core.charts import bar_spec
+from core.llm import LLMUnavailable
+from core.quiz_bank import get_quiz
+from sections.common import GRADES, current_conversation_id, page_state, show_chart
+
+
+def show_results(topic, grade, questions, user_answers):
+    # Answers are graded as an array against the answer key, and kept with
+    # the rest of the class's submissions for the teacher's item analysis
+    # (Class Results page)
+    key = grading.answer_key(questions)
+    responses = grading.encode_answers(questions, [user_answers])
+    correct = grading.grade(responses, key)[0]
+    grading.get_gradebook().record(topic, grade, questions, current_conversation_id(), responses[0])
+
+    score = correct.mean() * 100
+    st.write(f"Your score is: {score}%")
+
+    df = pd.DataFrame({
+        'Question': [f'Q{i+1}' for i in range(len(questions))],
+        'Your Answer': user_answers,
+        'Correct Answer': [q['correct_answer'] for q in questions],
+        'Correct': correct
+    })
+
+    # Display chat-like performance report
+    st.write("### Performance Report:")
+    st.markdown("".join(f"""
+        <div class="chat-bubble {'correct' if is_correct else 'incorrect'}">
+            <strong>{name}</strong><br>
+            Your Answer: {answer}<br>
+            Correct Answer: {right_answer}
+        </div>
+    """ for name, answer, right_answer, is_correct in zip(
+        df['Question'], df['Your Answer'], df['Correct Answer'], df['Correct'])), unsafe_allow_html=True)
+
+    # Plot Performance Chart
+    colors = ['#4CAF50' if is_correct else '#f44336' for is_correct in df['Correct']]
+    show_chart(bar_spec(df['Question'], df['Correct'], 'Quiz Performance',
+                        ylabel='Correct (1) / Incorrect (0)', colors=colors))
+
+
+def render():
+    st.header("Lets Try Quizzz")
+    st.write("Generate assignments based on the topic and grade.")
+    state = page_state("quiz")
+    topic = st.text_input("Enter the topic:")
+    grade = st.selectbox("Select the grade level:", GRADES)
+
+    if st.button("Generate Assignments"):
+        if topic and grade:
+            try:
+                state['questions'] = get_quiz(topic, grade)
+                state['quiz_for'] = (topic, grade)
+            except LLMUnavailable as e:
+                st.error(str(e))
+
+    # The quiz stays in page state, so submitting the form (which reruns
+    # the page without the button pressed) still finds it
+    questions = state.get('questions')
+    if questions:
+        current_quiz = grading.quiz_id(questions)
+        st.write("### Quiz Questions:")
+        with st.form("quiz_form"):
+            user_answers = []
+            for i, q in enumerate(questions):
+                st.write(f"Q{i+1}: {q['question']}")
+                user_answers.append(st.radio(f"Options for Q{i+1}", options=q['options'], key=f"quiz_{current_quiz}_{i}"))
+            submit_quiz = st.form_submit_button("Submit Quiz")
+
+        if submit_quiz:
+            show_results(*state['quiz_for'], questions, user_answers)
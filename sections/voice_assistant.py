@@ -0,0 +1,120 @@
+import io
+
+import streamlit as st
+
+from core.chat_store import get_store
+from core.llm import INTERACTIVE, priority
+from core.runtime import get_chat_sessions
+from core.voice import get_voice_pipeline
+from sections.common import current_conversation_id, page_state
+
+instruction = "In this chat, respond as if you're explaining things to a five-year-old child."
+
+
+# Save chat message to database
+def save_message(speaker, message):
+    get_store().save_message(speaker, message, conversation_id=current_conversation_id())
+
+
+# Load the latest page of this session's chat history from database
+def load_history(limit=50):
+    return get_store().load_history(current_conversation_id(), limit=limit)
+
+
+# How this session's turns are answered. The pipeline's stages run on their own
+# threads, which can't read session state, so the conversation id is fixed here.
+def make_respond():
+    conversation_id = current_conversation_id()
+
+    def respond(question):
+        with priority(INTERACTIVE):
+            return get_chat_sessions().send_message(conversation_id, instruction + question, stream=True)
+
+    return respond
+
+
+def exit_conversation(state):
+    get_chat_sessions().end(current_conversation_id())
+    state['conversation_ended'] = True
+    state['conversation'] = []
+    get_store().delete_conversation(current_conversation_id())
+
+
+# Show one spoken turn as it happens: the question once recognized, then the
+# reply sentence by sentence as it is being spoken
+def run_turn(state, area, wav=None):
+    pipeline = get_voice_pipeline()
+    turn = pipeline.listen(wav=wav, respond=make_respond())
+    with area:
+        status = st.empty()
+        reply = st.empty()
+    sentences = []
+    for event in pipeline.turn_events(turn):
+        if event.kind == "listening":
+            status.write("Listening...")
+        elif event.kind == "heard":
+            status.markdown(f"**You:** {event.text}")
+            state['conversation'].append(("You", event.text))
+            save_message("You", event.text)
+        elif event.kind == "sentence":
+            sentences.append(event.text)
+            reply.markdown(f"**Bot:** {' '.join(sentences)} ▌")
+        elif event.kind == "reply":
+            reply.markdown(f"**Bot:** {event.text}")
+            state['conversation'].append(("Bot", event.text))
+            save_message("Bot", event.text)
+        else:
+            status.error(event.text)
+
+
+def render():
+    st.title("🎤 Voice Assistant")
+    state = page_state("voice_assistant")
+
+    if 'conversation_ended' not in state:
+        state['conversation_ended'] = False
+
+    if 'conversation' not in state:
+        state['conversation'] = load_history()
+
+    # Display conversation history with styling
+    st.write("### Conversation")
+    for speaker, text in state['conversation']:
+        if speaker == "You":
+            st.markdown(f"""
+            <div style='text-align: left; background-color: #dcf8c6;color: black; padding: 8px; border-radius: 10px; margin: 5px;'>
+                <b>You:</b> {text}
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div style='text-align: left; background-color: #f1f0f0;color: black; padding: 8px; border-radius: 10px; margin: 5px;'>
+                <b>Bot:</b> {text}
+            </div>
+            """, unsafe_allow_html=True)
+    # The turn in progress is drawn here, below the history
+    live_turn = st.container()
+
+    # Button layout
+    col1, col3 = st.columns(2)
+
+    with col1:
+        if st.button("Listen"):
+            if not state['conversation_ended']:
+                run_turn(state, live_turn)
+            else:
+                st.write("Conversation has ended. Please refresh the page to start a new conversation.")
+
+    with col3:
+        if not state['conversation_ended']:
+            if st.button("Exit Conversation"):
+                exit_conversation(state)
+                st.write("Conversation terminated. Say 'Listen' to start again.")
+
+    # A recorded question can be used instead of the microphone
+    recording = st.file_uploader("Or ask with a recording (WAV)", type=["wav"])
+    if recording is not None and st.button("Ask"):
+        if not state['conversation_ended']:
+            run_turn(state, live_turn, wav=io.BytesIO(recording.getvalue()))
+        else:
+            st.write("Conversation has ended. Please refresh the page to start a new conversation.")
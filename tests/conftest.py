@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+
+from bench.fakes import FakeServices, _listen
+
+# Tests run against the same local stand-ins as the benchmark (bench.fakes),
+# so nothing here needs an API key or the network.
+
+
+@pytest.fixture(scope="session")
+def services():
+    with FakeServices(gemini_latency_s=0.01, search_latency_s=0.01) as services:
+        yield services
+
+
+# make_gemini(endpoint) gives a Gemini model talking REST to a fake Gemini
+# server, configured the way core.runtime does for GEMINI_API_ENDPOINT
+@pytest.fixture
+def make_gemini():
+    genai = pytest.importorskip("google.generativeai")
+
+    def make(endpoint):
+        genai.configure(api_key="test", transport="rest", client_options={"api_endpoint": endpoint})
+        return genai.GenerativeModel("gemini-pro")
+
+    return make
+
+
+@pytest.fixture
+def gemini(services, make_gemini):
+    return make_gemini(services.env()["GEMINI_API_ENDPOINT"])
+
+
+# serve_api() runs core.api on a free local port in a background thread and
+# yields its base URL
+@pytest.fixture
+def serve_api():
+    from core.api import create_app
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="api", daemon=True)
+    thread.start()
+    runner = web.AppRunner(create_app(), access_log=None)
+    sock = _listen()
+
+    async def start():
+        await runner.setup()
+        await web.SockSite(runner, sock).start()
+
+    asyncio.run_coroutine_threadsafe(start(), loop).result()
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
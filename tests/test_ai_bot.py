@@ -0,0 +1,68 @@
+import pytest
+
+from core.chat_store import ChatStore
+from core.sessions import SessionManager
+from core.stub_model import StubChat, StubModel, StubResponse
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+
+def page():
+    from sections import ai_bot
+    ai_bot.render()
+
+
+# Replies start streaming, then the connection drops
+class BreakingChat(StubChat):
+    def send_message(self, content, stream=False, **kwargs):
+        def chunks():
+            yield from StubResponse("Prime numbers are")
+            raise ConnectionError("connection reset")
+        return chunks()
+
+
+class BreakingModel(StubModel):
+    def start_chat(self, history=None):
+        return BreakingChat(history, self.latency)
+
+
+# open_bot(model) -> (session manager, chat store) the AI-BOT page will use
+@pytest.fixture
+def open_bot(tmp_path, monkeypatch):
+    import sections.ai_bot
+    import sections.common
+
+    def open_bot(model):
+        manager = SessionManager(model)
+        store = ChatStore(path=str(tmp_path / "chat.db"))
+        monkeypatch.setattr(sections.common, "get_chat_sessions", lambda: manager)
+        monkeypatch.setattr(sections.ai_bot, "get_chat_sessions", lambda: manager)
+        monkeypatch.setattr(sections.ai_bot, "get_store", lambda: store)
+        return manager, store
+
+    return open_bot
+
+
+def ask(question):
+    app = AppTest.from_function(page).run()
+    app.text_input(key="ai_bot_input").input(question)
+    app.button[0].click()
+    return app.run()
+
+
+def test_the_bot_keeps_its_own_gemini_chat(open_bot):
+    manager, store = open_bot(StubModel(latency=0))
+    app = ask("What is a prime number?")
+    assert not app.exception and not app.error
+    [session_id] = manager._sessions
+    assert session_id.endswith("-bot")
+    assert [role for role, _ in store.load_history(session_id)] == ["You", "AI-BOT"]
+
+
+def test_a_reply_that_breaks_off_is_reported_and_not_saved(open_bot):
+    manager, store = open_bot(BreakingModel(latency=0))
+    app = ask("What is a prime number?")
+    assert not app.exception
+    assert "connection reset" in app.error[0].value
+    [session_id] = manager._sessions
+    assert store.load_history(session_id) == []
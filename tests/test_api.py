@@ -0,0 +1,84 @@
+import io
+
+import pytest
+
+from bench.fixtures import make_pdf
+from core import api, pdf, search, search_cache
+from core.search_cache import SearchCache
+
+requests = pytest.importorskip("requests")
+
+
+@pytest.fixture(autouse=True)
+def pdf_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "PDF_CACHE_DIR", str(tmp_path / "pdf_cache"))
+
+
+def test_a_token_is_required_when_one_is_set(serve_api, monkeypatch):
+    monkeypatch.setattr(api, "API_TOKEN", "secret")
+    assert requests.get(f"{serve_api}/health").status_code == 200
+    assert requests.post(f"{serve_api}/quiz", json={}).status_code == 401
+    wrong = requests.post(f"{serve_api}/quiz", json={}, headers={"Authorization": "Bearer guess"})
+    assert wrong.status_code == 401
+    # With the token the request gets as far as input validation
+    right = requests.post(f"{serve_api}/quiz", json={}, headers={"Authorization": "Bearer secret"})
+    assert right.status_code == 400
+
+
+@pytest.mark.parametrize("path, body, error", [
+    ("/quiz", b"not json", "must be JSON"),
+    ("/quiz", b"[1, 2]", "JSON object"),
+    ("/quiz", b'{"topic": "tides"}', "'grade' is required"),
+    ("/summarize", b'{"texts": []}', "non-empty list"),
+    ("/summarize", b'{"texts": ["a", 2]}', "non-empty list"),
+    ("/translate", b'{"text": "hello"}', "'language' is required"),
+])
+def test_bad_input_is_a_400_with_the_reason(serve_api, path, body, error):
+    response = requests.post(f"{serve_api}{path}", data=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+    assert error in response.json()["error"]
+
+
+def test_batches_are_capped(serve_api, monkeypatch):
+    monkeypatch.setattr(api, "API_MAX_BATCH", 2)
+    response = requests.post(f"{serve_api}/summarize", json={"texts": ["a", "b", "c"]})
+    assert response.status_code == 400
+    assert "At most 2" in response.json()["error"]
+
+
+def test_search_reports_each_provider(serve_api, services, tmp_path, monkeypatch):
+    env = services.env()
+    monkeypatch.setattr(search, "YOUTUBE_API_URL", env["YOUTUBE_API_URL"])
+    monkeypatch.setattr(search, "SERPER_API_URL", env["SERPER_API_URL"] + "/missing")
+    monkeypatch.setattr(search_cache, "_cache", SearchCache(path=str(tmp_path / "search_cache.db")))
+    assert requests.get(f"{serve_api}/search").status_code == 400
+    found = requests.get(f"{serve_api}/search", params={"q": "tides", "grade": "Grade 5"}).json()
+    assert found["query"] == "tides for Grade 5"
+    assert len(found["youtube"]["results"]) == 5
+    assert found["serper"]["error"].startswith("An error occurred: 404")
+
+
+def test_a_pdf_can_be_sent_as_the_body_or_a_form_field(serve_api):
+    data = make_pdf(3, seed=7)
+    raw = requests.post(f"{serve_api}/pdf", data=data).json()
+    assert len(raw["pages"]) == 3 and raw["text"] == "\n".join(raw["pages"])
+    form = requests.post(f"{serve_api}/pdf", files={"file": ("notes.pdf", io.BytesIO(data), "application/pdf")})
+    assert form.json() == raw
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"data": b""}, "Request body is empty"),
+    ({"data": b"not a pdf" * 100}, "Not a readable PDF"),
+    ({"files": {"document": ("notes.pdf", b"%PDF")}}, "'file' field"),
+])
+def test_bad_pdf_uploads_are_a_400(serve_api, kwargs, error):
+    response = requests.post(f"{serve_api}/pdf", **kwargs)
+    assert response.status_code == 400
+    assert error in response.json()["error"]
+
+
+def test_a_pdf_over_the_limit_is_a_413(serve_api, monkeypatch):
+    monkeypatch.setattr(api, "PDF_MAX_BYTES", 64 * 1024)
+    response = requests.post(f"{serve_api}/pdf", data=make_pdf(60, seed=1))
+    assert response.status_code == 413
+    assert "limit" in response.json()["error"]
@@ -0,0 +1,128 @@
+import logging
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core import chat_store
+from core.chat_store import ChatStore
+
+
+def store(tmp_path, commit_ms=20):
+    return ChatStore(path=str(tmp_path / "chat.db"), pool_size=2, commit_ms=commit_ms)
+
+
+def test_saved_messages_load_in_order(tmp_path):
+    chats = store(tmp_path)
+    for i in range(5):
+        chats.save_message("You" if i % 2 == 0 else "AI-BOT", f"message {i}", conversation_id="a")
+    chats.save_message("You", "elsewhere", conversation_id="b")
+    assert chats.load_history("a", limit=3) == [("You", "message 2"), ("AI-BOT", "message 3"), ("You", "message 4")]
+    assert chats.load_history("b") == [("You", "elsewhere")]
+
+
+def test_pages_go_back_through_the_conversation(tmp_path):
+    chats = store(tmp_path)
+    chats.save_messages([("You", f"message {i}") for i in range(7)], conversation_id="a")
+    newest = chats.load_page("a", limit=4)
+    older = chats.load_page("a", limit=4, before_id=newest[-1][0])
+    assert [message for _, _, message in newest + older] == [f"message {i}" for i in reversed(range(7))]
+
+
+# Records the number of rows in every batch insert, i.e. in every group commit
+class RecordingConnection(sqlite3.Connection):
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self.batches.append(len(rows))
+        return super().executemany(sql, rows)
+
+
+class RecordingStore(ChatStore):
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+        super().__init__(*args, **kwargs)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, factory=RecordingConnection)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.batches = self.batches
+        return conn
+
+
+def test_concurrent_saves_are_group_committed(tmp_path):
+    chats = RecordingStore(path=str(tmp_path / "chat.db"), pool_size=2, commit_ms=50)
+
+    def user(u):
+        for i in range(25):
+            chats.save_message("You", f"{u}-{i}", conversation_id=f"user-{u}")
+
+    threads = [threading.Thread(target=user, args=(u,)) for u in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    chats.flush()
+    assert sum(chats.batches) == 200
+    assert len(chats.batches) < 20
+    assert all(len(chats.load_history(f"user-{u}", limit=100)) == 25 for u in range(8))
+
+
+def test_save_with_wait_is_on_disk(tmp_path):
+    chats = store(tmp_path, commit_ms=1000)
+    chats.save_message("You", "hello", conversation_id="a", wait=True)
+    with sqlite3.connect(chats.path) as conn:
+        assert conn.execute("SELECT message FROM chat WHERE conversation_id = 'a'").fetchall() == [("hello",)]
+
+
+def test_delete_conversation(tmp_path):
+    chats = store(tmp_path)
+    chats.save_message("You", "hello", conversation_id="a")
+    chats.save_message("You", "hello", conversation_id="b")
+    chats.delete_conversation("a")
+    assert chats.load_history("a") == []
+    assert chats.load_history("b") == [("You", "hello")]
+
+
+def test_reading_a_conversation_does_not_wait_for_others(tmp_path):
+    chats = store(tmp_path, commit_ms=1000)
+    chats.save_message("You", "hello", conversation_id="a")
+    started = time.monotonic()
+    assert chats.load_history("b") == []
+    assert time.monotonic() - started < 0.5
+    assert chats.load_history("a") == [("You", "hello")]
+
+
+# Fails the next `failures` group commits
+class FailingConnection(sqlite3.Connection):
+    def executemany(self, sql, rows):
+        if self.failures:
+            self.failures.pop()
+            raise sqlite3.OperationalError("disk I/O error")
+        return super().executemany(sql, rows)
+
+
+class FailingStore(ChatStore):
+    def __init__(self, *args, **kwargs):
+        self.failures = []
+        super().__init__(*args, **kwargs)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, factory=FailingConnection)
+        conn.failures = self.failures
+        return conn
+
+
+def test_a_failed_commit_reaches_the_callers(tmp_path, caplog):
+    chats = FailingStore(path=str(tmp_path / "chat.db"), pool_size=1, commit_ms=50)
+    chats.failures.append(True)
+    with caplog.at_level(logging.ERROR, logger=chat_store.__name__):
+        batch = chats.save_messages([("You", "lost"), ("AI-BOT", "lost too")], conversation_id="a")
+        with pytest.raises(sqlite3.OperationalError):
+            chats.save_message("You", "also lost", conversation_id="b", wait=True)
+    assert isinstance(batch.exception(), sqlite3.OperationalError)
+    assert "Saving 3 chat messages failed" in caplog.text
+
+    # The writer carries on with the next commit
+    chats.save_message("You", "kept", conversation_id="a", wait=True)
+    assert chats.load_history("a") == [("You", "kept")]
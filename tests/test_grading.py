@@ -0,0 +1,115 @@
+import random
+
+import numpy as np
+import pytest
+
+from core import grading
+from core.grading import NOT_ASKED, UNANSWERED, Gradebook, item_analysis
+
+
+def question(i):
+    return {"question": f"Question {i}?", "options": [f"{i}a", f"{i}b", f"{i}c", f"{i}d"], "correct_answer": f"{i}a"}
+
+
+def test_item_analysis_of_a_full_matrix():
+    key = np.array([0, 1, 2])
+    responses = np.array([
+        [0, 1, 2],
+        [0, 1, 0],
+        [0, 0, 0],
+        [1, 0, UNANSWERED],
+    ])
+    analysis = item_analysis(responses, key)
+    assert list(analysis["Students"]) == [4, 4, 4]
+    assert list(analysis["Difficulty"]) == [0.75, 0.5, 0.25]
+    assert list(analysis["Unanswered"]) == [0, 0, 0.25]
+    # Q1 and Q2 are answered correctly by the students who do best on the rest
+    assert (analysis["Discrimination"][:2] > 0).all()
+    assert list(analysis["Upper-Lower"]) == [1.0, 1.0, 1.0]
+
+
+def test_item_analysis_matches_the_textbook_formula():
+    rng = np.random.default_rng(0)
+    ability = rng.normal(size=200)
+    key = np.zeros(10, dtype=np.int8)
+    responses = np.where(rng.normal(size=(200, 10)) < ability[:, None], 0, 1).astype(np.int8)
+    analysis = item_analysis(responses, key)
+    correct = (responses == 0).astype(float)
+    for i in range(10):
+        rest = correct.sum(axis=1) - correct[:, i]
+        assert analysis["Discrimination"][i] == pytest.approx(np.corrcoef(correct[:, i], rest)[0, 1])
+
+
+def test_item_analysis_only_counts_students_asked_each_question():
+    key = np.array([0, 0, 0])
+    responses = np.array([
+        [0, 0, NOT_ASKED],
+        [0, NOT_ASKED, 1],
+        [NOT_ASKED, 1, 1],
+    ])
+    analysis = item_analysis(responses, key)
+    assert list(analysis["Students"]) == [2, 2, 2]
+    assert list(analysis["Difficulty"]) == [1.0, 0.5, 0.0]
+    assert list(grading.scores(responses, key)) == [100.0, 50.0, 0.0]
+
+
+def test_sampled_quizzes_of_a_topic_pool_into_one_cohort(tmp_path):
+    gradebook = Gradebook(path=str(tmp_path / "grading.db"))
+    bank = [question(i) for i in range(10)]
+    rng = random.Random(0)
+    for s in range(30):
+        # What QuizBank.sample hands out: a different subset, in a different order
+        quiz = rng.sample(bank, 5)
+        answers = [q["correct_answer"] if s % 3 else q["options"][1] for q in quiz]
+        topic = "Fractions" if s % 2 else "the fraction"
+        gradebook.record(topic, "Grade 4", quiz, f"student {s}", grading.encode_answers(quiz, [answers])[0])
+
+    assert [(c["students"], c["questions"]) for c in gradebook.cohorts()] == [(30, 10)]
+    students, questions, responses = gradebook.cohort(gradebook.cohorts()[0]["cohort"])
+    assert len(students) == 30
+    assert sorted(q["question"] for q in questions) == sorted(q["question"] for q in bank)
+    assert ((responses != NOT_ASKED).sum(axis=1) == 5).all()
+    analysis = item_analysis(responses, grading.answer_key(questions))
+    assert analysis["Students"].sum() == 150
+    # Two students in three answer correctly
+    assert (analysis["Difficulty"] * analysis["Students"]).sum() == pytest.approx(100)
+
+
+def test_resubmitting_replaces_a_students_answers(tmp_path):
+    gradebook = Gradebook(path=str(tmp_path / "grading.db"))
+    quiz = [question(0)]
+    gradebook.record("ratios", "Grade 6", quiz, "ada", [1])
+    cohort = gradebook.record("ratios", "Grade 6", quiz, "ada", [0])
+    students, _, responses = gradebook.cohort(cohort)
+    assert students == ["ada"]
+    assert responses.tolist() == [[0]]
+
+
+def test_cohorts_are_per_grade(tmp_path):
+    gradebook = Gradebook(path=str(tmp_path / "grading.db"))
+    gradebook.record("ratios", "Grade 6", [question(0)], "ada", [0])
+    gradebook.record("ratios", "Grade 7", [question(0)], "ada", [0])
+    assert [c["grade"] for c in gradebook.cohorts()] == ["Grade 6", "Grade 7"]
+
+
+def test_grading_a_class_over_the_api(tmp_path, monkeypatch, serve_api):
+    requests = pytest.importorskip("requests")
+    monkeypatch.setattr(grading, "_gradebook", Gradebook(path=str(tmp_path / "grading.db")))
+    quiz = [question(0), question(1)]
+    body = {"topic": "Fractions", "grade": "Grade 4", "questions": quiz, "submissions": [
+        {"student": "ada", "answers": ["0a", "1a"]},
+        {"student": "bob", "answers": ["0a", "1c"]},
+        {"student": "cy", "answers": ["0b", ""]},
+    ]}
+    submitted = requests.post(f"{serve_api}/grading/submissions", json=body).json()
+    assert [s["score"] for s in submitted["scores"]] == [100.0, 50.0, 0.0]
+
+    cohorts = requests.get(f"{serve_api}/grading/cohorts").json()["cohorts"]
+    assert [c["cohort"] for c in cohorts] == [submitted["cohort"]]
+    analysis = requests.get(f"{serve_api}/grading/analysis", params={"cohort": submitted["cohort"]}).json()
+    assert [q["difficulty"] for q in analysis["questions"]] == [0.6667, 0.3333]
+    assert [q["unanswered"] for q in analysis["questions"]] == [0.0, 0.3333]
+
+    assert requests.get(f"{serve_api}/grading/analysis", params={"cohort": "Grade 9: nothing"}).status_code == 404
+    body["questions"] = [{"question": "?", "options": ["a", "a"], "correct_answer": "a"}]
+    assert requests.post(f"{serve_api}/grading/submissions", json=body).status_code == 400
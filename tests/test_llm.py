@@ -0,0 +1,158 @@
+import threading
+import time
+
+import pytest
+
+from bench.fakes import FakeServices
+from core.llm import (BULK, INTERACTIVE, Admission, CircuitBreaker, GatewayModel, LLMGateway, LLMUnavailable,
+                      deadline, priority)
+
+
+class ServiceError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+# A model call that fails with each of the given errors in turn, then answers
+class Flaky:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.options = []
+
+    def __call__(self, prompt, stream=False, request_options=None):
+        self.options.append(request_options)
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"answer to {prompt}"
+
+
+def gateway(**kwargs):
+    return LLMGateway(retry_base_s=0.001, retry_max_s=0.01, **kwargs)
+
+
+def test_transient_errors_are_retried():
+    llm = gateway()
+    call = Flaky(ServiceError(503), ConnectionResetError("reset"), TimeoutError())
+    assert llm.call(call, "hi") == "answer to hi"
+    assert llm.retries == 3
+    assert llm.breaker.state == "closed"
+
+
+def test_request_options_survive_retries():
+    call = Flaky(ServiceError(500))
+    gateway().call(call, "hi", request_options={"retry": None})
+    assert [sorted(options) for options in call.options] == [["retry", "timeout"]] * 2
+    assert all(0 < options["timeout"] for options in call.options)
+
+
+@pytest.mark.parametrize("error", [ServiceError(400), ValueError("bad prompt")])
+def test_other_errors_are_not_retried(error):
+    llm = gateway()
+    with pytest.raises(type(error)):
+        llm.call(Flaky(error), "hi")
+    assert llm.retries == 0
+    assert llm.breaker.failures == 0
+
+
+def test_giving_up_raises_llm_unavailable():
+    llm = gateway(max_retries=2)
+    with pytest.raises(LLMUnavailable):
+        llm.call(Flaky(*[ServiceError(503)] * 3), "hi")
+    assert (llm.retries, llm.failures) == (2, 1)
+
+
+def test_breaker_opens_after_failures_and_closes_after_a_good_trial():
+    llm = gateway(max_retries=0, breaker=CircuitBreaker(failures=2, reset_s=0.05))
+    for _ in range(2):
+        with pytest.raises(LLMUnavailable):
+            llm.call(Flaky(ServiceError(503)), "hi")
+    assert llm.breaker.state == "open"
+    call = Flaky()
+    with pytest.raises(LLMUnavailable):
+        llm.call(call, "hi")
+    assert call.options == []  # rejected without calling the service
+
+    time.sleep(0.06)
+    assert llm.breaker.state == "half-open"
+    assert llm.call(call, "hi") == "answer to hi"
+    assert llm.breaker.state == "closed"
+
+
+def test_a_failed_trial_keeps_the_breaker_open():
+    llm = gateway(max_retries=0, breaker=CircuitBreaker(failures=1, reset_s=0.05))
+    with pytest.raises(LLMUnavailable):
+        llm.call(Flaky(ServiceError(503)), "hi")
+    time.sleep(0.06)
+    with pytest.raises(LLMUnavailable):
+        llm.call(Flaky(ServiceError(503)), "hi")
+    assert llm.breaker.state == "open"
+
+
+def test_streamed_reply_from_fake_gemini(gemini):
+    llm = gateway()
+    response = GatewayModel(gemini, llm).generate_content("Explain fractions", stream=True)
+    assert llm.admission.in_flight == 1
+    text = "".join(chunk.text for chunk in response)
+    assert "Explain fractions" in text
+    assert llm.admission.in_flight == 0
+    assert llm.stats()["calls"] == 1
+
+
+def test_rate_limits_are_retried_without_opening_the_breaker(make_gemini):
+    with FakeServices(gemini_latency_s=0.0, gemini_error_rate=1.0) as services:
+        model = make_gemini(services.env()["GEMINI_API_ENDPOINT"])
+        llm = gateway(max_retries=3, breaker=CircuitBreaker(failures=2))
+        with pytest.raises(LLMUnavailable):
+            GatewayModel(model, llm).generate_content("hi")
+        assert services.gemini_app["stats"]["rate_limited"] == 4
+        assert llm.breaker.state == "closed"
+
+
+def test_a_trial_that_never_got_a_slot_does_not_wedge_the_breaker():
+    llm = gateway(max_retries=0, breaker=CircuitBreaker(failures=1, reset_s=0.05),
+                  admission=Admission(max_concurrency=1, interactive_reserve=0))
+    with pytest.raises(LLMUnavailable):
+        llm.call(Flaky(ServiceError(503)), "hi")
+    time.sleep(0.06)
+    # The trial waits for the only slot, held by a streamed reply, until its deadline
+    llm.admission.acquire(INTERACTIVE, time.monotonic() + 1)
+    with deadline(0.05), pytest.raises(LLMUnavailable):
+        llm.call(Flaky(), "hi")
+    llm.admission.release()
+    assert llm.breaker.state == "half-open"
+    assert llm.call(Flaky(), "hi") == "answer to hi"
+    assert llm.breaker.state == "closed"
+
+
+def test_interactive_calls_go_ahead_of_queued_bulk_calls():
+    admission = Admission(rate=1000, burst=1000, max_concurrency=2, interactive_reserve=1)
+    llm = gateway(admission=admission)
+    order = []
+    release = threading.Event()
+
+    def hold():
+        release.wait(5)
+        return "held"
+
+    def call(level, name, func=None):
+        with priority(level):
+            llm.call(func or (lambda **kwargs: order.append(name)))
+
+    # The interactive reserve leaves bulk traffic a single slot; a bulk call holds it
+    holder = threading.Thread(target=call, args=(BULK, "holder", lambda **kwargs: hold()))
+    holder.start()
+    while admission.in_flight < 1:
+        time.sleep(0.001)
+    waiting = [threading.Thread(target=call, args=(BULK, f"bulk {i}")) for i in range(3)]
+    for thread in waiting:
+        thread.start()
+    while admission.waiting() < 3:
+        time.sleep(0.001)
+    # The reserved slot serves an interactive call at once, ahead of every queued bulk call
+    call(INTERACTIVE, "interactive")
+    assert order == ["interactive"]
+    release.set()
+    for thread in [holder, *waiting]:
+        thread.join()
+    assert order[1:] == ["bulk 0", "bulk 1", "bulk 2"]
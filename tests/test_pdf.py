@@ -0,0 +1,44 @@
+import io
+import os
+
+import pytest
+
+from bench.fixtures import make_pdf
+from core import pdf
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "PDF_CACHE_DIR", str(tmp_path / "pdf_cache"))
+    return tmp_path / "pdf_cache"
+
+
+def test_pages_come_back_in_order_and_are_cached(cache_dir):
+    data = make_pdf(3, seed=1)
+    pages = list(pdf.iter_pdf_pages(io.BytesIO(data)))
+    assert len(pages) == 3 and all(pages)
+    assert len(os.listdir(cache_dir)) == 1
+    assert list(pdf.iter_pdf_pages(io.BytesIO(data))) == pages
+
+
+def test_a_file_that_is_not_a_pdf_is_a_value_error():
+    with pytest.raises(ValueError, match="Not a readable PDF"):
+        pdf.extract_pdf_text(io.BytesIO(b"this is not a PDF at all" * 100))
+
+
+def test_the_cache_drops_the_least_recently_used_files(cache_dir, monkeypatch):
+    first, second, third = (make_pdf(2, seed=seed) for seed in range(3))
+    pdf.extract_pdf_text(io.BytesIO(first))
+    [first_file] = os.listdir(cache_dir)
+    monkeypatch.setattr(pdf, "PDF_CACHE_MAX_BYTES", int(os.path.getsize(cache_dir / first_file) * 2.5))
+    os.utime(cache_dir / first_file, (1, 1))
+    pdf.extract_pdf_text(io.BytesIO(second))
+    [second_file] = set(os.listdir(cache_dir)) - {first_file}
+    os.utime(cache_dir / second_file, (2, 2))
+
+    # Reading the first file again makes it the most recently used
+    pdf.extract_pdf_text(io.BytesIO(first))
+    pdf.extract_pdf_text(io.BytesIO(third))
+    files = set(os.listdir(cache_dir))
+    assert len(files) == 2
+    assert first_file in files and second_file not in files
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from core.llm import GatewayModel, LLMGateway
+from core.quiz import QuizStreamParser, generate_quiz, validate_item
+from core.stub_model import StubModel
+
+
+def question(i):
+    return {"question": f"Question {i}?", "options": ["red", "green", "blue", "yellow"], "correct_answer": "B"}
+
+
+# Feed text to a fresh parser in chunks of the given size, like a model stream
+def parse(text, chunk_size=7):
+    parser = QuizStreamParser()
+    items = []
+    for start in range(0, len(text), chunk_size):
+        items += parser.feed(text[start:start + chunk_size])
+    items += parser.close()
+    return parser, items
+
+
+@pytest.mark.parametrize("text", [
+    "\n".join(json.dumps(question(i)) for i in range(3)),
+    json.dumps([question(i) for i in range(3)], indent=2),
+    "```json\n" + "\n".join(json.dumps(question(i), indent=4) for i in range(3)) + "\n```",
+    "Here is your quiz:\n" + json.dumps({"questions": [question(i) for i in range(3)]}),
+], ids=["json-lines", "array", "code-fence", "wrapper"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+def test_parser_accepts_common_output_shapes(text, chunk_size):
+    parser, items = parse(text, chunk_size)
+    assert [item["question"] for item in items] == ["Question 0?", "Question 1?", "Question 2?"]
+    assert all(item["correct_answer"] == "green" for item in items)
+    assert parser.rejected == 0
+
+
+def test_parser_returns_questions_as_soon_as_they_are_complete():
+    parser = QuizStreamParser()
+    first = json.dumps(question(0))
+    assert parser.feed(first[:-1]) == []
+    assert [item["question"] for item in parser.feed(first[-1:] + "\n" + json.dumps(question(1))[:5])] == ["Question 0?"]
+
+
+def test_parser_skips_invalid_broken_and_repeated_questions():
+    text = "\n".join([
+        json.dumps(question(0)),
+        '{"question": "broken',
+        json.dumps(dict(question(1), options=["only", "three", "options"])),
+        json.dumps(dict(question(0), question="QUESTION 0?")),
+        json.dumps(question(2)),
+    ])
+    parser, items = parse(text)
+    assert [item["question"] for item in items] == ["Question 0?", "Question 2?"]
+    assert parser.rejected == 2
+
+
+def test_parser_counts_an_unfinished_last_question_as_rejected():
+    parser, items = parse(json.dumps(question(0))[:-2])
+    assert items == []
+    assert parser.rejected == 1
+
+
+@pytest.mark.parametrize("answer, expected", [("blue", "blue"), ("C", "blue"), ("(c)", "blue"), ("purple", None)])
+def test_validate_item_answer(answer, expected):
+    item = validate_item(dict(question(0), correct_answer=answer))
+    assert (item and item["correct_answer"]) == expected
+
+
+def test_generate_quiz_fills_the_quiz():
+    quiz = generate_quiz(StubModel(latency=0), "fractions", "Grade 4", count=5)
+    assert len(quiz) == 5
+    assert len({item["question"] for item in quiz}) == 5
+
+
+def test_generate_quiz_through_the_gateway_and_fake_gemini(gemini):
+    quiz = generate_quiz(GatewayModel(gemini, LLMGateway()), "volcanoes", "Grade 6", count=4)
+    assert len(quiz) == 4
+    assert all("volcanoes" in item["question"] for item in quiz)
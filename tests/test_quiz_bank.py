@@ -0,0 +1,48 @@
+import pytest
+
+from core.quiz_bank import QuizBank, _connect, add_questions
+
+
+def questions(topic, count=3):
+    return [{"question": f"{topic} question {i}?", "options": ["a", "b", "c", "d"], "correct_answer": "a"}
+            for i in range(count)]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = str(tmp_path / "quiz_bank.db")
+    conn = _connect(path)
+    for topic in ("Newton's first law", "World War 1", "The Fractions", "photosynthesis in plants"):
+        add_questions(conn, topic, "Grade 8", questions(topic))
+    return QuizBank(path=path), conn
+
+
+@pytest.mark.parametrize("topic, banked", [
+    ("Newton's first law", "Newton's first law"),
+    ("  newton's FIRST law ", "Newton's first law"),
+    ("fraction", "The Fractions"),
+    ("plants photosynthesis", "photosynthesis in plants"),
+])
+def test_same_topic_in_other_words_comes_from_the_bank(bank, topic, banked):
+    quiz_bank, _ = bank
+    sampled = quiz_bank.sample(topic, "Grade 8")
+    assert sorted(q["question"] for q in sampled) == sorted(q["question"] for q in questions(banked))
+
+
+@pytest.mark.parametrize("topic", ["Newton's second law", "World War 2", "photosynthesis", "fractions and decimals"])
+def test_near_miss_topics_are_not_served_from_the_bank(bank, topic):
+    quiz_bank, _ = bank
+    assert quiz_bank.sample(topic, "Grade 8") == []
+    assert quiz_bank.stats()["misses"] == 1
+
+
+def test_topics_are_banked_per_grade(bank):
+    quiz_bank, _ = bank
+    assert quiz_bank.sample("World War 1", "Grade 5") == []
+
+
+def test_rebanking_a_topic_replaces_its_questions(bank):
+    quiz_bank, conn = bank
+    add_questions(conn, "world war 1", "Grade 8", questions("new", count=2))
+    add_questions(conn, "world war 1", "Grade 8", [])
+    assert sorted(q["question"] for q in quiz_bank.sample("World War 1", "Grade 8")) == ["new question 0?", "new question 1?"]
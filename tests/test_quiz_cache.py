@@ -0,0 +1,54 @@
+import threading
+import time
+
+from core.quiz_cache import QuizCache
+
+
+def question(i):
+    return {"question": f"Question {i}?", "options": ["red", "green", "blue", "yellow"], "correct_answer": "B"}
+
+
+def test_quiz_cache_keeps_quizzes_per_topic_and_grade(tmp_path):
+    cache = QuizCache(path=str(tmp_path / "quiz_cache.db"))
+    calls = []
+
+    def generate(topic, grade):
+        calls.append((topic, grade))
+        return [question(len(calls))]
+
+    first = cache.get_or_generate("The Water Cycle", "Grade 3", generate)
+    assert cache.get_or_generate("  the water   cycle ", "Grade 3", generate) == first
+    cache.get_or_generate("The Water Cycle", "Grade 4", generate)
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_quiz_cache_does_not_keep_empty_quizzes(tmp_path):
+    cache = QuizCache(path=str(tmp_path / "quiz_cache.db"))
+    assert cache.get_or_generate("magnetism", "Grade 5", lambda topic, grade: []) == []
+    assert cache.get_or_generate("magnetism", "Grade 5", lambda topic, grade: [question(0)]) == [question(0)]
+
+
+def test_quiz_cache_coalesces_concurrent_misses(tmp_path):
+    cache = QuizCache(path=str(tmp_path / "quiz_cache.db"))
+    release = threading.Event()
+    calls = []
+
+    def generate(topic, grade):
+        calls.append(topic)
+        release.wait(5)
+        return [question(0)]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_generate("ratios", "Grade 6", generate)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.misses + cache.coalesced < 8:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == ["ratios"]
+    assert results == [[question(0)]] * 8
+    assert cache.stats()["coalesced"] == 7
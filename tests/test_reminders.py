@@ -0,0 +1,106 @@
+import logging
+import sqlite3
+import time
+
+import pytest
+
+from bench.fakes import serve_smtp
+from core import reminders as reminders_module
+from core.reminders import ReminderScheduler, SmtpConnection
+
+
+@pytest.fixture
+def smtp():
+    with serve_smtp() as served:
+        yield served
+
+
+def scheduler(tmp_path, port, **kwargs):
+    return ReminderScheduler(path=str(tmp_path / "reminders.db"), poll_s=0.05, retry_base_s=0.05,
+                             smtp=SmtpConnection(host="127.0.0.1", port=port, use_ssl=False), **kwargs)
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_due_reminders_are_sent_over_one_connection(tmp_path, smtp):
+    server, port = smtp
+    reminders = scheduler(tmp_path, port)
+    for i in range(20):
+        reminders.schedule("student@example.com", f"Reminder {i}", "Your meeting starts soon.", time.time())
+    assert wait_for(lambda: reminders.sent == 20)
+    assert set(server.delivered) == {f"Reminder {i}" for i in range(20)}
+    assert server.connections == 1
+    assert reminders.stats()["by_status"] == {"sent": 20}
+
+
+def test_future_reminders_wait_until_due(tmp_path, smtp):
+    server, port = smtp
+    reminders = scheduler(tmp_path, port)
+    scheduled = time.perf_counter()
+    reminders.schedule("student@example.com", "Later", "Your meeting starts soon.", time.time() + 0.3)
+    assert wait_for(lambda: "Later" in server.delivered)
+    assert server.delivered["Later"] - scheduled >= 0.3
+
+
+def test_schedulers_sharing_a_table_send_each_reminder_once(tmp_path, smtp):
+    server, port = smtp
+    first, second = scheduler(tmp_path, port), scheduler(tmp_path, port)
+    for i in range(40):
+        (first if i % 2 else second).schedule("student@example.com", f"Reminder {i}", "Soon.", time.time())
+    assert wait_for(lambda: first.sent + second.sent == 40)
+    time.sleep(0.2)
+    assert server.messages == 40
+    assert first.sent + second.sent == 40
+
+
+def test_unreachable_server_is_retried_then_given_up(tmp_path):
+    with serve_smtp() as (_, port):
+        pass  # nothing listens on the port any more
+    reminders = scheduler(tmp_path, port, max_attempts=2)
+    reminders.schedule("student@example.com", "Lost", "Soon.", time.time())
+    assert wait_for(lambda: reminders.failed == 1)
+    assert reminders.stats()["by_status"] == {"failed": 1}
+
+
+# Fails the first claims with a database error
+class FlakyScheduler(ReminderScheduler):
+    failures = 2
+
+    def _claim(self, now):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super()._claim(now)
+
+
+def test_the_worker_survives_unexpected_errors(tmp_path, smtp, caplog):
+    server, port = smtp
+    with caplog.at_level(logging.ERROR, logger=reminders_module.__name__):
+        reminders = FlakyScheduler(path=str(tmp_path / "reminders.db"), poll_s=0.05,
+                                   smtp=SmtpConnection(host="127.0.0.1", port=port, use_ssl=False))
+        reminders.schedule("student@example.com", "Still sent", "Soon.", time.time())
+        assert wait_for(lambda: reminders.sent == 1)
+    assert "Still sent" in server.delivered
+    assert caplog.text.count("The reminder worker failed") == 2
+
+
+# Takes a while to say goodbye to the server
+class SlowToClose(SmtpConnection):
+    def close_if_idle(self):
+        time.sleep(0.5)
+
+
+def test_scheduling_does_not_wait_for_the_connection_to_close(tmp_path, smtp):
+    server, port = smtp
+    reminders = ReminderScheduler(path=str(tmp_path / "reminders.db"), poll_s=0.05,
+                                  smtp=SlowToClose(host="127.0.0.1", port=port, use_ssl=False))
+    time.sleep(0.1)  # the worker is now closing the idle connection
+    started = time.monotonic()
+    reminders.schedule("student@example.com", "Quick", "Soon.", time.time())
+    assert time.monotonic() - started < 0.3
+    assert wait_for(lambda: "Quick" in server.delivered)
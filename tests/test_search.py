@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from core import search, search_cache
+from core.search_cache import SearchCache
+
+
+@pytest.fixture
+def providers(services, tmp_path, monkeypatch):
+    env = services.env()
+    monkeypatch.setattr(search, "YOUTUBE_API_URL", env["YOUTUBE_API_URL"])
+    monkeypatch.setattr(search, "SERPER_API_URL", env["SERPER_API_URL"])
+    monkeypatch.setattr(search_cache, "_cache", SearchCache(path=str(tmp_path / "search_cache.db")))
+    return services.search_app["stats"]
+
+
+def test_search_all_queries_both_providers(providers):
+    results = dict(search.search_all("fractions", "key", "key"))
+    assert [video["id"]["videoId"] for video in results["youtube"]] == [f"video{i}" for i in range(5)]
+    assert [page["title"] for page in results["serper"]][0] == "fractions - article 1"
+
+
+def test_repeated_searches_come_from_the_cache(providers):
+    before = dict(providers)
+    first = dict(search.search_all("The Solar System", "key", "key"))
+    again = dict(search.search_all("the solar  system", "key", "key"))
+    assert again == first
+    assert providers["youtube"] - before["youtube"] == 1
+    assert providers["serper"] - before["serper"] == 1
+    assert search_cache.get_search_cache().stats()["hits"] == 2
+
+
+def test_search_all_async_from_a_running_loop(providers):
+    async def search_and_close():
+        try:
+            return await search.search_all_async("magnetism", "key", "key")
+        finally:
+            # asyncio.run closes its loop, so the pool get_session opened for it goes too
+            await (await search.get_session()).close()
+
+    results = asyncio.run(search_and_close())
+    assert set(results) == {"youtube", "serper"}
+    assert all(isinstance(value, list) and value for value in results.values())
+
+
+def test_provider_errors_are_reported_and_not_cached(providers, monkeypatch):
+    monkeypatch.setattr(search, "SERPER_API_URL", search.SERPER_API_URL + "/missing")
+    results = dict(search.search_all("volcanoes", "key", "key"))
+    assert isinstance(results["youtube"], list)
+    assert results["serper"].startswith("An error occurred: 404")
+    assert search_cache.get_search_cache().lookup("serper", "volcanoes") is None
+
+
+def test_video_results_render_on_the_content_finder_page(providers):
+    from streamlit.testing.v1 import AppTest
+
+    def page(videos):
+        from sections.content_finder import render_youtube_videos
+        render_youtube_videos(videos)
+
+    videos = dict(search.search_all("tides", "key", "key"))["youtube"]
+    assert all(set(video["snippet"]["thumbnails"]) == {"default", "medium", "high"} for video in videos)
+    app = AppTest.from_function(page, args=(videos,)).run()
+    assert not app.exception
+    assert "hqdefault.jpg" in "".join(markdown.value for markdown in app.markdown)
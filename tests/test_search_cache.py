@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from core import search_cache
+from core.search_cache import SearchCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return SearchCache(path=str(tmp_path / "search_cache.db"), stale_s=100, ttls={"youtube": 10})
+
+
+# A provider that answers "<query> #<n>" for its n-th call, after a short wait
+def provider(calls, query="tides", delay=0.01):
+    async def fetch():
+        calls.append(query)
+        await asyncio.sleep(delay)
+        return [f"{query} #{len(calls)}"]
+    return fetch
+
+
+def get(cache, fetch, query="tides"):
+    return asyncio.run(cache.get_or_fetch("youtube", query, fetch))
+
+
+def test_fresh_entries_do_not_call_the_provider(cache, clock):
+    calls = []
+    assert get(cache, provider(calls)) == ["tides #1"]
+    clock.now += 10
+    assert get(cache, provider(calls), "  Tides ") == ["tides #1"]
+    assert calls == ["tides"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_stale_entries_are_served_while_one_refresh_runs(cache, clock):
+    calls = []
+    get(cache, provider(calls))
+    clock.now += 11
+
+    async def lookups():
+        # Several readers of the stale entry at once start a single refresh
+        results = await asyncio.gather(*(cache.get_or_fetch("youtube", "tides", provider(calls, delay=0.05))
+                                         for _ in range(5)))
+        assert len(calls) == 2
+        await asyncio.gather(*cache._inflight.values())
+        return results
+
+    assert asyncio.run(lookups()) == [["tides #1"]] * 5
+    assert cache.stats()["stale_hits"] == 5
+    assert get(cache, provider(calls)) == ["tides #2"]
+    assert len(calls) == 2
+
+
+def test_entries_past_the_stale_window_wait_for_the_provider(cache, clock):
+    calls = []
+    get(cache, provider(calls))
+    clock.now += 111
+    assert get(cache, provider(calls)) == ["tides #2"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_concurrent_misses_share_one_call(cache):
+    calls = []
+
+    async def lookups():
+        return await asyncio.gather(*(cache.get_or_fetch("youtube", "tides", provider(calls)) for _ in range(5)))
+
+    assert asyncio.run(lookups()) == [["tides #1"]] * 5
+    assert calls == ["tides"]
+
+
+def test_errors_are_not_cached(cache):
+    async def failing():
+        return "An error occurred: 403"
+
+    assert get(cache, failing) == "An error occurred: 403"
+    assert cache.lookup("youtube", "tides") is None
+
+
+def test_entries_outlive_the_process(tmp_path, clock):
+    path = str(tmp_path / "search_cache.db")
+    get(SearchCache(path=path), provider([]))
+    calls = []
+    assert get(SearchCache(path=path), provider(calls)) == ["tides #1"]
+    assert calls == []
+
+
+def test_the_memory_tier_is_bounded(tmp_path, clock):
+    cache = SearchCache(path=str(tmp_path / "search_cache.db"), memory_entries=2)
+    for query in ("a", "b", "c"):
+        get(cache, provider([], query), query)
+    assert cache.stats()["memory_entries"] == 2
+    # The evicted entry is still found on disk
+    assert cache.lookup("youtube", "a")[0] == ["a #1"]
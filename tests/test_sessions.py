@@ -0,0 +1,151 @@
+import logging
+
+import pytest
+
+from core import sessions
+from core.sessions import SessionManager, estimate_tokens
+
+
+class Reply:
+    def __init__(self, text):
+        self.text = text
+
+
+# Just the parts of a Gemini chat SessionManager uses: history, and a reply
+# echoing each message
+class FakeChat:
+    def __init__(self, history):
+        self.history = list(history)
+
+    def send_message(self, content, **kwargs):
+        self.history += [{"role": "user", "parts": [content]}, {"role": "model", "parts": [f"re: {content}"]}]
+        return Reply(f"re: {content}")
+
+
+class FakeModel:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.prompts = []
+
+    def start_chat(self, history):
+        return FakeChat(history)
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return Reply(f"summary {len(self.prompts)}")
+
+
+def talk(manager, session_id, turns, words=50):
+    for i in range(turns):
+        manager.send_message(session_id, f"turn {i} " + "word " * words)
+
+
+def texts(chat):
+    return [" ".join(message["parts"]) for message in chat.history]
+
+
+def test_short_conversations_are_left_alone():
+    model = FakeModel()
+    manager = SessionManager(model, token_budget=1000, keep_messages=4)
+    talk(manager, "ada", 3)
+    assert len(manager.get_chat("ada").history) == 6
+    assert model.prompts == []
+
+
+# Hold a conversation under a generous budget, then check it against a tight one
+def compact(manager, session_id, turns):
+    manager.token_budget = 10_000
+    talk(manager, session_id, turns)
+    manager.token_budget = 300
+    return manager.get_chat(session_id)
+
+
+def test_older_turns_are_folded_into_a_summary():
+    model = FakeModel()
+    manager = SessionManager(model, keep_messages=4)
+    chat = compact(manager, "ada", 5)
+    assert texts(chat)[0] == "Summary of our conversation so far: summary 1"
+    # The two most recent turns are kept verbatim
+    assert len(chat.history) == 6
+    assert texts(chat)[2].startswith("turn 3") and texts(chat)[4].startswith("turn 4")
+    assert "turn 0" in model.prompts[0] and "turn 3" not in model.prompts[0]
+    assert estimate_tokens(chat.history) <= 300
+
+    compact(manager, "ada", 3)
+    # The next summary builds on the previous one, not on its seed message
+    assert "Earlier summary: summary 1" in model.prompts[1]
+    assert "Summary of our conversation so far" not in model.prompts[1]
+    assert manager.stats()["compactions"] == 2
+
+
+def test_a_failed_summary_drops_the_older_turns(caplog):
+    model = FakeModel(fail=True)
+    manager = SessionManager(model, keep_messages=4)
+    with caplog.at_level(logging.WARNING, logger=sessions.__name__):
+        chat = compact(manager, "ada", 5)
+    assert "Summarizing chat history failed" in caplog.text
+    assert len(chat.history) == 4 and texts(chat)[0].startswith("turn 3")
+    assert estimate_tokens(chat.history) <= 300
+
+    # Within budget again, so the next message does not retry the summary
+    manager.send_message("ada", "one more")
+    assert len(model.prompts) == 1
+    assert manager.stats()["truncations"] == 1
+
+
+def test_a_failed_summary_keeps_the_previous_one():
+    model = FakeModel()
+    manager = SessionManager(model, keep_messages=4)
+    compact(manager, "ada", 5)
+    model.fail = True
+    chat = compact(manager, "ada", 3)
+    assert texts(chat)[0] == "Summary of our conversation so far: summary 1"
+    assert len(chat.history) == 6
+
+
+def test_sessions_are_separate_and_expire(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(sessions.time, "monotonic", lambda: now[0])
+    manager = SessionManager(FakeModel(), idle_s=60)
+    manager.send_message("ada", "hello")
+    assert manager.get_chat("bob").history == []
+    now[0] = 61
+    manager.get_chat("bob")
+    assert manager.stats()["sessions"] == 1
+    assert manager.get_chat("ada").history == []
+
+
+def test_a_reply_that_broke_off_does_not_wedge_the_chat():
+    genai = pytest.importorskip("google.generativeai")
+    from google.generativeai import protos
+    from google.generativeai.types.generation_types import GenerateContentResponse
+
+    def chunk(text, finished):
+        return protos.GenerateContentResponse(candidates=[protos.Candidate(
+            content=protos.Content(parts=[protos.Part(text=text)], role="model"),
+            finish_reason=protos.Candidate.FinishReason.STOP if finished else None)])
+
+    # Streams "all good" whole, or breaks off after "half" when asked to
+    class StreamingModel(genai.GenerativeModel):
+        def generate_content(self, contents, stream=False, **kwargs):
+            def chunks():
+                if "break" in contents[-1].parts[0].text:
+                    yield chunk("half", False)
+                    raise ConnectionError("connection reset")
+                yield chunk("all good", True)
+            return GenerateContentResponse.from_iterator(chunks())
+
+        def start_chat(self, history):
+            return genai.ChatSession(model=self, history=history)
+
+    manager = SessionManager(StreamingModel("gemini-pro"))
+    assert "".join(c.text for c in manager.send_message("ada", "hello", stream=True)) == "all good"
+    with pytest.raises(ConnectionError):
+        for _ in manager.send_message("ada", "break, please", stream=True):
+            pass
+    manager.discard_broken_reply("ada")
+    assert "".join(c.text for c in manager.send_message("ada", "again", stream=True)) == "all good"
+    assert [content.parts[0].text for content in manager.get_chat("ada").history] == [
+        "hello", "all good", "again", "all good"]
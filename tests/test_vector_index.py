@@ -0,0 +1,104 @@
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from core import vector_index
+from core.vector_index import VectorIndex, chunk_text, top_k
+
+TOPICS = {
+    "plants": "Plants make food from sunlight in their leaves. Photosynthesis turns water and carbon dioxide into sugar.",
+    "volcanoes": "Volcanoes erupt when magma rises through the crust. Lava cools into new rock on the surface.",
+    "fractions": "A fraction names part of a whole. The numerator counts the parts and the denominator the whole.",
+}
+
+
+# Stands in for the sentence-embedding model: unit-length bag-of-words vectors,
+# so texts sharing words score higher than texts that don't
+def fake_embed(texts, dim=256):
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"[a-z]+", text.lower()):
+            vectors[row, zlib.crc32(word.encode()) % dim] += 1
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return VectorIndex(directory=str(tmp_path), embed=fake_embed)
+
+
+def test_search_finds_the_relevant_document(index):
+    for name, text in TOPICS.items():
+        index.add(text, name)
+    results = index.search("how does magma make lava erupt", k=2)
+    assert results[0].name == "volcanoes"
+    assert results[0].score > results[1].score
+
+
+def test_documents_are_indexed_once(index):
+    first = index.add(TOPICS["plants"], "plants.txt")
+    assert index.add(TOPICS["plants"], "copy of plants.txt") == first
+    assert index.stats()["documents"] == {"course": 1}
+
+
+def test_search_within_a_collection_or_documents(index):
+    ids = {name: index.add(text, name, collection=name) for name, text in TOPICS.items()}
+    assert {p.name for p in index.search("magma", collection="fractions")} == {"fractions"}
+    assert {p.name for p in index.search("magma", doc_ids=[ids["plants"], ids["fractions"]])} == {"plants", "fractions"}
+    assert index.search("magma", collection="missing") == []
+
+
+def test_rows_added_by_another_instance_are_searched(tmp_path):
+    reader = VectorIndex(directory=str(tmp_path), embed=fake_embed)
+    writer = VectorIndex(directory=str(tmp_path), embed=fake_embed)
+    writer.add(TOPICS["plants"], "plants")
+    assert reader.search("photosynthesis")[0].name == "plants"
+    writer.add(TOPICS["volcanoes"], "volcanoes")
+    assert reader.search("magma lava")[0].name == "volcanoes"
+
+
+def test_uncommitted_vectors_are_overwritten(index):
+    index.add(TOPICS["plants"], "plants")
+    # A writer that crashed after appending its vectors but before committing
+    with open(index._vectors_path, "ab") as f:
+        f.write(b"\xff" * 256 * 4 * 3)
+    index.add(TOPICS["volcanoes"], "volcanoes")
+    stored = np.fromfile(index._vectors_path, dtype=np.float32).reshape(-1, 256)
+    assert np.array_equal(stored, fake_embed([TOPICS["plants"], TOPICS["volcanoes"]]))
+    assert index.search("magma lava")[0].name == "volcanoes"
+
+
+def test_embeddings_of_another_size_are_refused(index, tmp_path):
+    index.add(TOPICS["plants"], "plants")
+    other = VectorIndex(directory=str(tmp_path), embed=lambda texts: fake_embed(texts, dim=32))
+    with pytest.raises(ValueError):
+        other.add(TOPICS["volcanoes"], "volcanoes")
+    assert index.search("magma")[0].name == "plants"
+
+
+def test_chunks_overlap_at_sentence_boundaries():
+    text = " ".join(f"Sentence number {i} has six words." for i in range(10))
+    chunks = list(chunk_text(text, max_words=18, overlap_words=6))
+    assert all(len(chunk.split()) <= 18 for chunk in chunks)
+    assert chunks[0].startswith("Sentence number 0")
+    assert chunks[1].startswith("Sentence number 2")
+    assert chunks[-1].endswith("Sentence number 9 has six words.")
+
+
+def test_top_k_is_best_first():
+    assert list(top_k(np.array([0.1, 0.9, 0.5, 0.7]), 3)) == [1, 3, 2]
+    assert list(top_k(np.array([0.1]), 4)) == [0]
+
+
+def test_feedback_prompt_keeps_answers_out_of_the_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(vector_index, "available", lambda: True)
+    monkeypatch.setattr(vector_index, "embed", fake_embed)
+    monkeypatch.setattr(vector_index, "_index", VectorIndex(directory=str(tmp_path), embed=fake_embed))
+    answers = "\n\n".join(text for text in TOPICS.values() for _ in range(20))
+    prompt = vector_index.feedback_prompt([{"question": "Why do volcanoes erupt?"}], answers, per_question=1)
+    assert "Q1: Why do volcanoes erupt?" in prompt
+    assert "magma" in prompt.split("Relevant parts of the answers:")[1]
+    assert vector_index.get_vector_index().stats()["documents"] == {}
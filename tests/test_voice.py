@@ -0,0 +1,79 @@
+import io
+import threading
+import time
+import wave
+
+import pytest
+
+from core.voice import VoicePipeline, split_sentences
+
+pytest.importorskip("speech_recognition")
+
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+# Half a second of silence; recognition is stubbed, so the content doesn't matter
+def recording():
+    data = io.BytesIO()
+    with wave.open(data, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes(b"\0" * 16000)
+    data.seek(0)
+    return data
+
+
+def slow_reply(name, parts=3, delay=0.1):
+    def respond(question):
+        for i in range(parts):
+            time.sleep(delay)
+            yield Chunk(f"{name} answers part {i}. ")
+    return respond
+
+
+def test_split_sentences_keeps_the_unfinished_rest():
+    assert split_sentences("One. Two? Three") == (["One.", "Two?"], "Three")
+
+
+def test_a_turn_reports_each_stage():
+    pipeline = VoicePipeline(recognize=lambda audio: "what is a fraction")
+    turn = pipeline.listen(wav=recording(), respond=slow_reply("bot", parts=2, delay=0))
+    events = [(event.kind, event.text) for event in pipeline.turn_events(turn, timeout=5)]
+    assert events == [("heard", "what is a fraction"), ("sentence", "bot answers part 0."),
+                      ("sentence", "bot answers part 1."), ("reply", "bot answers part 0. bot answers part 1. ")]
+
+
+def test_sessions_are_answered_at_the_same_time_and_only_see_their_own_turns():
+    pipeline = VoicePipeline(recognize=lambda audio: "question", workers=4)
+    replies = {}
+
+    def session(name):
+        turn = pipeline.listen(wav=recording(), respond=slow_reply(name))
+        replies[name] = [event.text for event in pipeline.turn_events(turn, timeout=5) if event.kind == "reply"]
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(name,)) for name in "ABCD"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Each reply takes 0.3s; one after another they would take 1.2s
+    assert time.perf_counter() - started < 0.9
+    assert replies == {name: [f"{name} answers part 0. {name} answers part 1. {name} answers part 2. "]
+                       for name in "ABCD"}
+
+
+def test_errors_end_the_turn():
+    pipeline = VoicePipeline(recognize=lambda audio: "question")
+
+    def broken(question):
+        raise RuntimeError("no model")
+
+    turn = pipeline.listen(wav=recording(), respond=broken)
+    assert [event.kind for event in pipeline.turn_events(turn, timeout=5)] == ["heard", "error"]
+    turn = pipeline.listen(wav=io.BytesIO(b"not audio"), respond=broken)
+    assert [event.kind for event in pipeline.turn_events(turn, timeout=5)] == ["error"]